@@ -0,0 +1,56 @@
+#!/usr/bin/python3
+""" Times grouped aggregates of Places, in one pass and kept running
+
+Usage: ./benchmarks/aggregate.py [count]
+
+Creates count Places (200000 by default) in 1000 cities and times the
+average price_by_night per city, read in one pass over the objects and
+from the running aggregates FileStorage keeps, after a change to one
+place so that they have to follow it.
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+
+def timed(label, function, repeat=5):
+    """ Prints the best time of function() and returns its result """
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    print("{:<32}{:10.2f}ms".format(label, best * 1000))
+    return result
+
+
+def main():
+    """ Runs the benchmark """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    os.chdir(tempfile.mkdtemp())
+    from models import storage
+    from models.place import Place
+    for i in range(count):
+        place = Place()
+        place.city_id = "City.{}".format(i % 1000)
+        place.price_by_night = i % 300
+        place.max_guest = i % 300
+    print("{} places".format(count))
+    timed("first use", lambda: storage.aggregate(
+        Place, "avg", "price_by_night", "city_id"), 1)
+    timed("avg by city, one pass", lambda: storage.aggregate(
+        Place, "avg", "max_guest", "city_id"))
+
+    def running():
+        place.price_by_night += 1
+        return storage.aggregate(Place, "avg", "price_by_night", "city_id")
+    timed("avg by city, running", running)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+""" Measures the memory and time the object cache of FileStorage takes
+
+Usage: ./benchmarks/cache.py [count] [size]
+
+Writes count Place records (200000 by default) to a file.json in a
+temporary directory. For a full, a lazy and a cached reload keeping
+size objects (1000 by default), it then reloads them, goes through all
+of them in the order of their keys and gets 100000 objects, nine in
+ten among a hot set of size / 2, and prints the time taken, the peak
+memory allocated and the counters of the cache.
+"""
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+
+def records(count):
+    """ Returns a dictionary of count Place records """
+    date = datetime(2017, 9, 28, 21, 5, 54, 1).isoformat()
+    objects = {}
+    for i in range(count):
+        key = "Place.{:08}".format(i)
+        objects[key] = {"id": key[6:], "created_at": date,
+                        "updated_at": date, "__class__": "Place",
+                        "city_id": "city", "user_id": "user",
+                        "name": "Place {}".format(i),
+                        "description": "A place to stay " * 8,
+                        "number_rooms": i % 5, "price_by_night": i % 300}
+    return objects
+
+
+def workload(storage, ids, hot):
+    """ Goes through every object, then gets hot ones and others """
+    for obj in storage.iterate("Place"):
+        pass
+    rand = random.Random(0)
+    for i in range(100000):
+        if rand.random() < 0.9:
+            storage.get("Place", rand.choice(hot))
+        else:
+            storage.get("Place", rand.choice(ids))
+
+
+def measure(label, storage, ids, hot):
+    """ Prints the time and peak memory of a reload and the workload """
+    from models.engine.file_storage import FileStorage
+    FileStorage._FileStorage__objects = {}
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    storage.reload()
+    workload(storage, ids, hot)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print("{:<10}{:8.2f}s{:10.1f}MB  {}".format(
+        label, seconds, peak / 2 ** 20, storage.cache_info() or ""))
+
+
+def main():
+    """ Runs the benchmark """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    objects = records(count)
+    ids = [key[6:] for key in objects]
+    hot = random.Random(1).sample(ids, size // 2)
+    os.chdir(tempfile.mkdtemp())
+    # imported before file.json exists, the storage of models is empty
+    from models.engine.file_storage import FileStorage
+    with open("file.json", "w") as f:
+        json.dump(objects, f)
+    del objects
+    print("{} objects, cache of {}".format(count, size))
+    measure("full", FileStorage(), ids, hot)
+    measure("lazy", FileStorage(lazy=True), ids, hot)
+    measure("cached", FileStorage(cache_size=size), ids, hot)
+    os.remove("file.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+""" Times numeric scans of Places, over the objects and over the columns
+
+Usage: ./benchmarks/columns.py [count]
+
+Creates count Places (200000 by default) and times, for "more than 3
+rooms under $100" and "average price_by_night per city", a loop over
+the objects and the columnar store of FileStorage, its first use
+included as it builds the store.
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+
+def timed(label, function, repeat=5):
+    """ Prints the best time of function() and returns its result """
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    print("{:<32}{:10.2f}ms".format(label, best * 1000))
+    return result
+
+
+def by_objects(places):
+    """ Returns the average price of the places of every city """
+    sums = {}
+    for place in places:
+        total = sums.setdefault(place.city_id, [0, 0])
+        total[0] += place.price_by_night
+        total[1] += 1
+    return {k: v[0] / v[1] for k, v in sums.items()}
+
+
+def main():
+    """ Runs the benchmark """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    os.chdir(tempfile.mkdtemp())
+    from models import storage
+    from models.engine import columns
+    from models.place import Place
+    for i in range(count):
+        place = Place()
+        place.city_id = "City.{}".format(i % 100)
+        place.number_rooms = i % 7
+        place.price_by_night = i % 300
+    places = list(storage.all(Place).values())
+    print("{} places, NumPy {}".format(
+        count, "installed" if columns.numpy else "not installed"))
+    timed("first columns()", lambda: storage.columns(Place), 1)
+    found = timed("filter, objects", lambda: [
+        p for p in places if p.number_rooms > 3 and p.price_by_night < 100])
+    keys = timed("filter, columns", lambda: storage.columns(Place).filter(
+        ("number_rooms", ">", 3), ("price_by_night", "<", 100)))
+    assert len(found) == len(keys)
+    timed("avg by city, objects", lambda: by_objects(places))
+    timed("avg by city, columns", lambda: storage.columns(Place).aggregate(
+        "price_by_night", "avg", by="city_id"))
+    timed("avg, objects", lambda: sum(
+        p.price_by_night for p in places) / len(places))
+    timed("avg, columns", lambda: storage.columns(Place).aggregate(
+        "price_by_night", "avg"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+""" Times geospatial queries on Places, over the objects and the grid
+
+Usage: ./benchmarks/geo.py [count]
+
+Creates count Places (1000000 by default) spread over Europe and times
+a city-sized map viewport, a 5 km radius and the 20 nearest places to
+random points, by a scan of the objects and by the grid index of
+FileStorage, its build included in the first query.
+"""
+import heapq
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+
+def timed(label, function, repeat=20):
+    """ Prints the mean time of function() over repeat runs """
+    start = time.perf_counter()
+    for i in range(repeat):
+        function()
+    seconds = (time.perf_counter() - start) / repeat
+    print("{:<32}{:10.2f}ms".format(label, seconds * 1000))
+
+
+def main():
+    """ Runs the benchmark """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    os.chdir(tempfile.mkdtemp())
+    from models import storage
+    from models.engine.geo import distance
+    from models.place import Place
+    rand = random.Random(0)
+    for i in range(count):
+        place = Place()
+        place.latitude = rand.uniform(36, 60)
+        place.longitude = rand.uniform(-10, 30)
+    places = list(storage.all(Place).values())
+    print("{} places".format(count))
+    points = [(rand.uniform(36, 60), rand.uniform(-10, 30))
+              for i in range(20)]
+    point = iter(points * 1000).__next__
+
+    timed("first query", lambda: storage.nearest(Place, 48.85, 2.35), 1)
+
+    def box_scan():
+        lat, lon = point()
+        return [p for p in places if lat <= p.latitude <= lat + 0.1 and
+                lon <= p.longitude <= lon + 0.15]
+    timed("viewport, objects", box_scan, 3)
+    timed("viewport, grid", lambda: storage.box(
+        Place, *(lambda a, o: (a, o, a + 0.1, o + 0.15))(*point())))
+    timed("radius 5 km, grid", lambda: storage.radius(Place, *point(), 5))
+
+    def nearest_scan():
+        lat, lon = point()
+        return heapq.nsmallest(20, places, key=lambda p: distance(
+            lat, lon, p.latitude, p.longitude))
+    timed("20 nearest, objects", nearest_scan, 3)
+    timed("20 nearest, grid", lambda: storage.nearest(Place, *point()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+""" Times queries on Places, by loops over the objects and by Query
+
+Usage: ./benchmarks/query.py [count]
+
+Creates count Places (200000 by default) in 1000 cities and times three
+queries written as loops over storage.all() and with storage.query():
+the places of a city under $100, the 20 cheapest places, and the 20
+cheapest places of a city. The indexes are built before the timings.
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+
+def timed(label, function, repeat=5):
+    """ Prints the best time of function() and returns its result """
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    print("{:<32}{:10.2f}ms".format(label, best * 1000))
+    return result
+
+
+def main():
+    """ Runs the benchmark """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    os.chdir(tempfile.mkdtemp())
+    from models import storage
+    from models.place import Place
+    for i in range(count):
+        place = Place()
+        place.city_id = "City.{}".format(i % 1000)
+        place.price_by_night = (i * 7919) % 1000
+    print("{} places".format(count))
+    query = storage.query(Place)
+    query.where(city_id="City.1", price_by_night__lt=1).all()
+
+    def price(place):
+        return place.price_by_night
+
+    loop = timed("city under $100, loop", lambda: [
+        p for p in storage.all(Place).values()
+        if p.city_id == "City.7" and p.price_by_night < 100])
+    found = timed("city under $100, query", lambda: query.where(
+        city_id="City.7", price_by_night__lt=100).all())
+    assert len(loop) == len(found)
+    loop = timed("20 cheapest, loop", lambda: sorted(
+        storage.all(Place).values(), key=price)[:20])
+    found = timed("20 cheapest, query", lambda: query.order_by(
+        "price_by_night").limit(20).all())
+    assert [price(p) for p in loop] == [price(p) for p in found]
+    timed("20 cheapest of a city, loop", lambda: sorted(
+        [p for p in storage.all(Place).values() if p.city_id == "City.7"],
+        key=price)[:20])
+    timed("20 cheapest of a city, query", lambda: query.where(
+        city_id="City.7").order_by("price_by_night").limit(20).all())
+
+
+if __name__ == "__main__":
+    main()
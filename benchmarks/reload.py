@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+""" Times FileStorage.reload() on a file of generated objects
+
+Usage: ./benchmarks/reload.py [count]
+
+Writes count Place records (1000000 by default) to a file.json in a
+temporary directory, then reports the time taken to parse their
+timestamps with strptime and with fromisoformat, and to reload them.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+
+def records(count):
+    """ Returns a dictionary of count Place records """
+    start = datetime(2017, 9, 28, 21, 5, 54)
+    objects = {}
+    for i in range(count):
+        # microseconds never 0, isoformat() would leave them out
+        delta = timedelta(seconds=i, microseconds=1 + i % 999998)
+        date = (start + delta).isoformat()
+        key = "Place.{:08}".format(i)
+        objects[key] = {"id": key[6:], "created_at": date,
+                        "updated_at": date, "__class__": "Place",
+                        "city_id": "city", "user_id": "user",
+                        "name": "Place {}".format(i), "number_rooms": i % 5,
+                        "price_by_night": i % 300}
+    return objects
+
+
+def timed(label, function, *args):
+    """ Prints the seconds taken by function(*args) and returns them """
+    start = time.perf_counter()
+    function(*args)
+    seconds = time.perf_counter() - start
+    print("{:<24}{:8.2f}s".format(label, seconds))
+    return seconds
+
+
+def main():
+    """ Runs the benchmark """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    objects = records(count)
+    dates = [r["created_at"] for r in objects.values()]
+    os.chdir(tempfile.mkdtemp())
+    # imported before file.json exists, the storage of models is empty
+    from models.engine.file_storage import FileStorage
+    with open("file.json", "w") as f:
+        json.dump(objects, f)
+    del objects
+    print("{} objects".format(count))
+    slow = timed("strptime", lambda: [datetime.strptime(
+        d, "%Y-%m-%dT%H:%M:%S.%f") for d in dates])
+    fast = timed("fromisoformat", lambda: [datetime.fromisoformat(d)
+                                           for d in dates])
+    print("{:<24}{:8.1f}x".format("timestamps speedup", slow / fast))
+
+    timed("reload", FileStorage().reload)
+    os.remove("file.json")
+
+
+if __name__ == "__main__":
+    main()
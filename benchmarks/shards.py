@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+""" Times the reload of shard files against the reload of file.json
+
+Usage: ./benchmarks/shards.py [count] [shards] [workers]
+
+Writes count Place records (200000 by default) to a file.json and to
+shards files (8 by default) in a temporary directory. It then times
+a reload of file.json, a reload of the shards one after the other and
+one by workers processes (the CPUs available by default). The time
+this process takes to unpickle what the workers send back is printed
+too: a parallel reload cannot take less.
+"""
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+
+def timed(label, function, *args):
+    """ Prints the seconds taken by function(*args) and returns them """
+    start = time.perf_counter()
+    function(*args)
+    seconds = time.perf_counter() - start
+    print("{:<24}{:8.2f}s".format(label, seconds))
+    return seconds
+
+
+def main():
+    """ Runs the benchmark """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    shards = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    os.chdir(tempfile.mkdtemp())
+    # imported before file.json exists, the storage of models is empty
+    from models.engine.file_storage import FileStorage
+    from models.engine.shards import Shards, available_cpus
+    from models.place import Place
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else available_cpus()
+    plain = FileStorage()
+    sharded = FileStorage(shards=shards)
+    for i in range(count):
+        place = Place()
+        place.name = "Place {}".format(i)
+        place.number_rooms = i % 5
+        place.price_by_night = i % 300
+    # a full write of the shards removes file.json
+    sharded.save()
+    plain.save()
+    print("{} objects, {} shards, {} workers".format(count, shards, workers))
+    FileStorage._FileStorage__objects = {}
+    single = timed("file.json", plain.reload)
+
+    files = Shards("file.json", shards)
+    paths = files.paths(plain.classes())
+    classes = plain.classes()
+    serial = timed("shards, in process", files.load, paths, classes, 1)
+    parallel = timed("shards, parallel", files.load, paths, classes,
+                     workers)
+    loaded = files.load(paths, classes, 1)
+    pickled = [pickle.dumps(objects) for objects in loaded]
+    del loaded
+    floor = timed("unpickle in parent", lambda: [pickle.loads(p)
+                                                 for p in pickled])
+    print("{:<24}{:8.2f}x".format("parallel speedup", single / parallel))
+    print("{:<24}{:8.2f}x".format("at most", serial / floor))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+""" Times keyword searches in Reviews, by a scan and by the text index
+
+Usage: ./benchmarks/text.py [count]
+
+Creates count Reviews (200000 by default) of a dozen words drawn from a
+vocabulary of 5000, and times searches of two of its 500 most frequent
+words by a substring scan of the objects and by the full-text index of
+FileStorage, the first one including its build.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+
+def timed(label, function, queries):
+    """ Prints the mean time of function(query) over queries """
+    start = time.perf_counter()
+    for query in queries:
+        function(query)
+    seconds = (time.perf_counter() - start) / len(queries)
+    print("{:<32}{:10.2f}ms".format(label, seconds * 1000))
+
+
+def main():
+    """ Runs the benchmark """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    os.chdir(tempfile.mkdtemp())
+    from models import storage
+    from models.review import Review
+    rand = random.Random(0)
+    # a few frequent words and many rare ones, as in real texts
+    words = ["word{}".format(i) for i in range(5000)]
+    weights = [1 / (i + 1) for i in range(5000)]
+    for i in range(count):
+        Review().text = " ".join(rand.choices(words, weights, k=12))
+    reviews = list(storage.all(Review).values())
+    print("{} reviews".format(count))
+    queries = [" ".join(rand.sample(words[:500], 2)) for i in range(10)]
+
+    timed("first search", lambda q: storage.search(Review, q), ["word1"])
+
+    def scan(query):
+        terms = query.split()
+        return [r for r in reviews if any(t in r.text for t in terms)]
+    timed("two words, scan", scan, queries)
+    timed("two words, index", lambda q: storage.search(Review, q), queries)
+    timed("two words, index, top 10",
+          lambda q: storage.search(Review, q, 10), queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,23 @@
 #!/usr/bin/python3
 """ Initiates the package """
-from models.engine.file_storage import FileStorage
-storage = FileStorage()
+from os import getenv
+
+if getenv("HBNB_TYPE_STORAGE") == "db":
+    from models.engine.db_storage import DBStorage
+    storage = DBStorage()
+else:
+    from models.engine.file_storage import FileStorage
+    flush_interval = getenv("HBNB_STORAGE_FLUSH_INTERVAL")
+    cache_size = getenv("HBNB_STORAGE_CACHE")
+    storage = FileStorage(
+        journal=getenv("HBNB_STORAGE_JOURNAL") == "1",
+        lazy=getenv("HBNB_STORAGE_LAZY") == "1",
+        stream=getenv("HBNB_STORAGE_STREAM") == "1",
+        commit_delay=float(getenv("HBNB_STORAGE_COMMIT_DELAY", 0)),
+        flush_interval=float(flush_interval) if flush_interval else None,
+        flush_threshold=int(getenv("HBNB_STORAGE_FLUSH_COUNT", 100)),
+        shards=int(getenv("HBNB_STORAGE_SHARDS", 0)),
+        codec=getenv("HBNB_STORAGE_CODEC", "json"),
+        compact=getenv("HBNB_STORAGE_COMPACT") == "1",
+        cache_size=int(cache_size) if cache_size else None)
 storage.reload()
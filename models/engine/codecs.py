@@ -0,0 +1,200 @@
+#!/usr/bin/python3
+""" Module for the file formats FileStorage can write """
+import json
+import lzma
+import marshal
+import zlib
+
+
+class Codec:
+
+    """ Base class of the formats of the storage files
+
+    A codec encodes every record on its own, so that FileStorage can
+    keep the encoding of the objects that did not change, then joins
+    the encoded records of all the keys into the content of a file.
+    """
+
+    name = None
+    # bytes starting every file written by the codec
+    magic = b""
+
+    def bind(self, attributes):
+        """ Returns the codec to use with the schema of FileStorage
+
+        attributes is the dictionary of FileStorage.attributes().
+        """
+        return self
+
+    def record(self, record):
+        """ Returns the encoding of one record, a dict from to_dict() """
+        raise NotImplementedError
+
+    def join(self, pairs):
+        """ Returns the content of a file holding the (key, encoding) pairs """
+        raise NotImplementedError
+
+    def split(self, data):
+        """ Returns the (key, record) pairs of the content of a file """
+        raise NotImplementedError
+
+
+class JSONCodec(Codec):
+
+    """ The JSON object of records FileStorage has always written """
+
+    name = "json"
+    magic = b"{"
+
+    def record(self, record):
+        """ Returns the JSON text of record """
+        return json.dumps(record)
+
+    def join(self, pairs):
+        """ Returns the JSON object of the pairs, as text """
+        return "{" + ", ".join("{}: {}".format(json.dumps(k), v)
+                               for k, v in pairs) + "}"
+
+    def split(self, data):
+        """ Returns the (key, record) pairs of a JSON object """
+        return json.loads(data).items()
+
+
+class BinaryCodec(Codec):
+
+    """ Records in the marshal format of the running Python
+
+    It is several times faster to read and write than JSON, but files
+    may not be readable by other versions of Python.
+    """
+
+    name = "binary"
+    magic = b"HBNB\x01"
+
+    def record(self, record):
+        """ Returns record itself, it is only encoded by join() """
+        return record
+
+    def join(self, pairs):
+        """ Returns the marshalled dictionary of the pairs """
+        return BinaryCodec.magic + marshal.dumps(dict(pairs))
+
+    def split(self, data):
+        """ Returns the (key, record) pairs of a marshalled dictionary """
+        return marshal.loads(data[len(BinaryCodec.magic):]).items()
+
+
+class CompressedCodec(JSONCodec):
+
+    """ The JSON object of records compressed by zlib or lzma """
+
+    def __init__(self, module):
+        """Initiates the codec
+        Args:
+            -module: zlib or lzma
+        """
+        self.module = module
+        self.name = module.__name__
+        self.magic = module.compress(b"{}")[:2]
+
+    def join(self, pairs):
+        """ Returns the compressed JSON object of the pairs """
+        return self.module.compress(super().join(pairs).encode("utf-8"))
+
+    def split(self, data):
+        """ Returns the (key, record) pairs of a compressed JSON object """
+        return super().split(self.module.decompress(data))
+
+
+class SchemaCodec(Codec):
+
+    """ Records as JSON arrays of values in the order of a schema
+
+    The file holds the attribute names of every class once:
+        {"schema": {"User": ["id", ...], ...}, "records": {key: [...]}}
+    A record is [mask, values...], bit i of mask telling whether the
+    attribute i of the schema is set, followed by a dictionary of the
+    attributes outside the schema if there are any.
+    """
+
+    name = "schema"
+    magic = b"HBNB\x02"
+
+    def __init__(self, attributes=None):
+        """Initiates the codec
+        Args:
+            -attributes: dictionary of FileStorage.attributes(), only
+             needed to encode
+        """
+        self.fields = {}
+        if attributes is not None:
+            base = list(attributes["BaseModel"])
+            for name, attrs in attributes.items():
+                self.fields[name] = base + [a for a in attrs if a not in base]
+
+    def bind(self, attributes):
+        """ Returns a codec encoding with the schema of attributes """
+        return SchemaCodec(attributes)
+
+    def record(self, record):
+        """ Returns the JSON array of the values of record """
+        fields = self.fields.get(record["__class__"], self.fields["BaseModel"])
+        mask = 0
+        values = [0]
+        extra = {}
+        for i, field in enumerate(fields):
+            if field in record:
+                mask |= 1 << i
+        for i in range(mask.bit_length()):
+            values.append(record.get(fields[i]))
+        for attr, value in record.items():
+            if attr != "__class__" and attr not in fields:
+                extra[attr] = value
+        values[0] = mask
+        if extra:
+            values.append(extra)
+        return json.dumps(values)
+
+    def join(self, pairs):
+        """ Returns the schema and the records of the pairs, as text """
+        return "{}{{\"schema\": {}, \"records\": {{{}}}}}".format(
+            SchemaCodec.magic.decode("ascii"), json.dumps(self.fields),
+            ", ".join("{}: {}".format(json.dumps(k), v) for k, v in pairs))
+
+    def split(self, data):
+        """ Returns the (key, record) pairs of the content of a file """
+        content = json.loads(data[len(SchemaCodec.magic):])
+        schema = content["schema"]
+        pairs = []
+        for key, values in content["records"].items():
+            name = key.partition(".")[0]
+            fields = schema.get(name, schema["BaseModel"])
+            mask = values[0]
+            record = {}
+            for i in range(mask.bit_length()):
+                if mask >> i & 1:
+                    record[fields[i]] = values[i + 1]
+            if len(values) > mask.bit_length() + 1:
+                record.update(values[-1])
+            record["__class__"] = name
+            pairs.append((key, record))
+        return pairs
+
+
+CODECS = {codec.name: codec for codec in (JSONCodec(), BinaryCodec(),
+                                          CompressedCodec(zlib),
+                                          CompressedCodec(lzma),
+                                          SchemaCodec())}
+
+
+def detect(data):
+    """ Returns the codec that wrote data, JSON when none matches """
+    for codec in CODECS.values():
+        if data.startswith(codec.magic):
+            return codec
+    return CODECS["json"]
+
+
+def decode(data):
+    """ Returns the (key, record) pairs of the content of a file """
+    return detect(data).split(data)
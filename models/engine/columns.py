@@ -0,0 +1,277 @@
+#!/usr/bin/python3
+""" Module for the columnar store FileStorage keeps beside the objects """
+import math
+import operator
+from array import array
+from itertools import compress, filterfalse, repeat
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from models.engine.indexes import Index
+
+# comparisons filter() and aggregate() accept in their conditions
+OPERATORS = {"<": operator.lt, "<=": operator.le, ">": operator.gt,
+             ">=": operator.ge, "==": operator.eq, "!=": operator.ne}
+# functions aggregate() computes
+AGGREGATES = ("count", "sum", "avg", "min", "max")
+
+
+class Columns(Index):
+
+    """ Values of some attributes of one class, one column per attribute
+
+    Numeric attributes are arrays of floats, NaN standing for a value
+    missing or not a number. The others, such as city_id, are labels:
+    arrays of codes numbering their distinct values, which filters can
+    only compare with == and !=. Rows are in no particular order:
+    removing a key moves the last row in its place.
+
+    filter() and aggregate() scan whole columns, with NumPy when it is
+    installed, else with map() and compress() over the arrays.
+    """
+
+    def __init__(self, cls_name, attr):
+        """Initiates the store
+        Args:
+            -cls_name: name of the class
+            -attr: dictionary of the stored attributes and their types,
+             as in FileStorage.attributes()
+        """
+        super().__init__(cls_name, attr)
+        self.numeric = {name for name, kind in attr.items()
+                        if kind in (int, float)}
+        self.clear()
+
+    def add(self, key, obj):
+        """ Stores the values of obj in the row of key """
+        row = self.rows.get(key)
+        if row is None:
+            self.rows[key] = len(self.keys)
+            self.keys.append(key)
+            for name, column in self.columns.items():
+                column.append(self.__value(name, obj))
+            return
+        for name, column in self.columns.items():
+            column[row] = self.__value(name, obj)
+
+    def build(self, items):
+        """ Stores the (key, obj) pairs of items, the store being empty
+
+        Columns are filled one after the other, which is several times
+        faster than adding the objects one by one.
+        """
+        items = list(items)
+        self.keys.extend(key for key, obj in items)
+        self.rows.update(zip(self.keys, range(len(self.keys))))
+        objects = [obj for key, obj in items]
+        for name, column in self.columns.items():
+            values = [getattr(obj, name, None) for obj in objects]
+            if name in self.numeric:
+                column.extend([v if isinstance(v, (int, float)) else math.nan
+                               for v in values])
+                continue
+            codes = self.codes[name]
+            try:
+                column.extend([codes[v] if v in codes else
+                               self.__code(name, v, True) for v in values])
+            except TypeError:
+                column.extend([self.__code(name, v, True) for v in values])
+
+    def __value(self, name, obj):
+        """ Returns what the column name holds for obj """
+        value = getattr(obj, name, None)
+        if name in self.numeric:
+            if isinstance(value, (int, float)):
+                return value
+            return math.nan
+        return self.__code(name, value, True)
+
+    def __code(self, name, value, new=False):
+        """ Returns the code of the label value in the column name
+
+        Unhashable values are taken for None. A value without a code is
+        given one if new is true, else -1 is returned.
+        """
+        codes = self.codes[name]
+        try:
+            code = codes.get(value)
+        except TypeError:
+            value = None
+            code = codes.get(value)
+        if code is None:
+            if not new:
+                return -1
+            code = codes[value] = len(self.labels[name])
+            self.labels[name].append(value)
+        return code
+
+    def remove(self, key):
+        """ Removes the row of key """
+        row = self.rows.pop(key, None)
+        if row is None:
+            return
+        last = self.keys.pop()
+        if last != key:
+            self.keys[row] = last
+            self.rows[last] = row
+        for column in self.columns.values():
+            value = column.pop()
+            if last != key:
+                column[row] = value
+
+    def clear(self):
+        """ Empties the store """
+        # row -> key, and key -> row
+        self.keys = []
+        self.rows = {}
+        self.columns = {name: array("d" if name in self.numeric else "q")
+                        for name in self.attr}
+        # label -> code, and code -> label, of every label column
+        self.codes = {name: {} for name in self.attr
+                      if name not in self.numeric}
+        self.labels = {name: [] for name in self.codes}
+
+    def filter(self, *conditions):
+        """ Returns the keys of the rows meeting every condition
+
+        A condition is a tuple (attr, op, value), op one of OPERATORS.
+        """
+        mask = self.__mask(conditions)
+        if mask is None:
+            return list(self.keys)
+        if numpy is not None:
+            rows = numpy.flatnonzero(mask).tolist()
+            return list(map(self.keys.__getitem__, rows))
+        return list(compress(self.keys, mask))
+
+    def aggregate(self, attr, function, *conditions, by=None):
+        """ Returns function of the values of attr in the rows meeting
+        conditions, see filter()
+
+        function is one of AGGREGATES, over a numeric attribute but for
+        count. Missing values are left out, and None is the result over
+        no value but for count. With by, the name of a label column, a
+        dictionary of the result for every label is returned.
+        """
+        if function not in AGGREGATES:
+            raise ValueError("unknown aggregate: {}".format(function))
+        if function != "count" and attr not in self.numeric:
+            raise ValueError("{} is not numeric".format(attr))
+        if by is not None and by not in self.codes:
+            raise ValueError("{} is not a label column".format(by))
+        mask = self.__mask(conditions)
+        if numpy is not None:
+            return self.__aggregate_numpy(attr, function, mask, by)
+        values = self.columns[attr]
+        if attr not in self.numeric:
+            values = map(self.labels[attr].__getitem__, values)
+        if by is None:
+            if mask is not None:
+                values = compress(values, mask)
+            return self.__compute(attr, function, values)
+        groups = {}
+        codes = self.columns[by]
+        if mask is not None:
+            values = compress(values, mask)
+            codes = compress(codes, mask)
+        for code, value in zip(codes, values):
+            groups.setdefault(code, []).append(value)
+        labels = self.labels[by]
+        return {labels[code]: self.__compute(attr, function, group)
+                for code, group in groups.items()}
+
+    def __mask(self, conditions):
+        """ Returns which rows meet every condition, None for all rows """
+        mask = None
+        for attr, op, value in conditions:
+            compare = OPERATORS[op]
+            if attr not in self.numeric:
+                if op not in ("==", "!="):
+                    raise ValueError("{} only compares with == and !="
+                                     .format(attr))
+                value = self.__code(attr, value)
+            if numpy is not None:
+                met = compare(self.__array(attr), value)
+                mask = met if mask is None else mask & met
+            else:
+                met = map(compare, self.columns[attr], repeat(value))
+                mask = list(met if mask is None else
+                            map(operator.and_, mask, met))
+        return mask
+
+    def __array(self, attr):
+        """ Returns a NumPy array sharing the memory of a column
+
+        It must not outlive the call using it, the column could not grow.
+        """
+        column = self.columns[attr]
+        if not column:
+            return numpy.empty(0, dtype=column.typecode)
+        return numpy.frombuffer(column, dtype=column.typecode)
+
+    def __aggregate_numpy(self, attr, function, mask, by):
+        """ Returns what aggregate() does, computed by NumPy """
+        values = self.__array(attr)
+        if attr in self.numeric:
+            kept = ~numpy.isnan(values)
+        else:
+            kept = values != self.__code(attr, None)
+        if mask is not None:
+            kept &= mask
+        if by is None:
+            values = values[kept]
+            if function == "count":
+                return len(values)
+            if not len(values):
+                return None
+            if function == "avg":
+                return float(values.mean())
+            return self.__number(attr, {"sum": values.sum,
+                                        "min": values.min,
+                                        "max": values.max}[function]())
+        codes = self.__array(by)[kept]
+        labels = self.labels[by]
+        counts = numpy.bincount(codes, minlength=len(labels))
+        if function == "count":
+            return {labels[i]: int(n) for i, n in enumerate(counts) if n}
+        values = values[kept]
+        if function in ("sum", "avg"):
+            results = numpy.bincount(codes, values, minlength=len(labels))
+            if function == "avg":
+                return {labels[i]: float(results[i] / n)
+                        for i, n in enumerate(counts) if n}
+        else:
+            ufunc = numpy.minimum if function == "min" else numpy.maximum
+            results = numpy.zeros(len(labels))
+            # every group starts from one of its values
+            results[codes] = values
+            ufunc.at(results, codes, values)
+        return {labels[i]: self.__number(attr, results[i])
+                for i, n in enumerate(counts) if n}
+
+    def __compute(self, attr, function, values):
+        """ Returns function of values, missing ones left out """
+        if attr in self.numeric:
+            values = list(filterfalse(math.isnan, values))
+        else:
+            values = [v for v in values if v is not None]
+        if function == "count":
+            return len(values)
+        if not values:
+            return None
+        if function == "avg":
+            return math.fsum(values) / len(values)
+        if function == "sum":
+            return self.__number(attr, math.fsum(values))
+        return self.__number(attr, min(values) if function == "min"
+                             else max(values))
+
+    def __number(self, attr, value):
+        """ Returns value as an int for integer attributes """
+        value = float(value)
+        if self.attr[attr] is int and value.is_integer():
+            return int(value)
+        return value
@@ -0,0 +1,347 @@
+#!/usr/bin/python3
+""" Module for class of dbstorage """
+import heapq
+import json
+import sqlite3
+from contextlib import contextmanager
+from operator import itemgetter
+
+from models.engine.file_storage import FileStorage
+from models.engine.groups import GroupIndex
+
+
+class DBStorage:
+
+    """ Class to store and retrieve data in a SQLite database
+
+    Objects are rows of a single table holding their JSON record. The
+    objects already built are kept so that every access to a key returns
+    the same instance, and only the changed ones are written on save.
+    query(), search() and columns() are only offered by FileStorage,
+    they are served by indexes kept in memory.
+    """
+    __db_path = "file.db"
+    # attributes given an index in the database, see lookup()
+    __foreign_keys = {"City": ("state_id",),
+                      "Place": ("city_id", "user_id"),
+                      "Review": ("place_id", "user_id")}
+    # attributes given an index in the database, see range()
+    __ranges = {"Place": ("price_by_night", "max_guest", "number_rooms")}
+
+    classes = FileStorage.classes
+    attributes = FileStorage.attributes
+    page = FileStorage.page
+
+    def __init__(self):
+        """ Initiates the storage, the database is opened by reload() """
+        self.__db = None
+        # objects built or created since the last reload
+        self.__objects = {}
+        # keys changed since the last save, None marks a destroyed key
+        self.__dirty = {}
+        # state of the keys changed inside batch(), None outside of it
+        self.__undo = None
+
+    def all(self, cls=None):
+        """ Returns a dictionary of all the objects, or of those of cls
+
+        cls is a class or a class name.
+        """
+        if cls is None:
+            rows = self.__connection().execute(
+                "SELECT key, record FROM objects")
+        else:
+            rows = self.__connection().execute(
+                "SELECT key, record FROM objects WHERE class = ?",
+                (self.__name(cls),))
+        objects = {k: self.__build(k, r) for k, r in rows
+                   if k not in self.__dirty}
+        for key, obj in self.__dirty.items():
+            if obj is not None and (cls is None or
+                                    key.startswith(self.__name(cls) + ".")):
+                objects[key] = obj
+        return objects
+
+    def keys(self, cls=None):
+        """ Returns the list of the keys of the objects, or of those of
+        cls, in the order of all(), see FileStorage.keys() """
+        if cls is None:
+            rows = self.__connection().execute("SELECT key FROM objects")
+        else:
+            rows = self.__connection().execute(
+                "SELECT key FROM objects WHERE class = ?",
+                (self.__name(cls),))
+        keys = [k for k, in rows if k not in self.__dirty]
+        for key, obj in self.__dirty.items():
+            if obj is not None and (cls is None or
+                                    key.startswith(self.__name(cls) + ".")):
+                keys.append(key)
+        return keys
+
+    def count(self, cls=None):
+        """ Returns the number of objects, or of objects of cls """
+        if cls is None:
+            row = self.__connection().execute("SELECT COUNT(*) FROM objects")
+        else:
+            row = self.__connection().execute(
+                "SELECT COUNT(*) FROM objects WHERE class = ?",
+                (self.__name(cls),))
+        count = row.fetchone()[0]
+        for key, obj in self.__dirty.items():
+            if cls is None or key.startswith(self.__name(cls) + "."):
+                count += (obj is not None) - self.__stored(key)
+        return count
+
+    def iterate(self, cls=None, after=None):
+        """ Yields the objects, or the objects of cls, in the order of
+        their keys, see FileStorage.iterate()
+
+        Rows are read as they are yielded, in the order of the primary
+        key, and merged with the objects changed since the last save.
+        """
+        low, high = after or "", None
+        if cls is not None:
+            # the keys of a class lie between "<name>." and "<name>/"
+            low = max(low, self.__name(cls) + ".")
+            high = self.__name(cls) + "/"
+        query = "SELECT key, record, NULL FROM objects WHERE key > ?"
+        params = [low]
+        if high is not None:
+            query += " AND key < ?"
+            params.append(high)
+        rows = self.__connection().execute(query + " ORDER BY key", params)
+        rows = (row for row in rows if row[0] not in self.__dirty)
+        changed = sorted((k, None, obj) for k, obj in self.__dirty.items()
+                         if obj is not None and k > low and
+                         (high is None or k < high))
+        for key, record, obj in heapq.merge(rows, changed,
+                                            key=itemgetter(0)):
+            yield obj if obj is not None else self.__build(key, record)
+
+    def get(self, cls, id):
+        """ Returns the object of cls with this id, None if missing """
+        key = "{}.{}".format(self.__name(cls), id)
+        if key in self.__dirty:
+            return self.__dirty[key]
+        if key in self.__objects:
+            return self.__objects[key]
+        row = self.__connection().execute(
+            "SELECT record FROM objects WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return self.__build(key, row[0])
+
+    def lookup(self, cls, attr, value):
+        """ Returns the list of objects of cls whose attr equals value """
+        name = self.__name(cls)
+        if not attr.isidentifier():
+            return []
+        # the path is spelled out so that the index on it can be used
+        rows = self.__connection().execute(
+            "SELECT key, record FROM objects WHERE class = ? AND "
+            "json_extract(record, '$.{}') = ?".format(attr), (name, value))
+        found = [self.__build(k, r) for k, r in rows
+                 if k not in self.__dirty]
+        for key, obj in self.__dirty.items():
+            if obj is not None and key.startswith(name + ".") and \
+                    getattr(obj, attr, None) == value:
+                found.append(obj)
+        return found
+
+    def range(self, cls, attr, low=None, high=None):
+        """ Returns the list of objects of cls whose attr is a number
+        between low and high included, in the order of attr
+
+        A bound of None leaves the range open on its side.
+        """
+        name = self.__name(cls)
+        if not attr.isidentifier():
+            return []
+        path = "json_extract(record, '$.{}')".format(attr)
+        query = "SELECT key, record, {0} FROM objects WHERE class = ? " \
+            "AND typeof({0}) IN ('integer', 'real')".format(path)
+        params = [name]
+        if low is not None:
+            query += " AND {} >= ?".format(path)
+            params.append(low)
+        if high is not None:
+            query += " AND {} <= ?".format(path)
+            params.append(high)
+        found = [(v, k, self.__build(k, r))
+                 for k, r, v in self.__connection().execute(query, params)
+                 if k not in self.__dirty]
+        for key, obj in self.__dirty.items():
+            value = getattr(obj, attr, None)
+            if obj is not None and key.startswith(name + ".") and \
+                    isinstance(value, (int, float)) and value == value and \
+                    (low is None or value >= low) and \
+                    (high is None or value <= high):
+                found.append((value, key, obj))
+        found.sort(key=lambda item: item[:2])
+        return [obj for value, key, obj in found]
+
+    def aggregate(self, cls, function, attr=None, by=None):
+        """ Returns function of the numbers attr holds in the objects of
+        cls, or a dictionary of it for every value of by
+
+        See FileStorage.aggregate(), the objects are read in one pass.
+        """
+        if function != "count" and attr is None:
+            raise ValueError("{} needs an attribute".format(function))
+        index = GroupIndex(self.__name(cls), (attr, by))
+        index.build(self.all(cls).items())
+        return index.aggregate(function, attr is not None, by is not None)
+
+    def new(self, obj):
+        """ Adds obj to the objects written by the next save """
+        key = "{}.{}".format(type(obj).__name__, obj.id)
+        if self.__undo is not None:
+            self.__remember(key)
+        self.__objects[key] = obj
+        self.__dirty[key] = obj
+
+    def touch(self, obj):
+        """ Marks obj as modified since the last save """
+        key = "{}.{}".format(type(obj).__name__, getattr(obj, "id", None))
+        if self.__objects.get(key) is obj:
+            if self.__undo is not None:
+                self.__remember(key)
+            self.__dirty[key] = obj
+
+    def delete(self, obj=None):
+        """ Removes obj from the database on the next save """
+        if obj is None:
+            return
+        key = "{}.{}".format(type(obj).__name__, obj.id)
+        if self.__undo is not None:
+            self.__remember(key)
+        self.__objects.pop(key, None)
+        self.__dirty[key] = None
+
+    def save(self):
+        """ Writes the changed objects in one transaction
+
+        Inside batch() nothing is written.
+        """
+        if self.__undo is not None:
+            return
+        upserts = []
+        deletes = []
+        for key, obj in self.__dirty.items():
+            if obj is None:
+                deletes.append((key,))
+            else:
+                upserts.append((key, type(obj).__name__, obj.id,
+                                json.dumps(obj.to_dict())))
+        db = self.__connection()
+        with db:
+            db.executemany(
+                "INSERT OR REPLACE INTO objects (key, class, id, record) "
+                "VALUES (?, ?, ?, ?)", upserts)
+            db.executemany(
+                "DELETE FROM objects WHERE key = ?", deletes)
+        self.__dirty.clear()
+
+    @contextmanager
+    def batch(self):
+        """ Context manager making the saves of its block a single one
+
+        See FileStorage.batch(): the changes are written in one
+        transaction when the block ends, or put back as they were if an
+        exception escapes it.
+        """
+        if self.__undo is not None:
+            yield self
+            return
+        self.__undo = {}
+        try:
+            yield self
+        except BaseException:
+            undo, self.__undo = self.__undo, None
+            self.__rollback(undo)
+            raise
+        self.__undo = None
+        self.save()
+
+    transaction = batch
+
+    def __remember(self, key):
+        """ Keeps the state of key as it was when the batch began """
+        if key in self.__undo:
+            return
+        obj = self.__objects.get(key)
+        state = None if obj is None else obj.__getstate__()
+        self.__undo[key] = (obj, state, key in self.__dirty,
+                            self.__dirty.get(key))
+
+    def __rollback(self, undo):
+        """ Puts back the keys of undo in their remembered state """
+        for key, (obj, state, dirty, change) in undo.items():
+            if obj is None:
+                self.__objects.pop(key, None)
+            else:
+                obj.__setstate__(state)
+                self.__objects[key] = obj
+            if dirty:
+                self.__dirty[key] = change
+            else:
+                self.__dirty.pop(key, None)
+
+    def reload(self):
+        """ Opens the database, objects are then built on demand """
+        self.close()
+        self.__connection()
+        self.__objects = {}
+        self.__dirty = {}
+
+    def close(self):
+        """ Closes the database, which the next access opens again
+
+        Saved changes are written already, the others are kept.
+        """
+        if self.__db is not None:
+            self.__db.close()
+            self.__db = None
+
+    def __connection(self):
+        """ Returns the connection to the database, opening it if needed """
+        if self.__db is not None:
+            return self.__db
+        db = sqlite3.connect(DBStorage.__db_path)
+        with db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS objects ("
+                "key TEXT PRIMARY KEY, class TEXT NOT NULL, "
+                "id TEXT NOT NULL, record TEXT NOT NULL)")
+            db.execute(
+                "CREATE INDEX IF NOT EXISTS objects_class "
+                "ON objects (class)")
+            indexed = list(DBStorage.__foreign_keys.items()) + \
+                list(DBStorage.__ranges.items())
+            for name, attrs in indexed:
+                for attr in attrs:
+                    db.execute(
+                        "CREATE INDEX IF NOT EXISTS objects_{0}_{1} ON "
+                        "objects (class, json_extract(record, '$.{1}'))"
+                        .format(name, attr))
+        self.__db = db
+        return db
+
+    def __name(self, cls):
+        """ Returns the name of cls, a class or a class name """
+        return cls if isinstance(cls, str) else cls.__name__
+
+    def __stored(self, key):
+        """ Returns 1 if key has a row in the database, 0 otherwise """
+        row = self.__connection().execute(
+            "SELECT 1 FROM objects WHERE key = ?", (key,)).fetchone()
+        return 0 if row is None else 1
+
+    def __build(self, key, record):
+        """ Returns the object of key, building it from record if needed """
+        obj = self.__objects.get(key)
+        if obj is None:
+            record = json.loads(record)
+            obj = self.classes()[record["__class__"]].from_record(record)
+            self.__objects[key] = obj
+        return obj
@@ -1,30 +1,738 @@
 #!/usr/bin/python3
 """ Module for class of filestorage """
+import atexit
 import datetime
+import heapq
 import json
 import os
+import threading
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+from models.engine.codecs import CODECS, detect
+from models.engine.columns import Columns
+from models.engine.geo import GridIndex
+from models.engine.groups import GroupIndex
+from models.engine.indexes import HashIndex, KeyIndex, RangeIndex
+from models.engine.journal import Journal
+from models.engine.lazy import CachedObjects, LazyObjects, open_map, stream
+from models.engine.objects import Objects
+from models.engine.query import Query
+from models.engine.shards import Shards
+from models.engine.text import TextIndex
+from models.engine.writer import WriteBehind
 
 
 class FileStorage:
 
     """ Class to store and retrieve data """
     __file_path = "file.json"
-    __objects = {}
+    __objects = Objects()
+    # the journal is folded into file.json once it holds this many entries
+    __compact_min = 1000
+    # attributes given a hash index by every storage, see lookup()
+    __foreign_keys = {"City": ("state_id",),
+                      "Place": ("city_id", "user_id"),
+                      "Review": ("place_id", "user_id")}
+    # attributes given an ordered index by every storage, see range()
+    __ranges = {"Place": ("price_by_night", "max_guest", "number_rooms")}
+    # attributes kept in a columnar store by every storage, see columns()
+    __columns = {"Place": ("city_id", "number_rooms", "number_bathrooms",
+                           "max_guest", "price_by_night", "latitude",
+                           "longitude")}
+    # (attribute, grouping attribute) given running aggregates by every
+    # storage, see aggregate()
+    __groups = {"Place": (("price_by_night", "city_id"),)}
+    # attributes given a full-text index by every storage, see search()
+    __texts = {"Place": ("description",), "Review": ("text",)}
+
+    def __init__(self, *, journal=False, lazy=False, stream=False,
+                 commit_delay=0, flush_interval=None, flush_threshold=100,
+                 shards=0, codec="json", compact=False, cache_size=None):
+        """Initiates the storage
+        Args:
+            -journal: append changes to a log instead of rewriting the file
+            -lazy: build reloaded objects only when they are first accessed
+            -stream: decode one record at a time on reload to save memory
+            -commit_delay: seconds a save waits for others to join its write
+            -flush_interval: seconds between the writes of a background
+             thread doing the saves, None to save synchronously
+            -flush_threshold: number of saves making that thread write early
+            -shards: number of files each class is split into, 0 to keep
+             every object in the JSON file
+            -codec: name of the format files are written in, see CODECS;
+             reload reads any of them
+            -compact: reload objects as the compact variants of their
+             classes, see models/compact.py
+            -cache_size: number of objects kept built at most, the
+             others are read again from the JSON file when accessed;
+             None keeps every object, see CachedObjects
+        """
+        if cache_size is not None and (shards or codec != "json"):
+            raise ValueError("the object cache needs the JSON file")
+        if flush_interval is not None and (lazy or cache_size is not None):
+            # the thread would remap the JSON file under objects being read
+            raise ValueError("a background flush needs every object built")
+        self.__journal = journal
+        self.__lazy = lazy
+        self.__stream = stream
+        self.__commit_delay = commit_delay
+        self.__codec = CODECS[codec].bind(self.attributes())
+        self.__compact = compact
+        self.__cache_size = cache_size
+        # class name -> class reloaded objects are built with
+        self.__types = None
+        # group commit: saves requested, saves written, write in progress
+        self.__commit = threading.Condition()
+        self.__requested = 0
+        self.__written = 0
+        self.__writing = False
+        # keys changed since the last save, None marks a destroyed key
+        self.__dirty = {}
+        # key -> (object, its JSON text) as of the last save
+        self.__records = {}
+        # keys of __objects grouped by class name, see __registry()
+        self.__by_class = {}
+        self.__registered = None
+        # version of __objects the registry holds the keys of, its size
+        # when it is a plain dict, see __stamp()
+        self.__registered_stamp = 0
+        # class name -> indexes on its objects, see add_index()
+        self.__indexes = {}
+        # keys of indexed objects modified since the indexes were last
+        # refreshed, the objects themselves may be evicted meanwhile
+        self.__stale = {}
+        self.__log = Journal(FileStorage.__file_path + ".log")
+        self.__shards = None
+        if shards:
+            self.__shards = Shards(FileStorage.__file_path, shards)
+        # the __objects the shard files were last fully written from
+        self.__sharded = None
+        for name in self.attributes():
+            self.add_index(name, "id", KeyIndex)
+        for name, attrs in FileStorage.__foreign_keys.items():
+            for attr in attrs:
+                self.add_index(name, attr)
+        for name, attrs in FileStorage.__ranges.items():
+            for attr in attrs:
+                self.add_index(name, attr, RangeIndex)
+        self.add_index("Place", ("latitude", "longitude"), GridIndex)
+        for name, pairs in FileStorage.__groups.items():
+            for pair in pairs:
+                self.add_index(name, pair, GroupIndex)
+        for name, attrs in FileStorage.__texts.items():
+            self.add_index(name, attrs, TextIndex)
+        attributes = self.attributes()
+        for name, attrs in FileStorage.__columns.items():
+            self.add_index(name, {a: attributes[name][a] for a in attrs},
+                           Columns)
+        # state of the keys changed inside batch(), None outside of it
+        self.__undo = None
+        self.__writer = None
+        if flush_interval is not None:
+            self.__writer = WriteBehind(self.flush, flush_interval,
+                                        flush_threshold)
+            self.__writer.start()
+            atexit.register(self.close)
+
+    def all(self, cls=None):
+        """ Returns dictionary __objects, or only the objects of cls
+
+        cls is a class or a class name. Keys added to or deleted from
+        __objects directly are followed, but new() and delete() should
+        be preferred.
+        """
+        if cls is None:
+            return FileStorage.__objects
+        objects = FileStorage.__objects
+        return {k: objects[k] for k in self.__keys(cls) if k in objects}
+
+    def keys(self, cls=None):
+        """ Returns the list of the keys of the objects, or of those of
+        cls, in the order of all()
+
+        No object is built, they can be fetched one at a time with get().
+        """
+        if cls is None:
+            return list(FileStorage.__objects)
+        return list(self.__keys(cls))
+
+    def cache_info(self):
+        """ Returns the counters of the object cache, None without one
+
+        hits and misses count the accesses finding their object built
+        or not, evictions the objects dropped to stay within size.
+        """
+        objects = FileStorage.__objects
+        if type(objects) is not CachedObjects:
+            return None
+        return {"hits": objects.hits, "misses": objects.misses,
+                "evictions": objects.evictions, "size": objects.size,
+                "resident": len(objects.lru)}
+
+    def count(self, cls=None):
+        """ Returns the number of objects, or of objects of cls """
+        if cls is None:
+            return len(FileStorage.__objects)
+        return len(self.__keys(cls))
+
+    def get(self, cls, id):
+        """ Returns the object of cls with this id, None if missing """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return FileStorage.__objects.get("{}.{}".format(cls, id))
+
+    def iterate(self, cls=None, after=None):
+        """ Yields the objects, or the objects of cls, in the order of
+        their keys
+
+        after, a key, makes it start with the first object whose key
+        follows it. Objects created or destroyed meanwhile may or may
+        not be yielded, the others are yielded once.
+        """
+        names = sorted(self.__registry()) if cls is None else \
+            [cls if isinstance(cls, str) else cls.__name__]
+        streams = []
+        for name in names:
+            index = self.index(name, "id", KeyIndex)
+            if index is not None:
+                streams.append(index.ordered(after))
+            else:
+                streams.append(sorted(
+                    k for k in self.__registry().get(name, ())
+                    if after is None or k >= after))
+        objects = FileStorage.__objects
+        for key in heapq.merge(*streams):
+            obj = objects.get(key)
+            if obj is not None and key != after:
+                yield obj
+
+    def page(self, cls=None, size=100, after=None, offset=0):
+        """ Returns a page of the objects, or of the objects of cls, in
+        the order of their keys, and the token of the next page
+
+        The page holds at most size objects, at least one, skipping
+        offset of them from the start or from the key after. The token
+        is the key to pass as after to get the next page, None after the
+        last one.
+        """
+        if size < 1:
+            raise ValueError("a page holds at least one object")
+        found = list(islice(self.iterate(cls, after), offset,
+                            offset + size + 1))
+        if len(found) <= size:
+            return found, None
+        del found[size:]
+        return found, "{}.{}".format(type(found[-1]).__name__, found[-1].id)
+
+    def __keys(self, cls):
+        """ Returns the keys of the objects of cls """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return self.__registry().get(cls, {})
+
+    def __registry(self):
+        """ Returns the keys of __objects grouped by class name
+
+        It is built again whenever __objects has been replaced, or its
+        keys were changed other than through new() and delete().
+        """
+        if self.__registered is not FileStorage.__objects or \
+                self.__registered_stamp != self.__stamp():
+            self.__registered = FileStorage.__objects
+            self.__registered_stamp = self.__stamp()
+            self.__by_class = {}
+            for key in FileStorage.__objects:
+                name = key.partition(".")[0]
+                self.__by_class.setdefault(name, {})[key] = None
+            for indexes in self.__indexes.values():
+                for index in indexes:
+                    index.built = False
+            self.__stale.clear()
+        return self.__by_class
+
+    @staticmethod
+    def __stamp():
+        """ Returns what tells the keys of __objects changed: its version,
+        or its size when a plain dict was set in its place """
+        objects = FileStorage.__objects
+        if isinstance(objects, Objects):
+            return objects.version
+        return len(objects)
+
+    def add_index(self, cls, attr, kind=HashIndex):
+        """ Declares an index of kind on attr of cls and returns it """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        for index in self.__indexes.get(cls, ()):
+            if index.attr == attr and type(index) is kind:
+                return index
+        index = kind(cls, attr)
+        self.__indexes.setdefault(cls, []).append(index)
+        return index
 
-    def all(self):
-        """ Returns dictionary __objects """
-        return FileStorage.__objects
+    def index(self, cls, attr, kind=HashIndex):
+        """ Returns the up to date index of kind on attr of cls, or None
+
+        attr None stands for any attribute.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        registry = self.__registry()
+        found = None
+        for index in self.__indexes.get(cls, ()):
+            if (attr is None or index.attr == attr) and type(index) is kind:
+                found = index
+        if found is None:
+            return None
+        objects = FileStorage.__objects
+        for key in self.__stale:
+            current = dict.get(objects, key)
+            if current is None:
+                continue
+            if type(current) is tuple:
+                # evicted, it was written as it was when last touched
+                current = objects[key]
+            for index in self.__indexes[key.partition(".")[0]]:
+                if index.built:
+                    index.add(key, current)
+        self.__stale.clear()
+        if not found.built:
+            found.clear()
+            keys = registry.get(cls, ())
+            if found.keys_only:
+                # the objects, maybe not built, are not read
+                found.build((key, None) for key in keys)
+            else:
+                found.build((key, objects[key]) for key in keys)
+            found.built = True
+        return found
+
+    def query(self, cls):
+        """ Returns a query of the objects of cls, see Query """
+        return Query(self, cls)
+
+    def lookup(self, cls, attr, value):
+        """ Returns the list of objects of cls whose attr equals value
+
+        The hash index on attr is used when one was declared.
+        """
+        index = self.index(cls, attr, HashIndex)
+        if index is None:
+            return [obj for obj in self.all(cls).values()
+                    if getattr(obj, attr, None) == value]
+        objects = FileStorage.__objects
+        return [objects[k] for k in index.lookup(value)]
+
+    def range(self, cls, attr, low=None, high=None):
+        """ Returns the list of objects of cls whose attr is a number
+        between low and high included, in the order of attr
+
+        A bound of None leaves the range open on its side. The ordered
+        index on attr is used when one was declared.
+        """
+        index = self.index(cls, attr, RangeIndex)
+        objects = FileStorage.__objects
+        if index is not None:
+            return [objects[k] for k in index.range(low, high)]
+        found = []
+        for key, obj in self.all(cls).items():
+            value = getattr(obj, attr, None)
+            if isinstance(value, (int, float)) and value == value and \
+                    (low is None or value >= low) and \
+                    (high is None or value <= high):
+                found.append((value, key, obj))
+        found.sort(key=lambda item: item[:2])
+        return [obj for value, key, obj in found]
+
+    def box(self, cls, south, west, north, east):
+        """ Returns the list of objects of cls whose latitude and
+        longitude are in a bounding box, bounds included
+
+        A box whose west is east of its east crosses the antimeridian.
+        """
+        objects = FileStorage.__objects
+        return [objects[k]
+                for k in self.__grid(cls).box(south, west, north, east)]
+
+    def radius(self, cls, lat, lon, km):
+        """ Returns the list of objects of cls at most km away from the
+        point (lat, lon), nearest first """
+        objects = FileStorage.__objects
+        return [objects[key]
+                for d, key in self.__grid(cls).radius(lat, lon, km)]
+
+    def nearest(self, cls, lat, lon, k=20):
+        """ Returns the list of the k objects of cls nearest to the point
+        (lat, lon), nearest first """
+        objects = FileStorage.__objects
+        return [objects[key]
+                for d, key in self.__grid(cls).nearest(lat, lon, k)]
+
+    def __grid(self, cls):
+        """ Returns the up to date grid index of cls, one made for the
+        query if none was declared """
+        index = self.index(cls, None, GridIndex)
+        if index is None:
+            index = GridIndex(cls if isinstance(cls, str) else cls.__name__)
+            index.build(self.all(cls).items())
+        return index
+
+    def search(self, cls, query, limit=None):
+        """ Returns the list of objects of cls whose text holds a word
+        of query, the most relevant first
+
+        limit, when given, is the number of objects returned at most.
+        The full-text index of cls is used when one was declared, else
+        its description and text are searched.
+        """
+        index = self.index(cls, None, TextIndex)
+        if index is None:
+            index = TextIndex(cls if isinstance(cls, str) else cls.__name__,
+                              ("description", "text"))
+            index.build(self.all(cls).items())
+        objects = FileStorage.__objects
+        return [objects[key] for s, key in index.search(query, limit)]
+
+    def aggregate(self, cls, function, attr=None, by=None):
+        """ Returns function of the numbers attr holds in the objects of
+        cls, or a dictionary of it for every value of by
+
+        function is one of count, sum, avg, min and max. count counts
+        the objects when attr is None. None is the result over no number
+        but for count. Running aggregates are used when some were
+        declared on attr and by, else the objects are read in one pass.
+        """
+        if function != "count" and attr is None:
+            raise ValueError("{} needs an attribute".format(function))
+        name = cls if isinstance(cls, str) else cls.__name__
+        index = None
+        for found in self.__indexes.get(name, ()):
+            if type(found) is GroupIndex and \
+                    (attr is None or found.attr[0] == attr) and \
+                    (by is None or found.attr[1] == by):
+                index = self.index(name, found.attr, GroupIndex)
+                break
+        if index is None:
+            index = GroupIndex(name, (attr, by))
+            index.build(self.all(name).items())
+        return index.aggregate(function, attr is not None, by is not None)
+
+    def columns(self, cls):
+        """ Returns the up to date columnar store of cls, or None
+
+        It holds the numeric attributes of the objects, see Columns for
+        the filters and aggregates it runs over all of them at once.
+        """
+        return self.index(cls, None, Columns)
 
     def new(self, obj):
         """ sets in __objects the object with key <obj class name>.id """
-        key = "{}.{}".format(type(obj).__name__, obj.id)
+        name = type(obj).__name__
+        key = "{}.{}".format(name, obj.id)
+        if self.__undo is not None:
+            self.__remember(key)
+        registry = self.__registry()
         FileStorage.__objects[key] = obj
+        registry.setdefault(name, {})[key] = None
+        self.__registered_stamp = self.__stamp()
+        with self.__commit:
+            self.__dirty[key] = obj
+        for index in self.__indexes.get(name, ()):
+            if index.built:
+                index.add(key, obj)
+
+    def touch(self, obj):
+        """ Marks obj as modified since the last save """
+        name = type(obj).__name__
+        key = "{}.{}".format(name, getattr(obj, "id", None))
+        objects = FileStorage.__objects
+        if key in objects:
+            if self.__undo is not None:
+                self.__remember(key)
+            if type(objects) is CachedObjects:
+                current = dict.get(objects, key)
+                # evicted, or built again and unchanged since: obj holds
+                # the latest state, kept built until it is written
+                if current is obj or type(current) is tuple or \
+                        key in objects.ranges:
+                    objects.change(key, obj)
+            with self.__commit:
+                self.__dirty[key] = obj
+            if name in self.__indexes:
+                self.__stale[key] = None
+
+    def delete(self, obj=None):
+        """ Removes obj from __objects if it is there """
+        if obj is None:
+            return
+        name = type(obj).__name__
+        key = "{}.{}".format(name, obj.id)
+        if self.__undo is not None:
+            self.__remember(key)
+        registry = self.__registry()
+        FileStorage.__objects.pop(key, None)
+        registry.get(name, {}).pop(key, None)
+        self.__registered_stamp = self.__stamp()
+        with self.__commit:
+            self.__dirty[key] = None
+        for index in self.__indexes.get(name, ()):
+            index.remove(key)
 
     def save(self):
-        """ serialize __objects to the JSON file (path: __file_path) """
-        with open(FileStorage.__file_path, "w", encoding="utf-8") as f:
-            d = {k: v.to_dict() for k, v in FileStorage.__objects.items()}
-            json.dump(d, f)
+        """ serialize __objects to the JSON file (path: __file_path)
+
+        With a background thread the write is left to it and save
+        returns at once, see flush(). Inside batch() nothing is written.
+        """
+        if self.__undo is not None:
+            return
+        if self.__writer is not None:
+            self.__writer.request()
+            return
+        self.flush()
+
+    def flush(self):
+        """ Writes the changes made since the last write
+
+        Only the objects changed since the last write are serialized
+        again. In journal mode they are also the only ones written,
+        appended to the log.
+
+        Writes requested while another thread writes are merged into a
+        single write made once it is done (group commit).
+        """
+        with self.__commit:
+            self.__requested += 1
+            ticket = self.__requested
+            while self.__writing and self.__written < ticket:
+                self.__commit.wait()
+            if self.__written >= ticket:
+                return
+            self.__writing = True
+        try:
+            if self.__commit_delay:
+                time.sleep(self.__commit_delay)
+            with self.__commit:
+                batch = self.__requested
+                dirty, self.__dirty = self.__dirty, {}
+            try:
+                self.__write(dirty)
+            except BaseException:
+                with self.__commit:
+                    dirty.update(self.__dirty)
+                    self.__dirty = dirty
+                raise
+            with self.__commit:
+                self.__written = batch
+        finally:
+            with self.__commit:
+                self.__writing = False
+                self.__commit.notify_all()
+
+    @contextmanager
+    def batch(self):
+        """ Context manager making the saves of its block a single one
+
+        Saves inside the block only keep track of the changes, which
+        are written when the block ends. If an exception escapes the
+        block, the objects created, modified or destroyed in it are put
+        back as they were instead. Attributes are restored from a
+        shallow copy, changes made inside a list are not undone. A
+        batch opened inside another one is part of it.
+        """
+        if self.__undo is not None:
+            yield self
+            return
+        self.__undo = {}
+        try:
+            yield self
+        except BaseException:
+            undo, self.__undo = self.__undo, None
+            self.__rollback(undo)
+            raise
+        self.__undo = None
+        self.save()
+
+    transaction = batch
+
+    def __remember(self, key):
+        """ Keeps the state of key as it was when the batch began """
+        if key in self.__undo:
+            return
+        obj = FileStorage.__objects.get(key)
+        state = None if obj is None else obj.__getstate__()
+        self.__undo[key] = (obj, state)
+
+    def __rollback(self, undo):
+        """ Puts back the keys of undo in their remembered state """
+        for key, (obj, state) in undo.items():
+            current = FileStorage.__objects.get(key)
+            if obj is None:
+                if current is not None:
+                    self.delete(current)
+                continue
+            obj.__setstate__(state)
+            if current is not None and current is not obj:
+                self.delete(current)
+            self.new(obj)
+
+    def close(self):
+        """ Stops the background thread after writing what it left """
+        if self.__writer is None:
+            return
+        pending = self.__writer.stop()
+        self.__writer = None
+        atexit.unregister(self.close)
+        if pending or self.__dirty:
+            self.flush()
+
+    def __write(self, dirty):
+        """ Writes the changes in dirty to the journal or the JSON file """
+        if not self.__journal and self.__shards is not None:
+            self.__write_shards(dirty)
+            return
+        if not self.__journal:
+            self.__write_snapshot(dirty)
+            return
+        changes = {}
+        for key, obj in dirty.items():
+            if obj is None or \
+                    dict.get(FileStorage.__objects, key) is not obj:
+                self.__records.pop(key, None)
+                changes[key] = "null"
+            elif self.__codec.name == "json":
+                changes[key] = self.__encode(key, obj, dirty)
+            else:
+                changes[key] = json.dumps(obj.to_dict())
+        self.__log.append(changes)
+        if self.__log.entries < max(len(FileStorage.__objects),
+                                    FileStorage.__compact_min):
+            return
+        if self.__shards is not None:
+            self.__sharded = None
+            self.__write_shards({})
+        else:
+            self.__write_snapshot({})
+
+    def __encode(self, key, obj, dirty):
+        """ Returns the encoding of obj, reusing it while obj is clean """
+        cached = self.__records.get(key)
+        if cached is not None and cached[0] is obj and key not in dirty:
+            return cached[1]
+        text = self.__codec.record(obj.to_dict())
+        self.__records[key] = (obj, text)
+        return text
+
+    def __write_snapshot(self, dirty):
+        """ Rewrites the JSON file and drops the journal it replaces
+
+        Records never accessed since a lazy reload are copied as they
+        are and pointed to their new place in the file.
+        """
+        objects = FileStorage.__objects
+        if self.__codec.name != "json":
+            self.__replace(self.__codec.join(
+                [(k, self.__encode(k, objects[k], dirty))
+                 for k in list(objects)]))
+            self.__prune()
+            return
+        lazy = isinstance(objects, LazyObjects)
+        parts = []
+        offsets = {}
+        pos = 1
+        for k, v in list(dict.items(objects)):
+            if lazy and type(v) is tuple:
+                text = objects.text(k)
+            else:
+                text = self.__encode(k, v, dirty)
+            part = "{}: {}".format(json.dumps(k), text)
+            size = len(part) if part.isascii() else len(part.encode())
+            if lazy:
+                tsize = len(text) if text.isascii() else len(text.encode())
+                offsets[k] = (pos + size - tsize, pos + size)
+            pos += size + 2
+            parts.append(part)
+        self.__replace("{" + ", ".join(parts) + "}")
+        if lazy:
+            objects.remap(open_map(FileStorage.__file_path), offsets)
+        self.__prune()
+
+    def __prune(self):
+        """ Forgets the encodings of destroyed keys and the journal """
+        objects = FileStorage.__objects
+        if type(objects) is CachedObjects:
+            # the encodings of evicted objects would keep them in memory
+            self.__records = {k: v for k, v in self.__records.items()
+                              if dict.get(objects, k) is v[0]}
+        elif len(self.__records) > len(objects):
+            self.__records = {k: v for k, v in self.__records.items()
+                              if k in objects}
+        self.__log.clear()
+
+    def __write_shards(self, dirty):
+        """ Rewrites the shard files holding the keys of dirty
+
+        All of them are written when __objects is not the one they were
+        last written from, and files no longer used are then removed.
+        """
+        objects = FileStorage.__objects
+        registry = self.__registry()
+        path_of = self.__shards.path_of
+        full = self.__sharded is not objects
+        if full:
+            names = list(registry)
+            contents = {path_of(k): [] for k in objects}
+        else:
+            names = {k.partition(".")[0] for k in dirty}
+            contents = {path_of(k): [] for k in dirty}
+        for name in names:
+            for key in registry.get(name, ()):
+                parts = contents.get(path_of(key))
+                if parts is not None:
+                    parts.append((key,
+                                  self.__encode(key, objects[key], dirty)))
+        for path, parts in contents.items():
+            self.__replace(self.__codec.join(parts), path)
+        if full:
+            for path in self.__shards.paths(self.classes()):
+                if path not in contents:
+                    os.remove(path)
+            if os.path.isfile(FileStorage.__file_path):
+                os.remove(FileStorage.__file_path)
+            self.__sharded = objects
+        self.__log.clear()
+
+    def __replace(self, text, path=None):
+        """ Atomically replaces the JSON file, or the file path, with text
+
+        text is a str or, for binary formats, bytes.
+
+        text is written and synced to a temporary file which is then
+        renamed over the JSON file, so a crash leaves either the old or
+        the new file, never a truncated one.
+        """
+        if path is None:
+            path = FileStorage.__file_path
+        tmp = path + ".tmp"
+        if isinstance(text, str):
+            text = text.encode("utf-8")
+        with open(tmp, "wb") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        try:
+            fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
 
     def classes(self):
         """ Returns dictionary of valid classes and the references """
@@ -46,15 +754,100 @@ class FileStorage:
         return classes
 
     def reload(self):
-        """ Reloads stored objects """
-        if not os.path.isfile(FileStorage.__file_path):
-            return
-        with open(FileStorage.__file_path, "r", encoding="utf-8") as f:
-            obj_dict = json.load(f)
-            obj_dict = {k: self.classes()[v["__class__"]](**v)
-                        for k, v in obj_dict.items()}
+        """ Reloads stored objects, then replays the journal over them
+
+        Shard files are read in parallel, see Shards.load(). The format
+        of a file is found from its first bytes, lazy, cached and
+        streaming reloads only apply to JSON files.
+        """
+        obj_dict = None
+        paths = []
+        codec = None
+        if self.__shards is not None:
+            paths = self.__shards.paths(self.classes())
+        if not paths and os.path.isfile(FileStorage.__file_path):
+            with open(FileStorage.__file_path, "rb") as f:
+                codec = detect(f.read(8))
+        if paths:
+            obj_dict = {}
+            for objects in self.__shards.load(paths, self.__classes()):
+                obj_dict.update(objects)
+        elif codec is None:
+            if self.__cache_size is not None:
+                obj_dict = CachedObjects(None, self.__build,
+                                         self.__cache_size,
+                                         log=self.__log.path)
+        elif codec.name != "json":
+            with open(FileStorage.__file_path, "rb") as f:
+                obj_dict = {k: self.__build(v)
+                            for k, v in codec.split(f.read())}
+        elif self.__cache_size is not None:
+            obj_dict = CachedObjects.from_file(
+                FileStorage.__file_path, self.__build, size=self.__cache_size,
+                log=self.__log.path)
+        elif self.__lazy:
+            obj_dict = LazyObjects.from_file(FileStorage.__file_path,
+                                             self.__build)
+        elif self.__stream:
+            obj_dict = {k: self.__build(v)
+                        for k, v in stream(FileStorage.__file_path)}
+        else:
+            with open(FileStorage.__file_path, "r", encoding="utf-8") as f:
+                obj_dict = json.load(f)
+                obj_dict = {k: self.__build(v) for k, v in obj_dict.items()}
+        cached = type(obj_dict) is CachedObjects
+        for key, record, (start, end) in self.__log.replay():
+            if obj_dict is None:
+                obj_dict = {}
+            if record is None:
+                obj_dict.pop(key, None)
+            elif cached:
+                # built again from the journal when accessed
+                obj_dict.point(key, (start, end, True))
+            else:
+                obj_dict[key] = self.__build(record)
+        if obj_dict is not None:
+            if not isinstance(obj_dict, Objects):
+                obj_dict = Objects(obj_dict)
             # TODO: should this remove or insert?
             FileStorage.__objects = obj_dict
+            self.__dirty.clear()
+            self.__records = {}
+            if paths and not self.__log.entries:
+                self.__sharded = obj_dict
+            if cached:
+                obj_dict.spill = self.__spill
+
+    def __spill(self, key, obj):
+        """ Appends obj to the journal for the object cache to evict it
+
+        Returns the range of its record there, None inside batch() where
+        nothing is written. The next save no longer writes obj, unless
+        it changes again.
+        """
+        if self.__undo is not None:
+            return None
+        start, end = self.__log.append(
+            {key: self.__codec.record(obj.to_dict())}, sync=False)[key]
+        with self.__commit:
+            if self.__dirty.get(key) is obj:
+                del self.__dirty[key]
+        self.__records.pop(key, None)
+        return start, end, True
+
+    def __classes(self):
+        """ Returns the classes reloaded objects are built with """
+        if self.__types is None:
+            types = self.classes()
+            if self.__compact:
+                from models.compact import Compact
+                types = {k: Compact.variant(v) for k, v in types.items()}
+            self.__types = types
+        return self.__types
+
+    def __build(self, record):
+        """ Returns the instance described by a stored record """
+        return self.__classes()[record["__class__"]].from_record(record)
 
     def attributes(self):
         """ Returns valid attributes and the types for classname """
@@ -0,0 +1,189 @@
+#!/usr/bin/python3
+""" Module for the geospatial index FileStorage keeps on places """
+import heapq
+import math
+
+from models.engine.indexes import Index
+
+# mean radius of the Earth, in km
+RADIUS = 6371.0088
+
+
+def distance(lat1, lon1, lat2, lon2):
+    """ Returns the great-circle distance in km between two points """
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + \
+        math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * RADIUS * math.asin(min(1.0, math.sqrt(h)))
+
+
+class GridIndex(Index):
+
+    """ Index of the keys by the cell of a grid their point falls in
+
+    The grid cuts latitudes and longitudes in cells of cell degrees. A
+    query only reads the cells it overlaps, or every occupied cell when
+    those are fewer. Objects whose latitude or longitude is missing or
+    out of range are left out.
+    """
+
+    cell = 0.1
+
+    def __init__(self, cls_name, attr=("latitude", "longitude")):
+        """Initiates the index
+        Args:
+            -cls_name: name of the indexed class
+            -attr: names of the latitude and longitude attributes
+        """
+        super().__init__(cls_name, attr)
+        self.columns = round(360 / self.cell)
+        self.clear()
+
+    def __point(self, obj):
+        """ Returns the (latitude, longitude) of obj, None for none """
+        lat = getattr(obj, self.attr[0], None)
+        lon = getattr(obj, self.attr[1], None)
+        for value, limit in ((lat, 90), (lon, 180)):
+            if not isinstance(value, (int, float)) or \
+                    not -limit <= value <= limit:
+                return None
+        return (lat, lon)
+
+    def __cell(self, lat, lon):
+        """ Returns the (row, column) of the cell holding a point """
+        return (math.floor(lat / self.cell),
+                math.floor((lon + 180) / self.cell) % self.columns)
+
+    def add(self, key, obj):
+        """ Indexes obj under key, replacing what key held before """
+        point = self.__point(obj)
+        if key in self.points:
+            if self.points[key] == point:
+                return
+            self.remove(key)
+        if point is None:
+            return
+        self.points[key] = point
+        self.cells.setdefault(self.__cell(*point), {})[key] = point
+
+    def remove(self, key):
+        """ Removes key from the index """
+        point = self.points.pop(key, None)
+        if point is None:
+            return
+        cell = self.__cell(*point)
+        del self.cells[cell][key]
+        if not self.cells[cell]:
+            del self.cells[cell]
+
+    def clear(self):
+        """ Empties the index """
+        # key -> (latitude, longitude)
+        self.points = {}
+        # (row, column) -> {key: (latitude, longitude)} of its points
+        self.cells = {}
+
+    def __rows(self, south, north):
+        """ Returns the range of the rows between two latitudes """
+        return range(math.floor(max(south, -90) / self.cell),
+                     math.floor(min(north, 90) / self.cell) + 1)
+
+    def __columns(self, west, east):
+        """ Returns the columns between two longitudes, west to east """
+        first = math.floor((west + 180) / self.cell)
+        last = math.floor((east + 180) / self.cell)
+        if east < west:
+            last += self.columns
+        if last - first + 1 >= self.columns:
+            return range(self.columns)
+        return [c % self.columns for c in range(first, last + 1)]
+
+    def box(self, south, west, north, east):
+        """ Returns the keys of the points in a bounding box
+
+        Bounds are included. A box whose west is east of its east
+        crosses the antimeridian.
+        """
+        rows = self.__rows(south, north)
+        columns = self.__columns(west, east)
+        if len(rows) * len(columns) > len(self.cells):
+            cells = self.cells.values()
+        else:
+            cells = filter(None, (self.cells.get((r, c))
+                                  for r in rows for c in columns))
+        crosses = east < west
+        keys = []
+        for points in cells:
+            for key, (lat, lon) in points.items():
+                if south <= lat <= north and \
+                        ((west <= lon <= east) if not crosses else
+                         (lon >= west or lon <= east)):
+                    keys.append(key)
+        return keys
+
+    def radius(self, lat, lon, km):
+        """ Returns the (distance, key) pairs of the points at most km
+        away from (lat, lon), nearest first """
+        dlat = math.degrees(km / RADIUS)
+        south, north = lat - dlat, lat + dlat
+        if south <= -90 or north >= 90:
+            west, east = -180, 180
+        else:
+            # widest longitude span of the circle, at its widest latitude
+            dlon = math.degrees(math.asin(min(1.0, math.sin(km / RADIUS) /
+                                              math.cos(math.radians(lat)))))
+            west = (lon - dlon + 180) % 360 - 180
+            east = (lon + dlon + 180) % 360 - 180
+        found = []
+        for key in self.box(south, west, north, east):
+            d = distance(lat, lon, *self.points[key])
+            if d <= km:
+                found.append((d, key))
+        found.sort()
+        return found
+
+    def nearest(self, lat, lon, k):
+        """ Returns the (distance, key) pairs of the k points nearest to
+        (lat, lon), nearest first
+
+        Rings of cells around the point are read until no point outside
+        them can be nearer than the k-th point found.
+        """
+        if k <= 0 or not self.points:
+            return []
+        row, column = self.__cell(lat, lon)
+        best = []
+        ring = 0
+        rows = math.ceil(180 / self.cell)
+        while True:
+            if (2 * ring + 1) ** 2 > len(self.cells) or ring > rows:
+                # the rings would read more cells than are occupied
+                return heapq.nsmallest(k, ((distance(lat, lon, *p), key)
+                                           for key, p in self.points.items()))
+            for cell in self.__ring(row, column, ring):
+                for key, point in self.cells.get(cell, {}).items():
+                    best.append((distance(lat, lon, *point), key))
+            best = heapq.nsmallest(k, best)
+            if len(best) == k and best[-1][0] <= self.__bound(lat, ring):
+                return best
+            ring += 1
+
+    def __ring(self, row, column, ring):
+        """ Returns the cells at ring cells from (row, column) """
+        if ring == 0:
+            return [(row, column)]
+        cells = set()
+        for r in range(row - ring, row + ring + 1):
+            step = 1 if abs(r - row) == ring else 2 * ring
+            for c in range(column - ring, column + ring + 1, step):
+                cells.add((r, c % self.columns))
+        return cells
+
+    def __bound(self, lat, ring):
+        """ Returns how near a point outside ring rings of cells can be """
+        gap = math.radians(ring * self.cell)
+        if gap >= math.pi / 2:
+            return 0.0
+        # nearest a point can be on the meridian gap away from lat
+        meridian = math.asin(math.sin(gap) * math.cos(math.radians(lat)))
+        return RADIUS * min(gap, meridian)
@@ -0,0 +1,158 @@
+#!/usr/bin/python3
+""" Module for the running aggregates FileStorage keeps per group """
+from models.engine.columns import AGGREGATES
+from models.engine.indexes import Index
+
+
+class Group:
+
+    """ Running aggregates of the values of one group """
+
+    __slots__ = ("values", "count", "total", "bounds")
+
+    def __init__(self):
+        """ Initiates an empty group """
+        # key -> its number, None for none
+        self.values = {}
+        # how many numbers, and their sum
+        self.count = 0
+        self.total = 0
+        # (min, max) of the numbers, None until computed again
+        self.bounds = None
+
+    def add(self, key, value):
+        """ Adds the value of key, None for none """
+        self.values[key] = value
+        if value is None:
+            return
+        self.count += 1
+        self.total += value
+        if self.bounds is not None:
+            self.bounds = (min(self.bounds[0], value),
+                           max(self.bounds[1], value))
+
+    def remove(self, key):
+        """ Removes the value of key """
+        value = self.values.pop(key)
+        if value is None:
+            return
+        self.count -= 1
+        self.total -= value
+        if self.bounds is not None and value in self.bounds:
+            self.bounds = None
+
+    def result(self, function, counted):
+        """ Returns function of the numbers of the group, see
+        GroupIndex.aggregate() """
+        if function == "count":
+            return self.count if counted else len(self.values)
+        if not self.count:
+            return None
+        if function == "sum":
+            return self.total
+        if function == "avg":
+            return self.total / self.count
+        if self.bounds is None:
+            numbers = [v for v in self.values.values() if v is not None]
+            self.bounds = (min(numbers), max(numbers))
+        return self.bounds[0] if function == "min" else self.bounds[1]
+
+
+class GroupIndex(Index):
+
+    """ Running aggregates of an attribute of the objects of one class,
+    grouped by the values of another
+
+    Counts and sums follow every change, so that a sum of floats may
+    drift in its last digits. Minimums and maximums are computed again
+    from the values of a group after one of them left. Values that are
+    not numbers, or NaN, only count as objects.
+    """
+
+    def __init__(self, cls_name, attr):
+        """Initiates the index
+        Args:
+            -cls_name: name of the indexed class
+            -attr: tuple of the name of the aggregated attribute, None
+             to only count objects, and of the attribute grouping them,
+             None for a single group
+        """
+        super().__init__(cls_name, attr)
+        self.clear()
+
+    def __entry(self, obj):
+        """ Returns the (group, number) of obj """
+        value = None
+        if self.attr[0] is not None:
+            value = getattr(obj, self.attr[0], None)
+        if not isinstance(value, (int, float)) or value != value:
+            value = None
+        group = None
+        if self.attr[1] is not None:
+            group = getattr(obj, self.attr[1], None)
+            try:
+                hash(group)
+            except TypeError:
+                group = None
+        return (group, value)
+
+    def add(self, key, obj):
+        """ Indexes obj under key, replacing what key held before """
+        entry = self.__entry(obj)
+        if key in self.entries:
+            if self.entries[key] == entry:
+                return
+            self.remove(key)
+        self.entries[key] = entry
+        group = self.groups.get(entry[0])
+        if group is None:
+            group = self.groups[entry[0]] = Group()
+        group.add(key, entry[1])
+
+    def remove(self, key):
+        """ Removes key from the index """
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        group = self.groups[entry[0]]
+        group.remove(key)
+        if not group.values:
+            del self.groups[entry[0]]
+
+    def clear(self):
+        """ Empties the index """
+        # key -> (group, number)
+        self.entries = {}
+        # group -> Group
+        self.groups = {}
+
+    def aggregate(self, function, counted=True, grouped=True):
+        """ Returns function of the numbers of the aggregated attribute
+
+        function is one of AGGREGATES. count counts the objects rather
+        than the numbers if counted is false. None is the result over no
+        number but for count. With grouped, a dictionary of the result
+        of every group holding a number, or an object for count, is
+        returned.
+        """
+        if function not in AGGREGATES:
+            raise ValueError("unknown aggregate: {}".format(function))
+        if grouped:
+            results = {}
+            for name, group in self.groups.items():
+                if group.count or (function == "count" and not counted):
+                    results[name] = group.result(function, counted)
+            return results
+        if function == "count":
+            return sum(g.result(function, counted)
+                       for g in self.groups.values())
+        groups = [g for g in self.groups.values() if g.count]
+        if not groups:
+            return None
+        if function in ("min", "max"):
+            pick = min if function == "min" else max
+            return pick(g.result(function, counted) for g in groups)
+        total = sum(g.total for g in groups)
+        if function == "sum":
+            return total
+        return total / sum(g.count for g in groups)
@@ -0,0 +1,212 @@
+#!/usr/bin/python3
+""" Module for the secondary indexes kept by FileStorage """
+from bisect import bisect_left, bisect_right, insort
+
+
+class Index:
+
+    """ Base class of the indexes on one attribute of one class
+
+    FileStorage calls add() for every object it indexes and remove()
+    for every key that leaves the index. An index is only maintained
+    once it is built, which FileStorage does on its first query.
+    """
+    # built from the keys alone, the objects being passed as None
+    keys_only = False
+
+    def __init__(self, cls_name, attr):
+        """Initiates the index
+        Args:
+            -cls_name: name of the indexed class
+            -attr: name of the indexed attribute
+        """
+        self.cls_name = cls_name
+        self.attr = attr
+        self.built = False
+
+    def add(self, key, obj):
+        """ Indexes obj under key, replacing what key held before """
+        raise NotImplementedError
+
+    def build(self, items):
+        """ Indexes the (key, obj) pairs of items, the index being empty """
+        for key, obj in items:
+            self.add(key, obj)
+
+    def remove(self, key):
+        """ Removes key from the index """
+        raise NotImplementedError
+
+    def clear(self):
+        """ Empties the index """
+        raise NotImplementedError
+
+
+class HashIndex(Index):
+
+    """ Index from the values of an attribute to the keys holding them """
+
+    def __init__(self, cls_name, attr):
+        """ Initiates the index, see Index """
+        super().__init__(cls_name, attr)
+        self.clear()
+
+    def add(self, key, obj):
+        """ Indexes obj under key, replacing what key held before """
+        value = getattr(obj, self.attr, None)
+        try:
+            hash(value)
+        except TypeError:
+            self.remove(key)
+            return
+        if key in self.values:
+            if self.values[key] == value:
+                return
+            self.remove(key)
+        self.values[key] = value
+        self.keys.setdefault(value, {})[key] = None
+
+    def remove(self, key):
+        """ Removes key from the index """
+        if key not in self.values:
+            return
+        value = self.values.pop(key)
+        keys = self.keys[value]
+        del keys[key]
+        if not keys:
+            del self.keys[value]
+
+    def clear(self):
+        """ Empties the index """
+        # key -> indexed value
+        self.values = {}
+        # indexed value -> keys holding it
+        self.keys = {}
+
+    def lookup(self, value):
+        """ Returns the keys whose attribute equals value """
+        try:
+            return self.keys.get(value, {})
+        except TypeError:
+            return {}
+
+
+class RangeIndex(Index):
+
+    """ Index of the keys in the order of the numeric values of an attribute
+
+    The (value, key) pairs are kept sorted in buckets of at most twice
+    load pairs, so that add() and remove() only shift one bucket and
+    range() finds the keys whose value lies between two bounds in
+    O(log n + k). Values that are not numbers, or NaN, are left out.
+    """
+
+    load = 500
+
+    def __init__(self, cls_name, attr):
+        """ Initiates the index, see Index """
+        super().__init__(cls_name, attr)
+        self.clear()
+
+    def value(self, key, obj):
+        """ Returns the value to index obj under key by, None for none """
+        value = getattr(obj, self.attr, None)
+        if not isinstance(value, (int, float)) or value != value:
+            return None
+        return value
+
+    def build(self, items):
+        """ Indexes the (key, obj) pairs of items, the index being empty """
+        for key, obj in items:
+            value = self.value(key, obj)
+            if value is not None:
+                self.values[key] = value
+        pairs = sorted((v, k) for k, v in self.values.items())
+        self.buckets = [pairs[i:i + self.load]
+                        for i in range(0, len(pairs), self.load)]
+        self.firsts = [bucket[0] for bucket in self.buckets]
+
+    def add(self, key, obj):
+        """ Indexes obj under key, replacing what key held before """
+        value = self.value(key, obj)
+        if key in self.values:
+            if self.values[key] == value:
+                return
+            self.remove(key)
+        if value is None:
+            return
+        self.values[key] = value
+        pair = (value, key)
+        if not self.buckets:
+            self.buckets.append([pair])
+            self.firsts.append(pair)
+            return
+        i = max(bisect_right(self.firsts, pair) - 1, 0)
+        bucket = self.buckets[i]
+        insort(bucket, pair)
+        self.firsts[i] = bucket[0]
+        if len(bucket) > 2 * self.load:
+            self.buckets.insert(i + 1, bucket[self.load:])
+            self.firsts.insert(i + 1, bucket[self.load])
+            del bucket[self.load:]
+
+    def remove(self, key):
+        """ Removes key from the index """
+        if key not in self.values:
+            return
+        pair = (self.values.pop(key), key)
+        i = bisect_right(self.firsts, pair) - 1
+        bucket = self.buckets[i]
+        del bucket[bisect_left(bucket, pair)]
+        if bucket:
+            self.firsts[i] = bucket[0]
+        else:
+            del self.buckets[i]
+            del self.firsts[i]
+
+    def clear(self):
+        """ Empties the index """
+        # key -> indexed value
+        self.values = {}
+        # sorted buckets of (value, key) pairs, and the first pair of each
+        self.buckets = []
+        self.firsts = []
+
+    def range(self, low=None, high=None):
+        """ Returns the keys whose value is between low and high included,
+        in the order of the values
+
+        A bound of None leaves the range open on its side.
+        """
+        return list(self.ordered(low, high))
+
+    def ordered(self, low=None, high=None):
+        """ Yields the keys range() returns, one at a time
+
+        Keys removed while the generator runs may still be yielded.
+        """
+        if not self.buckets:
+            return
+        i = start = 0
+        if low is not None:
+            i = max(bisect_left(self.firsts, (low,)) - 1, 0)
+            start = bisect_left(self.buckets[i], (low,))
+        for bucket in self.buckets[i:]:
+            for value, key in bucket[start:]:
+                if high is not None and value > high:
+                    return
+                yield key
+            start = 0
+
+
+class KeyIndex(RangeIndex):
+
+    """ Index of the keys of the objects of a class, in their order
+
+    ordered() yields them from any key on, whatever the objects hold.
+    """
+    keys_only = True
+
+    def value(self, key, obj):
+        """ Returns key, which the index orders """
+        return key
@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+""" Module for the append-only journal used by FileStorage """
+import json
+import os
+
+
+class Journal:
+
+    """ Append-only log of the changes made since the last snapshot
+
+    Every line of the file is a JSON array [key, record] where record is
+    the to_dict() of the object, or null when the object was destroyed.
+    """
+
+    def __init__(self, path):
+        """Initiates the journal
+        Args:
+            -path: path of the log file
+        """
+        self.path = path
+        self.entries = 0
+
+    def append(self, changes, sync=True):
+        """ Appends one line per changed key to the log
+        Args:
+            -changes: dict of key and the JSON text of its record
+            -sync: False to return before the lines reach the disk
+        Returns the byte range of the JSON text of each record in the
+        file, by key.
+        """
+        if not changes:
+            return {}
+        ranges = {}
+        lines = []
+        with open(self.path, "ab") as f:
+            pos = f.tell()
+            for k, v in changes.items():
+                literal = json.dumps(k)
+                line = "[{}, {}]\n".format(literal, v).encode("utf-8")
+                # after "[", the key and ", ", before "]\n"
+                ranges[k] = (pos + len(literal) + 3, pos + len(line) - 2)
+                pos += len(line)
+                lines.append(line)
+            f.write(b"".join(lines))
+            f.flush()
+            if sync:
+                os.fsync(f.fileno())
+        self.entries += len(lines)
+        return ranges
+
+    def replay(self):
+        """ Yields (key, record, range) for every complete line of the log
+
+        range is the byte range of the JSON text of record in the file.
+        A torn last line, left by a crash mid append, is cut off the
+        file once the lines before it are read, so that the next append
+        does not start on it.
+        """
+        self.entries = 0
+        if not os.path.isfile(self.path):
+            return
+        end = 0
+        torn = False
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("line not ended")
+                    key, record = json.loads(line)
+                except ValueError:
+                    torn = True
+                    break
+                start = end + len(json.dumps(key)) + 3
+                end += len(line)
+                self.entries += 1
+                yield key, record, (start, end - 2)
+        if torn:
+            with open(self.path, "r+b") as f:
+                f.truncate(end)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def clear(self):
+        """ Removes the log once its changes are part of a snapshot """
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+        self.entries = 0
@@ -0,0 +1,348 @@
+#!/usr/bin/python3
+""" Module for lazily loaded objects of FileStorage """
+import json
+import mmap
+import os
+import re
+from collections import OrderedDict
+from collections.abc import ItemsView, ValuesView
+
+from models.engine.objects import Objects
+
+_STRING = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+# a "key": {record} pair whose record holds no nested object
+_RECORD = re.compile(rb'[\s,]*(' + _STRING + rb')\s*:\s*(\{[^"{}]*(?:' +
+                     _STRING + rb'[^"{}]*)*\})')
+# string literals, opening and closing brackets of a JSON document
+_TOKENS = re.compile(rb'(' + _STRING + rb')|([\[{])|([\]}])')
+
+
+def _key(literal):
+    """ Returns the str of a JSON string literal """
+    if b"\\" in literal:
+        return json.loads(literal)
+    return literal[1:-1].decode("utf-8")
+
+
+def _nested_record(buf, pos):
+    """ Returns (key, start, end) of the record after pos, token by token
+
+    This is the slow path for records holding nested objects. None is
+    returned once the closing bracket of the document is reached, a
+    ValueError raised if buf ends before it.
+    """
+    depth = 0
+    key = None
+    start = 0
+    for m in _TOKENS.finditer(buf, pos):
+        kind = m.lastindex
+        if kind == 1:
+            if depth == 0:
+                key = _key(m.group(1))
+        elif kind == 2:
+            if depth == 0:
+                start = m.start()
+            depth += 1
+        else:
+            if depth == 0:
+                return None
+            depth -= 1
+            if depth == 0:
+                return key, start, m.end()
+    raise ValueError("the JSON document ends before its closing }")
+
+
+def scan(buf):
+    """ Yields (key, start, end) for every record of a JSON file
+
+    buf holds a JSON object of objects, as written by FileStorage. The
+    records are delimited with regular expressions, not decoded. A
+    ValueError is raised when buf is cut short, such as by a crash
+    mid-write, rather than yielding part of its records.
+    """
+    pos = buf.find(b"{") + 1
+    if pos == 0:
+        raise ValueError("no JSON object in the file")
+    match = _RECORD.match
+    while True:
+        m = match(buf, pos)
+        if m is not None:
+            yield _key(m.group(1)), m.start(2), m.end(2)
+            pos = m.end()
+            continue
+        found = _nested_record(buf, pos)
+        if found is None:
+            return
+        yield found
+        pos = found[2]
+
+
+def open_map(path):
+    """ Returns a read only memory map of path, None if it is empty """
+    with open(path, "rb") as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return None
+
+
+def stream(path):
+    """ Yields (key, record) for every record of path, one at a time
+
+    Only the current record is decoded, the rest of the file stays in
+    the page cache of the memory map.
+    """
+    source = open_map(path)
+    if source is None:
+        return
+    try:
+        for key, start, end in scan(source):
+            yield key, json.loads(source[start:end])
+    finally:
+        source.close()
+
+
+class LazyObjects(Objects):
+
+    """ Dictionary of objects built from their record on first access
+
+    Keys not yet accessed hold a (start, end) tuple, the byte range of
+    their record in the mapped file.
+    """
+
+    def __init__(self, source, build):
+        """Initiates the dictionary
+        Args:
+            -source: memory map of the file holding the records
+            -build: callable making an object from a record dict
+        """
+        super().__init__()
+        self.source = source
+        self.build = build
+
+    @classmethod
+    def from_file(cls, path, build, **kwargs):
+        """ Returns the dictionary indexing every record of path """
+        objects = cls(open_map(path), build, **kwargs)
+        if objects.source is not None:
+            for key, start, end in scan(objects.source):
+                dict.__setitem__(objects, key, (start, end))
+        return objects
+
+    def text(self, key):
+        """ Returns the JSON text of key if it was never accessed """
+        value = dict.get(self, key)
+        if type(value) is not tuple:
+            return None
+        return self.read(value).decode("utf-8")
+
+    def read(self, value):
+        """ Returns the bytes of the record a (start, end) tuple is the
+        range of """
+        return self.source[value[0]:value[1]]
+
+    def remap(self, source, offsets):
+        """ Points the keys not yet accessed to their range in source """
+        self.source = source
+        for key, value in dict.items(self):
+            if type(value) is tuple:
+                dict.__setitem__(self, key, offsets[key])
+
+    def __load(self, key, value):
+        """ Builds the object of key from its record if needed """
+        if type(value) is tuple:
+            value = self.build(json.loads(self.read(value)))
+            dict.__setitem__(self, key, value)
+        return value
+
+    def __getitem__(self, key):
+        """ Returns the object of key """
+        return self.__load(key, dict.__getitem__(self, key))
+
+    def get(self, key, default=None):
+        """ Returns the object of key, default if it is missing """
+        if key not in self:
+            return default
+        return self[key]
+
+    def pop(self, key, *default):
+        """ Removes key and returns its object """
+        value = super().pop(key, *default)
+        if type(value) is tuple:
+            value = self.build(json.loads(self.read(value)))
+        return value
+
+    def popitem(self):
+        """ Removes the last key and returns it with its object """
+        key = next(reversed(self.keys()))
+        return key, self.pop(key)
+
+    def setdefault(self, key, default=None):
+        """ Returns the object of key, made default if it is missing """
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def copy(self):
+        """ Returns a dict of every object, all of them built """
+        return dict(self.items())
+
+    def __iter__(self):
+        """ Iterates over the keys
+
+        Overridden for dict() and {**objects} to copy the objects through
+        __getitem__ rather than the ranges stored in their place.
+        """
+        return dict.__iter__(self)
+
+    def values(self):
+        """ Returns a view of all objects, built one at a time """
+        return ValuesView(self)
+
+    def items(self):
+        """ Returns a view of all (key, object) pairs, built one at a
+        time """
+        return ItemsView(self)
+
+    def __eq__(self, other):
+        """ Compares the objects, building them one at a time """
+        if not isinstance(other, dict):
+            return NotImplemented
+        if len(self) != len(other):
+            return False
+        for key in self:
+            if key not in other or self[key] != other[key]:
+                return False
+        return True
+
+    def __ne__(self, other):
+        """ Compares the objects, building them one at a time """
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __repr__(self):
+        """ Returns the representation of a dict of every object """
+        return "{" + ", ".join("{!r}: {!r}".format(k, v)
+                               for k, v in self.items()) + "}"
+
+
+class CachedObjects(LazyObjects):
+
+    """ LazyObjects keeping at most size objects built at a time
+
+    The least recently used object is evicted, its key pointed back to
+    its record, once more than size objects are built. A changed object
+    is first handed to spill, which writes it elsewhere than the mapped
+    file, such as the journal, and returns the range of its record there
+    as a (start, end, True) tuple read from the file at log. Changes
+    made without setting an attribute, such as inside a list, are lost
+    on eviction.
+    """
+
+    def __init__(self, source, build, size=1000, spill=None, log=None):
+        """Initiates the dictionary
+        Args:
+            -source: memory map of the file holding the records
+            -build: callable making an object from a record dict
+            -size: number of objects kept built at most, 1 or more
+            -spill: callable writing the record of (key, object) and
+             returning its range in log, None to keep changed objects
+             built
+            -log: path of the file spilled records are read from
+        """
+        super().__init__(source, build)
+        if size < 1:
+            raise ValueError("the cache holds at least one object")
+        self.size = size
+        self.spill = spill
+        self.log = log
+        self.__log_file = None
+        # built objects, least recently used first
+        self.lru = OrderedDict()
+        # key -> range of the record of its built object, while unchanged
+        self.ranges = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def read(self, value):
+        """ Returns the bytes of the record value is the range of, in
+        the log when it is a (start, end, True) tuple """
+        if len(value) == 2:
+            return self.source[value[0]:value[1]]
+        if self.__log_file is None:
+            self.__log_file = open(self.log, "rb")
+        return os.pread(self.__log_file.fileno(), value[1] - value[0],
+                        value[0])
+
+    def __getitem__(self, key):
+        """ Returns the object of key, building it again if evicted """
+        value = dict.__getitem__(self, key)
+        if type(value) is not tuple:
+            self.hits += 1
+            self.lru.move_to_end(key)
+            if len(self.lru) > self.size:
+                self.__evict()
+            return value
+        self.misses += 1
+        obj = self.build(json.loads(self.read(value)))
+        dict.__setitem__(self, key, obj)
+        self.ranges[key] = value
+        self.lru[key] = None
+        self.__evict()
+        return obj
+
+    def __setitem__(self, key, obj):
+        """ Makes obj the object of key, changed since it was written """
+        self.change(key, obj)
+        self.__evict()
+
+    def change(self, key, obj):
+        """ Makes obj the object of key, about to change, without
+        evicting any object before it did """
+        Objects.__setitem__(self, key, obj)
+        self.ranges.pop(key, None)
+        self.lru[key] = None
+        self.lru.move_to_end(key)
+
+    def point(self, key, value):
+        """ Points key to the range of its record, dropping its object """
+        self.lru.pop(key, None)
+        self.ranges.pop(key, None)
+        Objects.__setitem__(self, key, value)
+
+    def pop(self, key, *default):
+        """ Removes key and returns its object """
+        self.lru.pop(key, None)
+        self.ranges.pop(key, None)
+        return super().pop(key, *default)
+
+    def remap(self, source, offsets):
+        """ Points the keys to their range in source, the objects built
+        are then unchanged since it was written, and no record is read
+        from the log any more """
+        super().remap(source, offsets)
+        for key in self.lru:
+            if key in offsets:
+                self.ranges[key] = offsets[key]
+        if self.__log_file is not None:
+            self.__log_file.close()
+            self.__log_file = None
+
+    def __evict(self):
+        """ Evicts the least recently used objects beyond size """
+        skipped = 0
+        while len(self.lru) > self.size and skipped < len(self.lru):
+            key = next(iter(self.lru))
+            if key not in self.ranges and self.spill is not None:
+                value = self.spill(key, dict.__getitem__(self, key))
+                if value is not None:
+                    self.ranges[key] = value
+            if key not in self.ranges:
+                # still changed, it stays built until the next write
+                self.lru.move_to_end(key)
+                skipped += 1
+                continue
+            del self.lru[key]
+            dict.__setitem__(self, key, self.ranges.pop(key))
+            self.evictions += 1
@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+""" Module for the dictionary of objects of FileStorage """
+
+
+class Objects(dict):
+
+    """ Dictionary counting the changes made to its set of keys
+
+    version grows whenever a key is added or removed, whichever way,
+    but not when the object of a key is replaced. FileStorage compares
+    it to tell whether its keys grouped by class are still those of the
+    dictionary.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """ Initiates the dictionary like dict() """
+        super().__init__(*args, **kwargs)
+        self.version = 0
+
+    def __setitem__(self, key, value):
+        """ Sets the object of key """
+        if key not in self:
+            self.version += 1
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        """ Removes key """
+        dict.__delitem__(self, key)
+        self.version += 1
+
+    def pop(self, key, *default):
+        """ Removes key and returns its object """
+        if key in self:
+            self.version += 1
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        """ Removes the last key and returns it with its object """
+        item = dict.popitem(self)
+        self.version += 1
+        return item
+
+    def setdefault(self, key, default=None):
+        """ Returns the object of key, made default if it is missing """
+        if key not in self:
+            self.version += 1
+        return dict.setdefault(self, key, default)
+
+    def update(self, *args, **kwargs):
+        """ Sets the objects of other keys """
+        dict.update(self, *args, **kwargs)
+        self.version += 1
+
+    def __ior__(self, other):
+        """ Sets the objects of the keys of other """
+        self.update(other)
+        return self
+
+    def clear(self):
+        """ Removes every key """
+        dict.clear(self)
+        self.version += 1
@@ -0,0 +1,225 @@
+#!/usr/bin/python3
+""" Module for the queries FileStorage runs over the objects of a class """
+import operator
+from itertools import chain, islice
+
+from models.engine import columns
+from models.engine.columns import Columns
+from models.engine.indexes import HashIndex, RangeIndex
+
+# comparisons where() accepts, as suffixes of its keyword names
+OPERATORS = {"eq": operator.eq, "ne": operator.ne, "lt": operator.lt,
+             "le": operator.le, "gt": operator.gt, "ge": operator.ge,
+             "in": lambda value, values: value in values}
+# the same comparisons, as Columns.filter() names them
+SYMBOLS = {"eq": "==", "ne": "!=", "lt": "<", "le": "<=", "gt": ">",
+           "ge": ">="}
+
+
+def number(value):
+    """ Returns whether value is a number an ordered index holds """
+    return isinstance(value, (int, float)) and value == value
+
+
+class Query:
+
+    """ Query over the objects of one class of a FileStorage
+
+    where(), order_by() and limit() return a new query and run nothing:
+    the objects are only looked for once the query is iterated over. It
+    then reads the keys the most selective index gives, checks every
+    condition on their objects and sorts those unless the keys come in
+    order already. Without order_by() the objects come in no particular
+    order.
+
+    An equality looks in a hash index and bounds on a number in an
+    ordered index. Without either, conditions on numbers are passed to
+    the columnar store when NumPy is installed, and an order_by() on an
+    attribute with an ordered index reads it in order. The objects of
+    the class are scanned otherwise.
+    """
+
+    def __init__(self, storage, cls):
+        """Initiates the query of every object of cls
+        Args:
+            -storage: FileStorage holding the objects
+            -cls: class or class name of the objects
+        """
+        self.__storage = storage
+        self.__cls = cls if isinstance(cls, str) else cls.__name__
+        # (attr, operator name, value) the objects must all meet
+        self.__conditions = ()
+        # attribute names, "-" in front for a descending order
+        self.__order = ()
+        self.__limit = None
+
+    def __copy(self):
+        """ Returns a copy of the query """
+        query = Query(self.__storage, self.__cls)
+        query.__conditions = self.__conditions
+        query.__order = self.__order
+        query.__limit = self.__limit
+        return query
+
+    def where(self, **conditions):
+        """ Returns the query of the objects also meeting conditions
+
+        A keyword is an attribute name, followed by two underscores and
+        one of OPERATORS to compare with something else than eq, as in
+        where(city_id=id, price_by_night__lt=100). "in" takes a list of
+        values. Objects missing the attribute hold None.
+        """
+        query = self.__copy()
+        for name, value in conditions.items():
+            attr, sep, op = name.rpartition("__")
+            if not attr or op not in OPERATORS:
+                attr, op = name, "eq"
+            if op == "in":
+                value = list(value)
+            query.__conditions += ((attr, op, value),)
+        return query
+
+    def order_by(self, *attrs):
+        """ Returns the query of the objects sorted by attrs
+
+        An attribute name starting with "-" sorts in descending order.
+        Numbers come first, then other values in the order of their
+        str(), as the console stores "5" for 5, and objects missing the
+        attribute, or holding None, last. Ties are in the order of the
+        keys.
+        """
+        query = self.__copy()
+        query.__order = attrs
+        return query
+
+    def limit(self, count):
+        """ Returns the query of the first count objects at most """
+        query = self.__copy()
+        query.__limit = count
+        return query
+
+    def __iter__(self):
+        """ Runs the query and yields its objects """
+        return (obj for key, obj in self.__run())
+
+    def all(self):
+        """ Returns the list of the objects of the query """
+        return list(self)
+
+    def first(self):
+        """ Returns the first object of the query, None for none """
+        return next(iter(self.limit(1)), None)
+
+    def count(self):
+        """ Returns the number of objects of the query """
+        return sum(1 for obj in self)
+
+    def explain(self):
+        """ Returns a description of how the query is run """
+        return self.__plan()[0]
+
+    def __run(self):
+        """ Yields the (key, object) pairs of the query """
+        plan, keys, ordered = self.__plan()
+        objects = self.__storage.all()
+        found = ((key, objects.get(key)) for key in keys)
+        found = (pair for pair in found
+                 if pair[1] is not None and self.__meets(pair[1]))
+        if self.__order and not ordered:
+            found = self.__sort(found)
+        yield from islice(found, self.__limit)
+
+    def __plan(self):
+        """ Returns a description of the plan, the keys to read and
+        whether they come in the order of the query """
+        storage = self.__storage
+        best = None
+        bounds = {}
+        for attr, op, value in self.__conditions:
+            if op in ("eq", "in"):
+                index = storage.index(self.__cls, attr, HashIndex)
+                if index is not None:
+                    keys = {}
+                    for item in ([value] if op == "eq" else value):
+                        keys.update(index.lookup(item))
+                    best = self.__best(best, "hash index on " + attr, keys)
+            if op in ("eq", "lt", "le", "gt", "ge") and number(value):
+                low, high = bounds.get(attr, (None, None))
+                if op in ("eq", "gt", "ge"):
+                    low = value if low is None else max(low, value)
+                if op in ("eq", "lt", "le"):
+                    high = value if high is None else min(high, value)
+                bounds[attr] = (low, high)
+        for attr, (low, high) in bounds.items():
+            index = storage.index(self.__cls, attr, RangeIndex)
+            if index is not None:
+                best = self.__best(best, "range index on " + attr,
+                                   index.range(low, high))
+        sort = None
+        if len(self.__order) == 1 and not self.__order[0].startswith("-"):
+            sort = self.__order[0]
+        if best is not None:
+            return best + (best[0] == "range index on {}".format(sort),)
+        if sort is not None and self.__limit is not None:
+            index = storage.index(self.__cls, sort, RangeIndex)
+            if index is not None:
+                return ("range index on {}, in order".format(sort),
+                        chain(index.ordered(), self.__rest(index)), True)
+        store = storage.index(self.__cls, None, Columns)
+        if store is not None and columns.numpy is not None:
+            conditions = [(attr, SYMBOLS[op], value)
+                          for attr, op, value in self.__conditions
+                          if attr in store.attr and op in SYMBOLS and
+                          (number(value) if attr in store.numeric
+                           else op in ("eq", "ne"))]
+            if conditions:
+                return ("columns", store.filter(*conditions), False)
+        return ("scan", list(storage.all(self.__cls)), False)
+
+    def __best(self, best, plan, keys):
+        """ Returns the plan reading the fewest keys """
+        if best is None or len(keys) < len(best[1]):
+            return (plan, list(keys))
+        return best
+
+    def __rest(self, index):
+        """ Yields the keys of the class an ordered index leaves out,
+        in the order of the query """
+        left = [(key, obj) for key, obj in self.__storage.all(
+            self.__cls).items() if key not in index.values]
+        for key, obj in self.__sort(left):
+            yield key
+
+    def __meets(self, obj):
+        """ Returns whether obj meets every condition """
+        for attr, op, value in self.__conditions:
+            try:
+                if not OPERATORS[op](getattr(obj, attr, None), value):
+                    return False
+            except TypeError:
+                return False
+        return True
+
+    def __sort(self, pairs):
+        """ Returns the (key, object) pairs sorted in the query order """
+        pairs = sorted(pairs, key=operator.itemgetter(0))
+        for attr in reversed(self.__order):
+            descending = attr.startswith("-")
+            attr = attr.lstrip("-")
+            # numbers, other values then None either way
+            pairs.sort(key=lambda pair: self.__value(pair[1], attr,
+                                                     descending),
+                       reverse=descending)
+        return pairs
+
+    @staticmethod
+    def __value(obj, attr, descending):
+        """ Returns the sort key of obj on attr """
+        value = getattr(obj, attr, None)
+        if number(value):
+            rank = 0
+        elif value is None:
+            rank, value = 2, 0
+        else:
+            rank, value = 1, str(value)
+        return (2 - rank if descending else rank, value)
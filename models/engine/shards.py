@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+""" Module for the shard files of FileStorage """
+import glob
+import multiprocessing
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from models.engine.codecs import decode
+
+
+def _load(path, classes):
+    """ Returns the objects of one shard file, run in a worker process """
+    with open(path, "rb") as f:
+        records = decode(f.read())
+    return {k: classes[v["__class__"]].from_record(v) for k, v in records}
+
+
+def available_cpus():
+    """ Returns the number of CPUs this process may run on """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+class Shards:
+
+    """ Names and loads the files the objects are split into
+
+    Every class has its own file, file.<class>.json next to file.json,
+    or count of them, file.<class>.<n>.json, keys being spread among
+    them by hash.
+    """
+
+    def __init__(self, path, count):
+        """Initiates the shards
+        Args:
+            -path: path of the JSON file the shards replace
+            -count: number of files per class
+        """
+        self.base = os.path.splitext(path)[0]
+        self.count = count
+
+    def path_of(self, key):
+        """ Returns the path of the file holding key """
+        name = key.partition(".")[0]
+        if self.count == 1:
+            return "{}.{}.json".format(self.base, name)
+        shard = zlib.crc32(key.encode("utf-8")) % self.count
+        return "{}.{}.{}.json".format(self.base, name, shard)
+
+    def paths(self, names):
+        """ Returns the paths of the existing files of the classes names """
+        found = []
+        base = glob.escape(self.base)
+        for name in names:
+            found.extend(sorted(glob.glob("{}.{}.json".format(base, name))))
+            found.extend(sorted(glob.glob("{}.{}.*.json".format(base, name))))
+        return found
+
+    def load(self, paths, classes, workers=None):
+        """ Returns the objects of the files paths, read in parallel
+
+        Every file is decoded and its objects built by one of workers
+        processes, as many as there are CPUs available by default. The
+        objects are sent back pickled and unpickled by this process one
+        after the other, which takes about three quarters of the time
+        building them does: so with one worker, or without fork as on
+        Windows, the files are read here one after the other instead.
+        """
+        if workers is None:
+            workers = available_cpus()
+        workers = min(len(paths), workers)
+        if workers < 2 or \
+                "fork" not in multiprocessing.get_all_start_methods():
+            return [_load(path, classes) for path in paths]
+        context = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(workers, mp_context=context) as pool:
+            return list(pool.map(_load, paths, repeat(classes)))
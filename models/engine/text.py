@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+""" Module for the full-text index FileStorage keeps on text attributes """
+import math
+import re
+from collections import Counter
+
+from models.engine.indexes import Index
+
+# a term is a run of letters, digits or underscores
+WORD = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """ Returns the list of the terms of text, lowercased """
+    return WORD.findall(text.casefold())
+
+
+class TextIndex(Index):
+
+    """ Inverted index of the terms of some text attributes of one class
+
+    The text of an object is its attributes joined. Every term points
+    to the keys whose text holds it and how many times, and search()
+    ranks those keys by Okapi BM25. Attributes that are not strings are
+    taken for empty texts.
+    """
+
+    # BM25 weight of the term frequency, and of the text length
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self, cls_name, attr):
+        """Initiates the index
+        Args:
+            -cls_name: name of the indexed class
+            -attr: tuple of the names of the indexed attributes
+        """
+        super().__init__(cls_name, attr)
+        self.clear()
+
+    def __text(self, obj):
+        """ Returns the tuple of the indexed texts of obj """
+        return tuple(value if isinstance(value, str) else ""
+                     for value in (getattr(obj, a, None) for a in self.attr))
+
+    def add(self, key, obj):
+        """ Indexes obj under key, replacing what key held before """
+        text = self.__text(obj)
+        if key in self.texts:
+            if self.texts[key] == text:
+                return
+            self.remove(key)
+        terms = Counter(tokenize(" ".join(text)))
+        if not terms:
+            return
+        self.texts[key] = text
+        self.lengths[key] = sum(terms.values())
+        self.total += self.lengths[key]
+        for term, count in terms.items():
+            self.postings.setdefault(term, {})[key] = count
+
+    def remove(self, key):
+        """ Removes key from the index """
+        text = self.texts.pop(key, None)
+        if text is None:
+            return
+        self.total -= self.lengths.pop(key)
+        for term in set(tokenize(" ".join(text))):
+            keys = self.postings[term]
+            del keys[key]
+            if not keys:
+                del self.postings[term]
+
+    def clear(self):
+        """ Empties the index """
+        # key -> indexed texts, and number of terms in them
+        self.texts = {}
+        self.lengths = {}
+        self.total = 0
+        # term -> {key: number of times its text holds the term}
+        self.postings = {}
+
+    def search(self, query, limit=None):
+        """ Returns the (score, key) pairs of the keys whose text holds
+        a term of query, best first
+
+        limit, when given, is the number of pairs returned at most.
+        """
+        count = len(self.lengths)
+        if not count:
+            return []
+        average = self.total / count
+        scores = {}
+        for term in set(tokenize(query)):
+            keys = self.postings.get(term)
+            if not keys:
+                continue
+            idf = math.log(1 + (count - len(keys) + 0.5) / (len(keys) + 0.5))
+            for key, frequency in keys.items():
+                norm = self.k1 * (1 - self.b + self.b *
+                                  self.lengths[key] / average)
+                scores[key] = scores.get(key, 0.0) + idf * frequency * \
+                    (self.k1 + 1) / (frequency + norm)
+        pairs = sorted((-score, key) for key, score in scores.items())
+        return [(-score, key) for score, key in pairs[:limit]]
@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+""" Module for the write-behind thread of FileStorage """
+import threading
+
+
+class WriteBehind(threading.Thread):
+
+    """ Background thread running the saves requested of a storage
+
+    Requests are only counted. The thread flushes them all at once
+    every interval seconds, or as soon as threshold of them wait.
+    """
+
+    def __init__(self, flush, interval, threshold):
+        """Initiates the thread
+        Args:
+            -flush: callable writing the storage
+            -interval: seconds between two flushes
+            -threshold: number of requests that triggers an early flush
+        """
+        super().__init__(name="hbnb-write-behind", daemon=True)
+        self.flush = flush
+        self.interval = interval
+        self.threshold = threshold
+        self.pending = 0
+        self.__lock = threading.Lock()
+        self.__wake = threading.Event()
+        self.__stopped = False
+
+    def request(self):
+        """ Records a save to be done by the thread """
+        with self.__lock:
+            self.pending += 1
+            if self.pending >= self.threshold:
+                self.__wake.set()
+
+    def run(self):
+        """ Flushes the pending requests until the thread is stopped """
+        while not self.__stopped:
+            self.__wake.wait(self.interval)
+            self.__wake.clear()
+            if self.__stopped or not self.pending:
+                continue
+            with self.__lock:
+                pending, self.pending = self.pending, 0
+            try:
+                self.flush()
+            except Exception:
+                # the storage kept its changes, retry on the next round
+                with self.__lock:
+                    self.pending += pending
+
+    def stop(self):
+        """ Stops the thread and returns the requests left unflushed """
+        self.__stopped = True
+        self.__wake.set()
+        if self.is_alive():
+            self.join()
+        return self.pending
@@ -4,6 +4,7 @@ import cmd
 import json
 import re
 import sys
+from itertools import islice
 
 from models import storage
 
@@ -14,10 +15,12 @@ class HBNBCommand(cmd.Cmd):
     def do_EOF(self, arg):
         """Exits the program"""
         print()
+        storage.close()
         return True
 
     def do_quit(self, arg):
         """Exits the program"""
+        storage.close()
         return True
 
     def do_create(self, arg):
@@ -44,11 +47,11 @@ class HBNBCommand(cmd.Cmd):
         if len(args) < 2:
             print("** instance id missing **")
             return
-        key = f"{args[0]}.{args[1]}"
-        if key not in storage.all():
+        instance = storage.get(args[0], args[1])
+        if instance is None:
             print("** no instance found **")
             return
-        print(storage.all()[key])
+        print(instance)
 
     def do_destroy(self, arg):
         """Deletes a specific instance"""
@@ -62,27 +65,84 @@ class HBNBCommand(cmd.Cmd):
         if len(args) < 2:
             print("** instance id missing **")
             return
-        key = f"{args[0]}.{args[1]}"
-        if key not in storage.all():
+        instance = storage.get(args[0], args[1])
+        if instance is None:
             print("** no instance found **")
             return
-        del storage.all()[key]
+        storage.delete(instance)
         storage.save()
 
     def do_all(self, arg):
-        """Displays all instances of a class or all classes"""
-        instances = []
-        if arg:
-            if arg not in storage.classes():
-                print("** class doesn't exist **")
+        """Displays all instances of a class or all classes, a page of
+        them with: all [<class>] [limit=<n>] [offset=<n>] [after=<key>]
+        format=ndjson writes one JSON object per line instead"""
+        args = arg.split()
+        options = {}
+        while args and "=" in args[-1]:
+            name, value = args.pop().split("=", 1)
+            options[name] = value
+        form = options.pop("format", "list")
+        if set(options) - {"limit", "offset", "after"} or \
+                form not in ("list", "ndjson"):
+            print("** invalid syntax **")
+            return
+        arg = " ".join(args) or None
+        if arg and arg not in storage.classes():
+            print("** class doesn't exist **")
+            return
+        token = None
+        if options:
+            page = self.__page(arg, options)
+            if page is None:
+                print("** invalid syntax **")
                 return
-            for key, obj in storage.all().items():
-                if key.startswith(arg):
-                    instances.append(str(obj))
+            found, token = page
         else:
-            for obj in storage.all().values():
-                instances.append(str(obj))
-        print(instances)
+            # built one at a time, a cached storage evicts them again
+            found = (storage.get(*key.split(".", 1))
+                     for key in storage.keys(arg))
+            found = (obj for obj in found if obj is not None)
+        self.__write(found, form)
+        if token is not None and form == "list":
+            print("** next page: after={} **".format(token))
+
+    def __page(self, cls, options):
+        """Returns the instances options select, in the order of their
+        keys, and the after option of the next page, None if invalid"""
+        try:
+            limit = int(options.get("limit", -1))
+            offset = max(int(options.get("offset", 0)), 0)
+        except ValueError:
+            return None
+        after = options.get("after")
+        if limit < 0:
+            return islice(storage.iterate(cls, after), offset, None), None
+        if limit == 0:
+            return [], None
+        return storage.page(cls, limit, after, offset)
+
+    def __write(self, instances, form):
+        """Writes instances a thousand at a time, as print() of the list
+        of their strings would, or as lines of JSON with form ndjson"""
+        if form == "ndjson":
+            for chunk in self.__chunks(instances):
+                print("\n".join(json.dumps(obj.to_dict()) for obj in chunk))
+            return
+        separator = "["
+        for chunk in self.__chunks(instances):
+            print(separator + ", ".join(repr(str(obj)) for obj in chunk),
+                  end="")
+            separator = ", "
+        print("[]" if separator == "[" else "]")
+
+    @staticmethod
+    def __chunks(instances, size=1000):
+        """Yields lists of at most size of the instances, in order"""
+        instances = iter(instances)
+        chunk = list(islice(instances, size))
+        while chunk:
+            yield chunk
+            chunk = list(islice(instances, size))
 
     def do_update(self, arg):
         """Updates a specific instance"""
@@ -94,11 +154,10 @@ class HBNBCommand(cmd.Cmd):
         if class_name not in storage.classes():
             print("** class doesn't exist **")
             return
-        key = f"{class_name}.{instance_id}"
-        if key not in storage.all():
+        instance = storage.get(class_name, instance_id)
+        if instance is None:
             print("** no instance found **")
             return
-        instance = storage.all()[key]
 
         # Handle dictionary update
         if rest.startswith('{') and rest.endswith('}'):
@@ -142,8 +201,35 @@ class HBNBCommand(cmd.Cmd):
         if arg not in storage.classes():
             print("** class doesn't exist **")
             return
-        count = sum(1 for key in storage.all() if key.startswith(arg))
-        print(count)
+        print(storage.count(arg))
+
+    def do_aggregate(self, arg):
+        """Computes count, sum, avg, min or max of an attribute of the
+        instances of a class, optionally by the values of another:
+        aggregate <class> <function> [<attribute>] [by <attribute>]"""
+        args = arg.split()
+        if not args:
+            print("** class name missing **")
+            return
+        if args[0] not in storage.classes():
+            print("** class doesn't exist **")
+            return
+        if len(args) < 2:
+            print("** function missing **")
+            return
+        by = None
+        if len(args) > 3 and args[-2] == "by":
+            by = args[-1]
+            args = args[:-2]
+        if len(args) > 3 or args[1] not in ("count", "sum", "avg", "min",
+                                            "max"):
+            print("** invalid syntax **")
+            return
+        if len(args) < 3 and args[1] != "count":
+            print("** attribute name missing **")
+            return
+        attr = args[2] if len(args) > 2 else None
+        print(storage.aggregate(args[0], args[1], attr, by))
 
 
 if __name__ == '__main__':
@@ -8,14 +8,19 @@ Unittest classes:
     TestHBNBCommand_create
     TestHBNBCommand_show
     TestHBNBCommand_all
+    TestHBNBCommand_all_pages
     TestHBNBCommand_destroy
     TestHBNBCommand_update
+    TestHBNBCommand_count
+    TestHBNBCommand_aggregate
 """
+import json
 import os
 import sys
 import unittest
 from models import storage
 from models.engine.file_storage import FileStorage
+from models.place import Place
 from console import HBNBCommand
 from io import StringIO
 from unittest.mock import patch
@@ -99,7 +104,8 @@ class TestHBNBCommand_help(unittest.TestCase):
     def test_help(self):
         h = ("Documented commands (type help <topic>):\n"
              "========================================\n"
-             "EOF  all  count  create  destroy  help  quit  show  update")
+             "EOF  aggregate  all  count  create  destroy  help  quit  show"
+             "  update")
         with patch("sys.stdout", new=StringIO()) as output:
             self.assertFalse(HBNBCommand().onecmd("help"))
             self.assertEqual(h, output.getvalue().strip())
@@ -1566,6 +1572,145 @@ class TestHBNBCommand_count(unittest.TestCase):
             self.assertEqual("1", output.getvalue().strip())
 
 
+class TestHBNBCommand_aggregate(unittest.TestCase):
+    """ Unit tests for testing aggregate method of HBNB comand interpreter """
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        for city, price in (("c1", 100), ("c1", 60), ("c2", 30)):
+            place = Place()
+            place.city_id = city
+            place.price_by_night = price
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def aggregate(self, line):
+        with patch("sys.stdout", new=StringIO()) as output:
+            command = HBNBCommand()
+            self.assertFalse(command.onecmd(command.precmd(line)))
+            return output.getvalue().strip()
+
+    def test_aggregate(self):
+        self.assertEqual("{'c1': 80.0, 'c2': 30.0}", self.aggregate(
+            "Place.aggregate(avg price_by_night by city_id)"))
+        self.assertEqual("3", self.aggregate("aggregate Place count"))
+        self.assertEqual("{'c1': 2, 'c2': 1}",
+                         self.aggregate("aggregate Place count by city_id"))
+        self.assertEqual("100", self.aggregate(
+            "aggregate Place max price_by_night"))
+        self.assertEqual("None", self.aggregate("aggregate User sum age"))
+
+    def test_aggregate_errors(self):
+        self.assertEqual("** class name missing **",
+                         self.aggregate("aggregate"))
+        self.assertEqual("** class doesn't exist **",
+                         self.aggregate("aggregate MyModel count"))
+        self.assertEqual("** function missing **",
+                         self.aggregate("aggregate Place"))
+        self.assertEqual("** invalid syntax **",
+                         self.aggregate("aggregate Place median price"))
+        self.assertEqual("** attribute name missing **",
+                         self.aggregate("aggregate Place avg by city_id"))
+
+
+class TestHBNBCommand_all_pages(unittest.TestCase):
+    """ Unit tests for testing the pages of all of the HBNB command
+    interpreter """
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        date = "2017-09-28T21:05:54.119427"
+        for i in range(5):
+            storage.new(Place(id=str(i), created_at=date, updated_at=date))
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def all(self, line):
+        with patch("sys.stdout", new=StringIO()) as output:
+            command = HBNBCommand()
+            self.assertFalse(command.onecmd(command.precmd(line)))
+            return output.getvalue().strip().split("\n")
+
+    def test_all_pages(self):
+        output = self.all("all Place limit=2")
+        self.assertEqual(2, len(output))
+        self.assertIn("(0)", output[0])
+        self.assertIn("(1)", output[0])
+        self.assertEqual("** next page: after=Place.1 **", output[1])
+        output = self.all("Place.all(limit=2, after=Place.1)")
+        self.assertIn("(2)", output[0])
+        self.assertNotIn("(1)", output[0])
+        output = self.all("all Place limit=2 offset=3")
+        self.assertEqual(1, len(output))
+        self.assertIn("(4)", output[0])
+        self.assertEqual(3, len(eval(self.all("all offset=2")[0])))
+        self.assertEqual(["[]"], self.all("all Place limit=0"))
+
+    def test_all_is_printed_list(self):
+        date = "2017-09-28T21:05:54.119427"
+        for i in range(5, 2001):
+            storage.new(Place(id=str(i), created_at=date, updated_at=date))
+        with patch("sys.stdout", new=StringIO()) as output:
+            print([str(obj) for obj in storage.all().values()])
+        self.assertEqual(output.getvalue().strip().split("\n"),
+                         self.all("all"))
+        self.assertEqual(2001, len(self.all("all Place format=ndjson")))
+        FileStorage._FileStorage__objects = {}
+        self.assertEqual(["[]"], self.all("all Place"))
+
+    def test_all_keeps_cache_bound(self):
+        storage.save()
+        FileStorage(cache_size=2).reload()
+        self.assertEqual(5, len(eval(self.all("all Place")[0])))
+        self.assertEqual(5, len(self.all("all format=ndjson")))
+        info = storage.cache_info()
+        self.assertEqual(2, info["resident"])
+        self.assertEqual(10, info["misses"])
+
+    def test_all_ndjson(self):
+        output = self.all("all Place format=ndjson")
+        self.assertEqual([obj.to_dict() for obj in storage.all().values()],
+                         [json.loads(line) for line in output])
+        output = self.all("Place.all(limit=2, after=Place.2, format=ndjson)")
+        self.assertEqual(["3", "4"], [json.loads(line)["id"]
+                                      for line in output])
+
+    def test_all_pages_errors(self):
+        self.assertEqual(["** invalid syntax **"],
+                         self.all("all Place limit=two"))
+        self.assertEqual(["** invalid syntax **"],
+                         self.all("all Place size=2"))
+        self.assertEqual(["** class doesn't exist **"],
+                         self.all("all MyModel limit=2"))
+        self.assertEqual(["** invalid syntax **"],
+                         self.all("all Place format=csv"))
+
+
 if __name__ == "__main__":
     unittest.main()
-
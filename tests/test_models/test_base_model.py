@@ -3,6 +3,7 @@
 
 Unittest classes:
     TestBaseModel_instantiation
+    TestBaseModel_from_record
     TestBaseModel_save
     TestBaseModel_to_dict
 """
@@ -73,6 +74,13 @@ class TestBaseModel_instantiation(unittest.TestCase):
         self.assertEqual(bm.created_at, dt)
         self.assertEqual(bm.updated_at, dt)
 
+    def test_instantiation_with_whole_second_kwargs(self):
+        dt = datetime(2017, 9, 28, 21, 5, 54)
+        bm = BaseModel(id="345", created_at=dt.isoformat(),
+                       updated_at=dt.isoformat())
+        self.assertEqual(bm.created_at, dt)
+        self.assertEqual(bm.updated_at, dt)
+
     def test_instantiation_with_None_kwargs(self):
         with self.assertRaises(TypeError):
             BaseModel(id=None, created_at=None, updated_at=None)
@@ -86,6 +94,41 @@ class TestBaseModel_instantiation(unittest.TestCase):
         self.assertEqual(bm.updated_at, dt)
 
 
+class TestBaseModel_from_record(unittest.TestCase):
+    """ Unit tests for testing from_record of the BaseModel class """
+
+    def setUp(self):
+        self.record = BaseModel().to_dict()
+        self.record["name"] = "My_First_Model"
+
+    def test_same_instance_as_kwargs(self):
+        bm = BaseModel.from_record(self.record)
+        other = BaseModel(**self.record)
+        self.assertEqual(BaseModel, type(bm))
+        self.assertEqual(list(other.__dict__.items()),
+                         list(bm.__dict__.items()))
+        self.assertEqual(str(other), str(bm))
+
+    def test_subclass(self):
+        from models.user import User
+        record = User().to_dict()
+        user = User.from_record(record)
+        self.assertEqual(User, type(user))
+        self.assertEqual(record, user.to_dict())
+
+    def test_record_unchanged(self):
+        record = self.record.copy()
+        BaseModel.from_record(self.record)
+        self.assertEqual(record, self.record)
+
+    def test_not_given_to_storage(self):
+        self.record["id"] = "from-record"
+        bm = BaseModel.from_record(self.record)
+        self.assertNotIn("BaseModel.from-record", models.storage.all())
+        bm.name = "changed"
+        self.assertEqual("changed", bm.name)
+
+
 class TestBaseModel_save(unittest.TestCase):
     """ Unit tests for testing save method of the BaseModel class """
 
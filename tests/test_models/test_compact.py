@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+""" Defines unit tests for models/compact.py
+
+Unittest classes:
+    TestCompact_variant
+    TestCompact_attributes
+"""
+import copy
+import pickle
+import unittest
+from datetime import datetime
+from models.base_model import BaseModel
+from models.compact import Compact
+from models.place import Place
+from models.user import User
+
+
+class TestCompact_variant(unittest.TestCase):
+    """ Unit tests for testing the variants made by Compact """
+
+    def test_same_name_and_subclass(self):
+        variant = Compact.variant(Place)
+        self.assertEqual("Place", variant.__name__)
+        self.assertTrue(issubclass(variant, Place))
+        self.assertIs(variant, Compact.variant(Place))
+
+    def test_slots_are_fields(self):
+        self.assertEqual(("id", "created_at", "updated_at", "email",
+                          "password", "first_name", "last_name"),
+                         Compact.variant(User).__slots__)
+        self.assertEqual(("id", "created_at", "updated_at"),
+                         Compact.variant(BaseModel).__slots__)
+
+    def test_from_record_same_as_model(self):
+        record = Place().to_dict()
+        record["name"] = "Loft"
+        record["color"] = "red"
+        pl = Compact.variant(Place).from_record(record)
+        self.assertEqual(record, pl.to_dict())
+        self.assertEqual(Place.from_record(record).to_dict(), pl.to_dict())
+        self.assertEqual(datetime, type(pl.created_at))
+
+    def test_instantiation(self):
+        us = Compact.variant(User)()
+        self.assertEqual(str, type(us.id))
+        self.assertEqual(datetime, type(us.updated_at))
+        self.assertEqual(us.to_dict(), Compact.variant(User)(
+            **us.to_dict()).to_dict())
+
+
+class TestCompact_attributes(unittest.TestCase):
+    """ Unit tests for testing the attributes of compact instances """
+
+    def setUp(self):
+        record = User().to_dict()
+        record["email"] = "a@b.c"
+        self.us = Compact.variant(User).from_record(record)
+
+    def test_no_dict_made(self):
+        self.us.first_name = "Betty"
+        self.us.to_dict()
+        str(self.us)
+        self.assertEqual({}, self.us.__dict__)
+
+    def test_defaults(self):
+        self.assertEqual("", self.us.last_name)
+        self.assertNotIn("last_name", self.us.to_dict())
+
+    def test_dynamic_attribute(self):
+        self.us.age = 89
+        self.assertEqual(89, self.us.age)
+        self.assertEqual(89, self.us.to_dict()["age"])
+        self.assertIn("'age': 89", str(self.us))
+
+    def test_missing_attribute(self):
+        with self.assertRaises(AttributeError):
+            self.us.age
+        self.assertIsNone(getattr(self.us, "age", None))
+
+    def test_state(self):
+        state = self.us.__getstate__()
+        self.us.email = "x@y.z"
+        self.us.age = 89
+        self.us.__setstate__(state)
+        self.assertEqual("a@b.c", self.us.email)
+        self.assertIsNone(getattr(self.us, "age", None))
+        self.us.__setstate__({"id": "1"})
+        self.assertEqual("", self.us.email)
+
+    def test_copy_and_pickle(self):
+        self.us.age = 89
+        for other in (copy.copy(self.us),
+                      pickle.loads(pickle.dumps(self.us))):
+            self.assertIs(type(self.us), type(other))
+            self.assertEqual(self.us.to_dict(), other.to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/codecs.py.
+
+Unittest classes:
+    TestCodecs
+    TestSchemaCodec
+    TestFileStorageCodecs
+"""
+import os
+import unittest
+from models.state import State
+from models.user import User
+from models.engine.codecs import CODECS, SchemaCodec, decode, detect
+from models.engine.file_storage import FileStorage
+
+ATTRIBUTES = FileStorage().attributes()
+
+
+class TestCodecs(unittest.TestCase):
+    """Unittests for the codecs."""
+
+    records = {"User.1": {"__class__": "User", "id": "1", "n": 1.5},
+               "State.2": {"__class__": "State", "amenity_ids": ["a"]}}
+
+    def encode(self, codec):
+        codec = codec.bind(ATTRIBUTES)
+        data = codec.join([(k, codec.record(v))
+                           for k, v in self.records.items()])
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        return data
+
+    def test_codecs(self):
+        self.assertEqual({"json", "binary", "zlib", "lzma", "schema"},
+                         set(CODECS))
+
+    def test_round_trip(self):
+        for codec in CODECS.values():
+            data = self.encode(codec)
+            self.assertEqual(self.records, dict(codec.split(data)))
+
+    def test_detect(self):
+        for codec in CODECS.values():
+            self.assertIs(codec, detect(self.encode(codec)))
+            self.assertEqual(self.records, dict(decode(self.encode(codec))))
+
+    def test_json_is_unchanged(self):
+        import json
+        self.assertEqual(json.dumps(self.records),
+                         self.encode(CODECS["json"]).decode())
+
+    def test_compressed_is_smaller(self):
+        records = {"User.{}".format(i): {"__class__": "User", "id": str(i)}
+                   for i in range(100)}
+        self.records = records
+        sizes = {}
+        for codec in CODECS.values():
+            sizes[codec.name] = len(self.encode(codec))
+        self.assertLess(sizes["zlib"], sizes["json"])
+        self.assertLess(sizes["lzma"], sizes["json"])
+        self.assertLess(sizes["schema"], sizes["json"])
+
+
+class TestSchemaCodec(unittest.TestCase):
+    """Unittests for the SchemaCodec class."""
+
+    def setUp(self):
+        self.codec = SchemaCodec(ATTRIBUTES)
+
+    def test_fields(self):
+        self.assertEqual(["id", "created_at", "updated_at", "name"],
+                         self.codec.fields["State"])
+        self.assertEqual(["id", "created_at", "updated_at"],
+                         self.codec.fields["BaseModel"])
+
+    def test_record_is_positional(self):
+        record = {"id": "1", "created_at": "c", "updated_at": "u",
+                  "name": "Utah", "__class__": "State"}
+        self.assertEqual('[15, "1", "c", "u", "Utah"]',
+                         self.codec.record(record))
+
+    def test_record_missing_and_extra_attributes(self):
+        record = {"id": "1", "created_at": "c", "updated_at": "u",
+                  "__class__": "City", "name": "Provo", "size": 3}
+        text = self.codec.record(record)
+        self.assertEqual('[23, "1", "c", "u", null, "Provo", {"size": 3}]',
+                         text)
+        data = self.codec.join([("City.1", text)]).encode()
+        self.assertEqual([("City.1", record)], list(decode(data)))
+
+    def test_split_uses_schema_of_file(self):
+        data = (b'HBNB\x02{"schema": {"BaseModel": ["id"], "User": ["id", '
+                b'"email"]}, "records": {"User.1": [2, null, "a@b.c"]}}')
+        self.assertEqual([("User.1", {"email": "a@b.c", "__class__": "User"})],
+                         list(decode(data)))
+
+
+class TestFileStorageCodecs(unittest.TestCase):
+    """Unittests for the codec option of FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_save_and_reload(self):
+        for name in CODECS:
+            storage = FileStorage(codec=name)
+            us = User()
+            us.first_name = "Betty"
+            st = State()
+            storage.save()
+            with open("file.json", "rb") as f:
+                self.assertIs(CODECS[name], detect(f.read()))
+            FileStorage._FileStorage__objects = {}
+            FileStorage().reload()
+            objs = storage.all()
+            self.assertEqual("Betty", objs["User." + us.id].first_name)
+            self.assertEqual(us.updated_at, objs["User." + us.id].updated_at)
+            self.assertIn("State." + st.id, objs)
+            FileStorage._FileStorage__objects = {}
+
+    def test_unknown_codec(self):
+        with self.assertRaises(KeyError):
+            FileStorage(codec="xml")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/columns.py.
+
+Unittest classes:
+    TestColumns
+    TestColumnsNumPy
+    TestFileStorageColumns
+"""
+import os
+import unittest
+from unittest.mock import patch
+from models.place import Place
+from models.engine import columns
+from models.engine.columns import Columns
+from models.engine.file_storage import FileStorage
+import models
+
+ATTRIBUTES = {"city_id": str, "number_rooms": int, "price_by_night": int,
+              "latitude": float}
+
+
+class TestColumns(unittest.TestCase):
+    """Unittests for the Columns class, without NumPy."""
+
+    numpy = None
+
+    def setUp(self):
+        patcher = patch.object(columns, "numpy", self.numpy)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.columns = Columns("Place", ATTRIBUTES)
+        for i, (city, rooms, price) in enumerate(
+                [("c1", 1, 50), ("c1", 4, 90), ("c2", 5, 120),
+                 ("c2", 4, 80)]):
+            place = Place()
+            place.city_id = city
+            place.number_rooms = rooms
+            place.price_by_night = price
+            self.columns.add("Place.{}".format(i), place)
+
+    def test_filter(self):
+        self.assertEqual(["Place.1", "Place.3"], self.columns.filter(
+            ("number_rooms", ">", 3), ("price_by_night", "<", 100)))
+        self.assertEqual(["Place.2", "Place.3"],
+                         self.columns.filter(("city_id", "==", "c2")))
+        self.assertEqual(4, len(self.columns.filter()))
+
+    def test_aggregate(self):
+        self.assertEqual(85, self.columns.aggregate("price_by_night", "avg"))
+        self.assertEqual(340, self.columns.aggregate("price_by_night", "sum"))
+        self.assertEqual(int, type(self.columns.aggregate("price_by_night",
+                                                          "sum")))
+        self.assertEqual(1, self.columns.aggregate("number_rooms", "min"))
+        self.assertEqual(2, self.columns.aggregate(
+            "number_rooms", "count", ("price_by_night", ">", 85)))
+        self.assertIsNone(self.columns.aggregate(
+            "number_rooms", "max", ("price_by_night", ">", 500)))
+        self.assertEqual(4, self.columns.aggregate("city_id", "count"))
+        with self.assertRaises(ValueError):
+            self.columns.aggregate("number_rooms", "median")
+        with self.assertRaises(ValueError):
+            self.columns.aggregate("city_id", "max")
+
+    def test_labels(self):
+        self.assertEqual(["c1", "c2"], self.columns.labels["city_id"])
+        self.assertEqual([], self.columns.filter(("city_id", "==", "c3")))
+        self.assertEqual(4, len(self.columns.filter(("city_id", "!=", []))))
+        with self.assertRaises(ValueError):
+            self.columns.filter(("city_id", "<", "c2"))
+
+    def test_aggregate_by(self):
+        self.assertEqual({"c1": 70, "c2": 100}, self.columns.aggregate(
+            "price_by_night", "avg", by="city_id"))
+        self.assertEqual({"c1": 1, "c2": 2}, self.columns.aggregate(
+            "price_by_night", "count", ("number_rooms", ">=", 4),
+            by="city_id"))
+        self.assertEqual({"c1": 90, "c2": 120}, self.columns.aggregate(
+            "price_by_night", "max", by="city_id"))
+        self.assertEqual({"c1": 50, "c2": 120}, self.columns.aggregate(
+            "price_by_night", "sum", ("number_rooms", "!=", 4),
+            by="city_id"))
+        with self.assertRaises(ValueError):
+            self.columns.aggregate("price_by_night", "max", by="latitude")
+
+    def test_missing_values_are_left_out(self):
+        place = Place()
+        place.number_rooms = "many"
+        self.columns.add("Place.4", place)
+        self.assertEqual(4, self.columns.aggregate("number_rooms", "count"))
+        self.assertEqual(0.0, self.columns.aggregate("latitude", "sum"))
+        self.assertEqual([], self.columns.filter(("number_rooms", ">", 5)))
+
+    def test_add_replaces_and_remove(self):
+        place = Place()
+        place.price_by_night = 10
+        self.columns.add("Place.1", place)
+        self.assertEqual(10, self.columns.aggregate("price_by_night", "min"))
+        self.columns.remove("Place.0")
+        self.columns.remove("Place.0")
+        self.assertEqual(["Place.3", "Place.1", "Place.2"],
+                         self.columns.keys)
+        self.assertEqual(3, len(self.columns.columns["number_rooms"]))
+        self.assertEqual(["Place.3"],
+                         self.columns.filter(("price_by_night", "==", 80)))
+        for key in list(self.columns.keys):
+            self.columns.remove(key)
+        self.assertEqual([], self.columns.filter(("number_rooms", ">", 0)))
+        self.assertIsNone(self.columns.aggregate("number_rooms", "avg"))
+
+
+@unittest.skipIf(columns.numpy is None, "NumPy is not installed")
+class TestColumnsNumPy(TestColumns):
+    """Unittests for the Columns class, with NumPy."""
+
+    numpy = columns.numpy
+
+
+class TestFileStorageColumns(unittest.TestCase):
+    """Unittests for the columns method of the FileStorage class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.places = [Place(), Place()]
+        self.places[0].price_by_night = 100
+        self.places[1].price_by_night = 60
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def price(self, function):
+        return models.storage.columns(Place).aggregate("price_by_night",
+                                                       function)
+
+    def test_columns(self):
+        self.assertIsInstance(models.storage.columns(Place), Columns)
+        self.assertIs(models.storage.columns(Place),
+                      models.storage.columns("Place"))
+        self.assertIsNone(models.storage.columns("User"))
+        self.assertEqual(80, self.price("avg"))
+
+    def test_follows_changes(self):
+        self.assertEqual(160, self.price("sum"))
+        self.places[0].price_by_night = 200
+        self.assertEqual(260, self.price("sum"))
+        Place().price_by_night = 40
+        self.assertEqual(300, self.price("sum"))
+        models.storage.delete(self.places[1])
+        self.assertEqual(240, self.price("sum"))
+
+    def test_follows_reload(self):
+        self.assertEqual(2, self.price("count"))
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.assertEqual(0, self.price("count"))
+        models.storage.reload()
+        self.assertEqual(2, self.price("count"))
+
+
+if __name__ == "__main__":
+    unittest.main()
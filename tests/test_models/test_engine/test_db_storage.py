@@ -0,0 +1,239 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/db_storage.py.
+
+Unittest classes:
+    TestDBStorageInstantiation
+    TestDBStorageMethods
+"""
+import os
+import unittest
+from unittest.mock import patch
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+from models.engine.db_storage import DBStorage
+
+
+class TestDBStorageInstantiation(unittest.TestCase):
+    """Unittests for testing instantiation of the DBStorage class."""
+
+    def test_instantiation_no_args(self):
+        self.assertIsInstance(DBStorage(), DBStorage)
+
+    def test_instantiation_with_args(self):
+        with self.assertRaises(TypeError):
+            DBStorage(None)
+
+    def test_db_path_is_private_str(self):
+        self.assertIsInstance(DBStorage._DBStorage__db_path, str)
+
+    def test_classes_and_attributes(self):
+        storage = DBStorage()
+        self.assertIs(User, storage.classes()["User"])
+        self.assertIn("state_id", storage.attributes()["City"])
+
+
+class TestDBStorageMethods(unittest.TestCase):
+    """Unittests for testing methods of the DBStorage class."""
+
+    def setUp(self):
+        patcher = patch.object(DBStorage, "_DBStorage__db_path", "test.db")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.storage = DBStorage()
+        self.storage.reload()
+        patcher = patch("models.base_model.storage", self.storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.storage.close()
+        try:
+            os.remove("test.db")
+        except IOError:
+            pass
+
+    def reopen(self):
+        self.storage.close()
+        self.storage = DBStorage()
+        self.storage.reload()
+        return self.storage
+
+    def test_new_and_all(self):
+        us = User()
+        self.assertIs(us, self.storage.all()["User." + us.id])
+        self.assertEqual({"User." + us.id: us}, self.storage.all(User))
+        self.assertEqual({}, self.storage.all("State"))
+
+    def test_save_and_reload(self):
+        us = User()
+        us.first_name = "Betty"
+        st = State()
+        self.storage.save()
+        storage = self.reopen()
+        objs = storage.all()
+        self.assertEqual({"User." + us.id, "State." + st.id}, set(objs))
+        self.assertEqual("Betty", objs["User." + us.id].first_name)
+        self.assertEqual(us.created_at, objs["User." + us.id].created_at)
+
+    def test_all_returns_same_instances(self):
+        us = User()
+        self.storage.save()
+        storage = self.reopen()
+        self.assertIs(storage.all()["User." + us.id],
+                      storage.get(User, us.id))
+
+    def test_update_is_saved(self):
+        us = User()
+        self.storage.save()
+        storage = self.reopen()
+        with patch("models.base_model.storage", storage):
+            storage.get("User", us.id).first_name = "Holberton"
+            storage.save()
+        self.assertEqual("Holberton",
+                         self.reopen().get(User, us.id).first_name)
+
+    def test_delete(self):
+        us = User()
+        st = State()
+        self.storage.save()
+        self.storage.delete(us)
+        self.assertIsNone(self.storage.get(User, us.id))
+        self.assertNotIn("User." + us.id, self.storage.all())
+        self.storage.save()
+        storage = self.reopen()
+        self.assertIsNone(storage.get(User, us.id))
+        self.assertIsNotNone(storage.get(State, st.id))
+
+    def test_count(self):
+        User()
+        User()
+        State()
+        self.assertEqual(3, self.storage.count())
+        self.assertEqual(2, self.storage.count(User))
+        self.storage.save()
+        State()
+        self.assertEqual(2, self.storage.count("State"))
+        self.assertEqual(4, self.reopen().count() + 1)
+
+    def test_keys(self):
+        us = User()
+        st = State()
+        self.storage.save()
+        other = State()
+        self.storage.delete(st)
+        self.assertEqual(list(self.storage.all()), self.storage.keys())
+        self.assertEqual(["User." + us.id], self.storage.keys(User))
+        self.assertEqual(["State." + other.id], self.storage.keys("State"))
+
+    def test_usable_after_close(self):
+        us = User()
+        self.storage.save()
+        st = State()
+        self.storage.close()
+        self.storage.close()
+        self.assertEqual(2, self.storage.count())
+        self.storage.save()
+        self.assertIs(us, self.storage.get(User, us.id))
+        self.assertEqual(["State." + st.id], self.storage.keys(State))
+
+    def test_batch_saves_at_end(self):
+        other = DBStorage()
+        self.addCleanup(other.close)
+        with self.storage.batch():
+            User().save()
+            State().save()
+            self.assertEqual(0, other.count())
+        self.assertEqual(2, other.count())
+
+    def test_batch_rolls_back(self):
+        us = User()
+        us.first_name = "Betty"
+        st = State()
+        self.storage.save()
+        with self.assertRaises(KeyError):
+            with self.storage.transaction():
+                us.first_name = "Ann"
+                self.storage.delete(st)
+                City().save()
+                raise KeyError
+        self.assertEqual("Betty", us.first_name)
+        self.assertIs(st, self.storage.get(State, st.id))
+        self.assertEqual(0, self.storage.count(City))
+        self.storage.save()
+        self.reopen()
+        self.assertEqual("Betty", self.storage.get(User, us.id).first_name)
+        self.assertEqual(2, self.storage.count())
+
+    def test_get_missing(self):
+        self.assertIsNone(self.storage.get(User, "1234"))
+
+    def test_lookup(self):
+        st = State()
+        c1 = City()
+        c1.state_id = st.id
+        c2 = City()
+        c2.state_id = "other"
+        self.storage.save()
+        c3 = City()
+        c3.state_id = st.id
+        found = self.storage.lookup(City, "state_id", st.id)
+        self.assertEqual({c1.id, c3.id}, {c.id for c in found})
+        self.assertEqual([], self.storage.lookup(City, "bad-attr", st.id))
+
+    def test_range(self):
+        p1 = Place()
+        p1.price_by_night = 90
+        p2 = Place()
+        p2.price_by_night = 40
+        p3 = Place()
+        p3.price_by_night = "free"
+        self.storage.save()
+        p4 = Place()
+        p4.price_by_night = 60
+        found = self.storage.range(Place, "price_by_night", high=80)
+        self.assertEqual([p2.id, p4.id], [p.id for p in found])
+        found = self.storage.range(Place, "price_by_night", 50)
+        self.assertEqual([p4.id, p1.id], [p.id for p in found])
+        self.assertEqual([], self.storage.range(Place, "bad-attr", 1))
+
+    def test_iterate_and_page(self):
+        date = "2017-09-28T21:05:54.119427"
+        places = [Place(id=str(i), created_at=date, updated_at=date)
+                  for i in range(4)]
+        for pl in places[:3]:
+            self.storage.new(pl)
+        self.storage.save()
+        self.storage.new(places[3])
+        self.storage.delete(self.storage.get(Place, "1"))
+        user = User(id="0", created_at=date, updated_at=date)
+        self.storage.new(user)
+        self.assertEqual(["0", "2", "3"],
+                         [pl.id for pl in self.storage.iterate(Place)])
+        self.assertEqual(["Place", "Place", "User"], [
+            type(o).__name__ for o in self.storage.iterate(after="Place.0")])
+        page, token = self.storage.page(Place, 2)
+        self.assertEqual(["0", "2"], [pl.id for pl in page])
+        self.assertEqual("Place.2", token)
+        self.assertEqual(([places[3]], None),
+                         self.storage.page(Place, 2, token))
+
+    def test_aggregate(self):
+        p1 = Place()
+        p1.price_by_night = 90
+        p1.city_id = "c1"
+        p2 = Place()
+        p2.price_by_night = 40
+        p2.city_id = "c1"
+        self.storage.save()
+        Place().city_id = "c2"
+        self.assertEqual(3, self.storage.aggregate(Place, "count"))
+        self.assertEqual(130, self.storage.aggregate(Place, "sum",
+                                                     "price_by_night"))
+        self.assertEqual({"c1": 40, "c2": 0}, self.storage.aggregate(
+            "Place", "min", "price_by_night", "city_id"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,11 +4,21 @@
 Unittest classes:
     TestFileStorageInstantiation
     TestFileStorageMethods
+    TestFileStorageJournal
+    TestFileStorageDirtyTracking
+    TestFileStorageCommit
+    TestFileStorageWriteBehind
+    TestFileStorageBatch
+    TestFileStorageCompact
+    TestFileStoragePages
 """
 import os
 import json
+import threading
+import time
 import unittest
 from datetime import datetime
+from unittest.mock import patch
 from models.base_model import BaseModel
 from models.user import User
 from models.state import State
@@ -16,7 +26,9 @@ from models.place import Place
 from models.city import City
 from models.amenity import Amenity
 from models.review import Review
+from models.compact import Compact
 from models.engine.file_storage import FileStorage
+from models.engine.objects import Objects
 import models
 
 
@@ -67,9 +79,67 @@ class TestFileStorageMethods(unittest.TestCase):
     def test_all_returns_dict(self):
         self.assertIsInstance(models.storage.all(), dict)
 
-    def test_all_with_args_raises_typeerror(self):
-        with self.assertRaises(TypeError):
-            models.storage.all(None)
+    def test_all_with_none_returns_all(self):
+        self.assertIs(models.storage.all(), models.storage.all(None))
+
+    def test_all_with_class(self):
+        us = User()
+        st = State()
+        self.assertEqual({"User." + us.id: us}, models.storage.all(User))
+        self.assertEqual({"State." + st.id: st}, models.storage.all("State"))
+        self.assertEqual({}, models.storage.all("Review"))
+
+    def test_all_with_class_after_delete(self):
+        us = User()
+        models.storage.delete(us)
+        self.assertEqual({}, models.storage.all(User))
+        self.assertNotIn("User." + us.id, models.storage.all())
+
+    def test_all_with_class_after_del(self):
+        us = User()
+        models.storage.count(User)
+        del models.storage.all()["User." + us.id]
+        self.assertEqual({}, models.storage.all(User))
+        self.assertEqual(0, models.storage.count(User))
+        models.storage.all()["User." + us.id] = us
+        self.assertEqual(1, models.storage.count(User))
+        self.assertEqual([us], models.storage.lookup(User, "id", us.id))
+
+    def test_all_with_class_after_key_replaced(self):
+        FileStorage._FileStorage__objects = Objects()
+        us = User()
+        st = State()
+        self.assertEqual(1, models.storage.count(User))
+        del models.storage.all()["User." + us.id]
+        models.storage.all()["State.x"] = st
+        self.assertEqual({}, models.storage.all(User))
+        self.assertEqual(2, models.storage.count(State))
+        self.assertEqual({"State." + st.id: st, "State.x": st},
+                         models.storage.all(State))
+
+    def test_all_with_class_after_reload(self):
+        us = User()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.assertEqual({}, models.storage.all(User))
+        models.storage.reload()
+        self.assertIn("User." + us.id, models.storage.all(User))
+
+    def test_count(self):
+        FileStorage._FileStorage__objects = {}
+        User()
+        User()
+        State()
+        self.assertEqual(3, models.storage.count())
+        self.assertEqual(2, models.storage.count(User))
+        self.assertEqual(1, models.storage.count("State"))
+        self.assertEqual(0, models.storage.count("Place"))
+
+    def test_get(self):
+        us = User()
+        self.assertIs(us, models.storage.get(User, us.id))
+        self.assertIs(us, models.storage.get("User", us.id))
+        self.assertIsNone(models.storage.get("State", us.id))
 
     def test_new(self):
         objects = {
@@ -139,6 +209,521 @@ class TestFileStorageMethods(unittest.TestCase):
             models.storage.reload(None)
 
 
+class TestFileStorageJournal(unittest.TestCase):
+    """Unittests for the journal mode of the FileStorage class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        self.storage = FileStorage(journal=True)
+        patcher = patch("models.base_model.storage", self.storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        for path in ("file.json", "file.json.log"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_save_appends_to_journal(self):
+        us = User()
+        self.storage.new(us)
+        self.storage.save()
+        self.assertFalse(os.path.isfile("file.json"))
+        with open("file.json.log", "r") as f:
+            lines = f.readlines()
+        self.assertEqual(1, len(lines))
+        self.assertIn("User." + us.id, lines[0])
+
+    def test_save_writes_only_changes(self):
+        us = User()
+        st = State()
+        self.storage.new(us)
+        self.storage.new(st)
+        self.storage.save()
+        self.storage.new(st)
+        self.storage.save()
+        with open("file.json.log", "r") as f:
+            lines = f.readlines()
+        self.assertEqual(3, len(lines))
+        self.assertIn("State." + st.id, lines[2])
+
+    def test_reload_replays_journal(self):
+        us = User()
+        st = State()
+        self.storage.new(us)
+        self.storage.new(st)
+        self.storage.save()
+        us.first_name = "Betty"
+        self.storage.new(us)
+        self.storage.delete(st)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        objs = self.storage.all()
+        self.assertEqual("Betty", objs["User." + us.id].first_name)
+        self.assertNotIn("State." + st.id, objs)
+
+    def test_reload_ignores_torn_line(self):
+        us = User()
+        self.storage.new(us)
+        self.storage.save()
+        with open("file.json.log", "a") as f:
+            f.write('["User.1234", {"__cla')
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertIn("User." + us.id, self.storage.all())
+        self.assertNotIn("User.1234", self.storage.all())
+
+    def test_save_after_torn_line(self):
+        us = User()
+        self.storage.new(us)
+        self.storage.save()
+        with open("file.json.log", "a") as f:
+            f.write('["User.1234", {"__cla')
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        st = State()
+        self.storage.new(st)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertIn("User." + us.id, self.storage.all())
+        self.assertIn("State." + st.id, self.storage.all())
+        self.assertEqual(2, self.storage.count())
+
+    def test_attribute_set_is_journaled(self):
+        us = User()
+        self.storage.new(us)
+        self.storage.save()
+        us.first_name = "Betty"
+        self.storage.save()
+        with open("file.json.log", "r") as f:
+            lines = f.readlines()
+        self.assertEqual(2, len(lines))
+        self.assertIn("Betty", lines[1])
+
+    def test_full_save_folds_journal(self):
+        us = User()
+        self.storage.new(us)
+        self.storage.save()
+        models.storage.save()
+        self.assertFalse(os.path.isfile("file.json.log"))
+        with open("file.json", "r") as f:
+            self.assertIn("User." + us.id, f.read())
+
+
+class TestFileStorageDirtyTracking(unittest.TestCase):
+    """Unittests for the incremental serialization of FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_save_matches_json_dump(self):
+        us = User()
+        st = State()
+        st.name = "California"
+        models.storage.save()
+        expected = json.dumps({"User." + us.id: us.to_dict(),
+                               "State." + st.id: st.to_dict()})
+        with open("file.json", "r") as f:
+            self.assertEqual(expected, f.read())
+
+    def test_save_method_keeps_destroyed_object_out(self):
+        st = State()
+        models.storage.save()
+        models.storage.delete(st)
+        st.save()
+        self.assertEqual(0, models.storage.count(State))
+        models.storage.reload()
+        self.assertEqual(0, models.storage.count(State))
+
+    def test_clean_objects_are_not_serialized_again(self):
+        us = User()
+        st = State()
+        models.storage.save()
+        st.name = "Texas"
+        with patch.object(User, "to_dict") as us_to_dict:
+            models.storage.save()
+            us_to_dict.assert_not_called()
+        with open("file.json", "r") as f:
+            self.assertIn("Texas", f.read())
+
+    def test_save_method_marks_dirty(self):
+        us = User()
+        models.storage.save()
+        us.__dict__["first_name"] = "Holberton"
+        us.save()
+        with open("file.json", "r") as f:
+            self.assertIn("Holberton", f.read())
+
+
+class TestFileStorageCommit(unittest.TestCase):
+    """Unittests for the atomic and grouped saves of FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_save_leaves_no_temporary_file(self):
+        User()
+        models.storage.save()
+        self.assertTrue(os.path.isfile("file.json"))
+        self.assertFalse(os.path.isfile("file.json.tmp"))
+
+    def test_failed_save_keeps_previous_file(self):
+        us = User()
+        models.storage.save()
+        with open("file.json", "r") as f:
+            before = f.read()
+        us.first_name = "Betty"
+        with patch.object(User, "to_dict", side_effect=ValueError):
+            with self.assertRaises(ValueError):
+                models.storage.save()
+        with open("file.json", "r") as f:
+            self.assertEqual(before, f.read())
+        models.storage.save()
+        with open("file.json", "r") as f:
+            self.assertIn("Betty", f.read())
+
+    def test_concurrent_saves_are_grouped(self):
+        storage = FileStorage(commit_delay=0.05)
+        writes = []
+        replace = storage._FileStorage__replace
+
+        def counted(text):
+            writes.append(text)
+            replace(text)
+
+        storage._FileStorage__replace = counted
+        users = [User() for i in range(8)]
+        for us in users:
+            storage.new(us)
+        threads = [threading.Thread(target=storage.save) for us in users]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertLess(len(writes), len(users))
+        with open("file.json", "r") as f:
+            saved = json.load(f)
+        for us in users:
+            self.assertIn("User." + us.id, saved)
+
+
+class TestFileStorageWriteBehind(unittest.TestCase):
+    """Unittests for the background writes of FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def wait_for_file(self):
+        for i in range(200):
+            if os.path.isfile("file.json"):
+                return True
+            time.sleep(0.01)
+        return False
+
+    def test_save_returns_before_write(self):
+        storage = FileStorage(flush_interval=60)
+        self.addCleanup(storage.close)
+        us = User()
+        storage.new(us)
+        storage.save()
+        self.assertFalse(os.path.isfile("file.json"))
+        storage.close()
+        with open("file.json", "r") as f:
+            self.assertIn("User." + us.id, f.read())
+
+    def test_threshold_triggers_write(self):
+        storage = FileStorage(flush_interval=60, flush_threshold=2)
+        self.addCleanup(storage.close)
+        storage.new(User())
+        storage.save()
+        storage.save()
+        self.assertTrue(self.wait_for_file())
+
+    def test_interval_triggers_write(self):
+        storage = FileStorage(flush_interval=0.01)
+        self.addCleanup(storage.close)
+        storage.new(User())
+        storage.save()
+        self.assertTrue(self.wait_for_file())
+
+    def test_save_after_close_is_synchronous(self):
+        storage = FileStorage(flush_interval=60)
+        storage.close()
+        storage.close()
+        storage.new(User())
+        storage.save()
+        self.assertTrue(os.path.isfile("file.json"))
+
+    def test_lazy_objects_rejected(self):
+        with self.assertRaises(ValueError):
+            FileStorage(flush_interval=60, lazy=True)
+        with self.assertRaises(ValueError):
+            FileStorage(flush_interval=60, cache_size=10)
+
+    def test_close_without_thread(self):
+        FileStorage().close()
+        self.assertFalse(os.path.isfile("file.json"))
+
+
+class TestFileStorageBatch(unittest.TestCase):
+    """Unittests for the batch method of FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.writes = []
+        replace = models.storage._FileStorage__replace
+
+        def counted(text):
+            self.writes.append(text)
+            replace(text)
+
+        patcher = patch.object(models.storage, "_FileStorage__replace",
+                               counted)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_batch_writes_once(self):
+        with models.storage.batch():
+            users = [User() for i in range(5)]
+            for us in users:
+                us.save()
+            self.assertEqual([], self.writes)
+        self.assertEqual(1, len(self.writes))
+        for us in users:
+            self.assertIn("User." + us.id, self.writes[0])
+
+    def test_transaction_is_batch(self):
+        with models.storage.transaction():
+            User().save()
+        self.assertEqual(1, len(self.writes))
+
+    def test_nested_batch(self):
+        with models.storage.batch():
+            with models.storage.batch():
+                User().save()
+            State().save()
+            self.assertEqual([], self.writes)
+        self.assertEqual(1, len(self.writes))
+
+    def test_rollback(self):
+        kept = User()
+        kept.first_name = "Betty"
+        gone = State()
+        models.storage.save()
+        with self.assertRaises(ValueError):
+            with models.storage.batch():
+                created = City()
+                created.save()
+                kept.first_name = "Holberton"
+                kept.last_name = "School"
+                kept.save()
+                models.storage.delete(gone)
+                raise ValueError
+        self.assertEqual(1, len(self.writes))
+        objs = models.storage.all()
+        self.assertNotIn("City." + created.id, objs)
+        self.assertIs(gone, objs["State." + gone.id])
+        self.assertEqual("Betty", kept.first_name)
+        self.assertNotIn("last_name", kept.__dict__)
+        self.assertEqual(1, models.storage.count(State))
+        self.assertEqual(0, models.storage.count(City))
+
+    def test_save_after_rollback(self):
+        with self.assertRaises(ValueError):
+            with models.storage.batch():
+                User().save()
+                raise ValueError
+        models.storage.save()
+        self.assertEqual(1, len(self.writes))
+        self.assertEqual("{}", self.writes[0])
+
+
+class TestFileStorageCompact(unittest.TestCase):
+    """Unittests for the compact mode of the FileStorage class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.place = Place()
+        self.place.name = "Loft"
+        self.place.color = "red"
+        self.user = User()
+        models.storage.save()
+
+    def tearDown(self):
+        for path in os.listdir("."):
+            if path.startswith("file.") and path.endswith(".json"):
+                os.remove(path)
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_reload_builds_variants(self):
+        storage = FileStorage(compact=True)
+        storage.reload()
+        pl = storage.get(Place, self.place.id)
+        self.assertIs(Compact.variant(Place), type(pl))
+        self.assertIsInstance(pl, Place)
+        self.assertEqual(self.place.to_dict(), pl.to_dict())
+        self.assertEqual({}, pl.__dict__)
+
+    def test_save_and_reload(self):
+        storage = FileStorage(compact=True)
+        storage.reload()
+        with patch("models.base_model.storage", storage):
+            storage.get(User, self.user.id).email = "a@b.c"
+            storage.get(Place, self.place.id).name = "Barn"
+        storage.save()
+        storage.reload()
+        self.assertEqual("a@b.c", storage.get(User, self.user.id).email)
+        self.assertEqual("Barn", storage.get(Place, self.place.id).name)
+        self.assertEqual("red", storage.get(Place, self.place.id).color)
+
+    def test_shards(self):
+        storage = FileStorage(compact=True, shards=2)
+        storage.save()
+        storage.reload()
+        pl = storage.get(Place, self.place.id)
+        self.assertIs(Compact.variant(Place), type(pl))
+        self.assertEqual(self.place.to_dict(), pl.to_dict())
+
+
+class TestFileStoragePages(unittest.TestCase):
+    """Unittests for the iterate and page methods of the FileStorage
+    class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.places = []
+        for i in (3, 1, 4, 0, 2):
+            pl = Place(id=str(i))
+            models.storage.new(pl)
+            self.places.append(pl)
+        self.places.sort(key=lambda pl: pl.id)
+        self.user = User(id="0")
+        models.storage.new(self.user)
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_iterate(self):
+        self.assertEqual(self.places, list(models.storage.iterate(Place)))
+        self.assertEqual(self.places + [self.user],
+                         list(models.storage.iterate()))
+        self.assertEqual(self.places[3:] + [self.user],
+                         list(models.storage.iterate(after="Place.2")))
+        self.assertEqual(self.places[2:], list(models.storage.iterate(
+            "Place", "Place.15")))
+        self.assertEqual([], list(models.storage.iterate(User, "Zzz")))
+
+    def test_iterate_follows_changes(self):
+        found = models.storage.iterate(Place)
+        self.assertEqual(self.places[0], next(found))
+        models.storage.delete(self.places[1])
+        self.assertEqual(self.places[2:], list(found))
+        pl = Place(id="10")
+        models.storage.new(pl)
+        self.assertEqual([self.places[0], pl],
+                         list(models.storage.iterate(Place))[:2])
+
+    def test_page(self):
+        page, token = models.storage.page(Place, 2)
+        self.assertEqual(self.places[:2], page)
+        self.assertEqual("Place.1", token)
+        page, token = models.storage.page(Place, 2, token)
+        self.assertEqual(self.places[2:4], page)
+        page, token = models.storage.page(Place, 2, token)
+        self.assertEqual([self.places[4]], page)
+        self.assertIsNone(token)
+        self.assertEqual((self.places[3:], None),
+                         models.storage.page(Place, 2, offset=3))
+        self.assertEqual((self.places[4:], None),
+                         models.storage.page(Place, 5, "Place.1", 2))
+        with self.assertRaises(ValueError):
+            models.storage.page(Place, 0)
+
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -0,0 +1,148 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/geo.py.
+
+Unittest classes:
+    TestDistance
+    TestGridIndex
+    TestFileStorageGeo
+"""
+import os
+import random
+import unittest
+from models.place import Place
+from models.user import User
+from models.engine.file_storage import FileStorage
+from models.engine.geo import GridIndex, distance
+import models
+
+
+def place(lat, lon):
+    """ Returns a Place at (lat, lon) """
+    pl = Place()
+    pl.latitude = lat
+    pl.longitude = lon
+    return pl
+
+
+class TestDistance(unittest.TestCase):
+    """Unittests for the distance function."""
+
+    def test_distance(self):
+        self.assertEqual(0, distance(48.85, 2.35, 48.85, 2.35))
+        # Paris - London
+        self.assertAlmostEqual(343.5, distance(48.8566, 2.3522,
+                                               51.5074, -0.1278), 0)
+        self.assertAlmostEqual(111.2, distance(0, 179.5, 0, -179.5), 0)
+
+
+class TestGridIndex(unittest.TestCase):
+    """Unittests for the GridIndex class."""
+
+    def setUp(self):
+        self.index = GridIndex("Place")
+        self.points = {"Place.paris": (48.8566, 2.3522),
+                       "Place.london": (51.5074, -0.1278),
+                       "Place.fiji": (-17.7, 179.9),
+                       "Place.samoa": (-13.8, -179.9),
+                       "Place.pole": (90, 0)}
+        for key, point in self.points.items():
+            self.index.add(key, place(*point))
+
+    def test_box(self):
+        self.assertEqual({"Place.paris", "Place.london"},
+                         set(self.index.box(45, -5, 55, 5)))
+        self.assertEqual(["Place.paris"], self.index.box(45, 0, 50, 5))
+        self.assertEqual({"Place.fiji", "Place.samoa"},
+                         set(self.index.box(-20, 179, -10, -179)))
+        self.assertEqual(5, len(self.index.box(-90, -180, 90, 180)))
+
+    def test_radius(self):
+        found = self.index.radius(48.8566, 2.3522, 400)
+        self.assertEqual(["Place.paris", "Place.london"],
+                         [k for d, k in found])
+        self.assertEqual(0, found[0][0])
+        self.assertEqual(["Place.paris"],
+                         [k for d, k in self.index.radius(49, 2, 100)])
+        self.assertEqual(["Place.pole"],
+                         [k for d, k in self.index.radius(89.5, 90, 100)])
+        self.assertEqual(2, len(self.index.radius(-15, 180, 500)))
+
+    def test_nearest(self):
+        self.assertEqual(["Place.london", "Place.paris"],
+                         [k for d, k in self.index.nearest(52, 0, 2)])
+        self.assertEqual(5, len(self.index.nearest(0, 0, 10)))
+        self.assertEqual([], self.index.nearest(0, 0, 0))
+
+    def test_follows_add_and_remove(self):
+        self.index.add("Place.paris", place(-17.8, 179.8))
+        self.index.remove("Place.london")
+        self.index.remove("Place.london")
+        self.assertEqual([], self.index.box(45, -5, 55, 5))
+        self.assertEqual(3, len(self.index.box(-20, 179, -10, -179)))
+        self.index.add("Place.fiji", place(None, 1))
+        self.assertEqual(3, len(self.index.points))
+
+    def test_same_as_brute_force(self):
+        rand = random.Random(1)
+        index = GridIndex("Place")
+        points = {}
+        for i in range(3000):
+            points["Place.{}".format(i)] = (rand.uniform(40, 50),
+                                            rand.uniform(-5, 10))
+            index.add("Place.{}".format(i),
+                      place(*points["Place.{}".format(i)]))
+        for i in range(20):
+            lat, lon = rand.uniform(38, 52), rand.uniform(-7, 12)
+            expected = sorted((distance(lat, lon, *p), k)
+                              for k, p in points.items())
+            self.assertEqual(expected[:15], index.nearest(lat, lon, 15))
+            self.assertEqual([e for e in expected if e[0] <= 30],
+                             index.radius(lat, lon, 30))
+            box = {k for k, (a, o) in points.items()
+                   if lat <= a <= lat + 1 and lon <= o <= lon + 2}
+            self.assertEqual(box, set(index.box(lat, lon, lat + 1,
+                                                lon + 2)))
+
+
+class TestFileStorageGeo(unittest.TestCase):
+    """Unittests for the geospatial queries of the FileStorage class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.paris = place(48.8566, 2.3522)
+        self.london = place(51.5074, -0.1278)
+        self.nowhere = Place()
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_queries(self):
+        self.assertEqual([self.paris],
+                         models.storage.box(Place, 45, 0, 50, 5))
+        self.assertEqual([self.london, self.paris],
+                         models.storage.radius(Place, 51, 0, 400))
+        self.assertEqual([self.paris],
+                         models.storage.nearest("Place", 48, 2, 1))
+
+    def test_follows_changes(self):
+        models.storage.nearest(Place, 48, 2)
+        self.london.latitude = 48.1
+        self.london.longitude = 2.1
+        models.storage.delete(self.paris)
+        self.assertEqual([self.london],
+                         models.storage.nearest(Place, 48, 2, 1))
+        self.assertEqual([], models.storage.box(Place, 51, -1, 52, 1))
+
+    def test_without_index(self):
+        us = User()
+        us.latitude = 10
+        us.longitude = 10
+        self.assertEqual([us], models.storage.radius(User, 10, 10.1, 20))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/groups.py.
+
+Unittest classes:
+    TestGroupIndex
+    TestFileStorageAggregate
+"""
+import os
+import unittest
+from models.place import Place
+from models.user import User
+from models.engine.file_storage import FileStorage
+from models.engine.groups import GroupIndex
+import models
+
+
+def place(city, price):
+    """ Returns a Place of this city and price """
+    pl = Place()
+    pl.city_id = city
+    pl.price_by_night = price
+    return pl
+
+
+class TestGroupIndex(unittest.TestCase):
+    """Unittests for the GroupIndex class."""
+
+    def setUp(self):
+        self.index = GroupIndex("Place", ("price_by_night", "city_id"))
+        for i, (city, price) in enumerate([("c1", 50), ("c1", 90),
+                                           ("c2", 120), ("c2", "free"),
+                                           ("c3", None), (["c"], 10)]):
+            self.index.add("Place.{}".format(i), place(city, price))
+
+    def test_aggregate_by_group(self):
+        self.assertEqual({"c1": 2, "c2": 1, None: 1},
+                         self.index.aggregate("count"))
+        self.assertEqual({"c1": 2, "c2": 2, "c3": 1, None: 1},
+                         self.index.aggregate("count", counted=False))
+        self.assertEqual({"c1": 70, "c2": 120, None: 10},
+                         self.index.aggregate("avg"))
+        self.assertEqual({"c1": 140, "c2": 120, None: 10},
+                         self.index.aggregate("sum"))
+        self.assertEqual({"c1": 50, "c2": 120, None: 10},
+                         self.index.aggregate("min"))
+        self.assertEqual({"c1": 90, "c2": 120, None: 10},
+                         self.index.aggregate("max"))
+        with self.assertRaises(ValueError):
+            self.index.aggregate("median")
+
+    def test_aggregate(self):
+        self.assertEqual(4, self.index.aggregate("count", grouped=False))
+        self.assertEqual(6, self.index.aggregate("count", False, False))
+        self.assertEqual(270, self.index.aggregate("sum", grouped=False))
+        self.assertEqual(67.5, self.index.aggregate("avg", grouped=False))
+        self.assertEqual(10, self.index.aggregate("min", grouped=False))
+        self.assertEqual(120, self.index.aggregate("max", grouped=False))
+        self.assertIsNone(GroupIndex("Place", ("max_guest", None)).aggregate(
+            "max", grouped=False))
+
+    def test_follows_changes(self):
+        self.assertEqual(50, self.index.aggregate("min")["c1"])
+        self.index.add("Place.0", place("c2", 30))
+        self.index.add("Place.1", place("c1", 80))
+        self.index.add("Place.1", place("c1", 80))
+        self.assertEqual({"c1": 80, "c2": 30, None: 10},
+                         self.index.aggregate("min"))
+        self.assertEqual({"c1": 80, "c2": 150, None: 10},
+                         self.index.aggregate("sum"))
+        self.index.remove("Place.5")
+        self.index.remove("Place.5")
+        self.index.remove("Place.4")
+        self.assertNotIn(None, self.index.groups)
+        self.assertNotIn("c3", self.index.groups)
+        self.assertEqual({"c1": 80, "c2": 120},
+                         self.index.aggregate("max"))
+
+    def test_count_only(self):
+        index = GroupIndex("Place", (None, "city_id"))
+        index.build([("Place.0", place("c1", 1)), ("Place.1", place("c1", 2))])
+        self.assertEqual({"c1": 2}, index.aggregate("count", False))
+        self.assertEqual({}, index.aggregate("count"))
+
+
+class TestFileStorageAggregate(unittest.TestCase):
+    """Unittests for the aggregate method of the FileStorage class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.places = [place("c1", 100), place("c1", 60), place("c2", 30)]
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_aggregate(self):
+        self.assertEqual({"c1": 80, "c2": 30}, models.storage.aggregate(
+            Place, "avg", "price_by_night", "city_id"))
+        self.assertEqual(3, models.storage.aggregate(Place, "count"))
+        self.assertEqual({"c1": 2, "c2": 1}, models.storage.aggregate(
+            "Place", "count", by="city_id"))
+        self.assertEqual(100, models.storage.aggregate(
+            Place, "max", "price_by_night"))
+        with self.assertRaises(ValueError):
+            models.storage.aggregate(Place, "avg")
+
+    def test_follows_changes(self):
+        models.storage.aggregate(Place, "sum", "price_by_night", "city_id")
+        self.places[2].city_id = "c1"
+        models.storage.delete(self.places[0])
+        place("c3", 5)
+        self.assertEqual({"c1": 90, "c3": 5}, models.storage.aggregate(
+            Place, "sum", "price_by_night", "city_id"))
+
+    def test_follows_reload(self):
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.assertEqual(0, models.storage.aggregate(Place, "count"))
+        models.storage.reload()
+        self.assertEqual(190, models.storage.aggregate(
+            Place, "sum", "price_by_night"))
+
+    def test_without_running_aggregates(self):
+        users = [User(), User()]
+        users[0].age = 30
+        self.assertEqual({None: 30}, models.storage.aggregate(
+            User, "max", "age", "city"))
+        self.assertEqual(2, models.storage.aggregate(User, "count"))
+        self.assertEqual({"c1": 2, "c2": 1}, models.storage.aggregate(
+            Place, "count", "max_guest", "city_id"))
+
+
+if __name__ == "__main__":
+    unittest.main()
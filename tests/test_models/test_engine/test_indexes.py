@@ -0,0 +1,274 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/indexes.py.
+
+Unittest classes:
+    TestHashIndex
+    TestRangeIndex
+    TestKeyIndex
+    TestFileStorageLookup
+    TestFileStorageRange
+"""
+import os
+import unittest
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.engine.file_storage import FileStorage
+from models.engine.indexes import HashIndex, KeyIndex, RangeIndex
+import models
+
+
+class TestHashIndex(unittest.TestCase):
+    """Unittests for the HashIndex class."""
+
+    def setUp(self):
+        self.index = HashIndex("City", "state_id")
+        self.c1 = City()
+        self.c1.state_id = "s1"
+        self.c2 = City()
+        self.c2.state_id = "s1"
+
+    def test_add_and_lookup(self):
+        self.index.add("City.1", self.c1)
+        self.index.add("City.2", self.c2)
+        self.assertEqual(["City.1", "City.2"], list(self.index.lookup("s1")))
+        self.assertEqual([], list(self.index.lookup("s2")))
+
+    def test_add_replaces_value(self):
+        self.index.add("City.1", self.c1)
+        self.c1.state_id = "s2"
+        self.index.add("City.1", self.c1)
+        self.assertEqual([], list(self.index.lookup("s1")))
+        self.assertEqual(["City.1"], list(self.index.lookup("s2")))
+
+    def test_remove(self):
+        self.index.add("City.1", self.c1)
+        self.index.remove("City.1")
+        self.index.remove("City.1")
+        self.assertEqual([], list(self.index.lookup("s1")))
+        self.assertEqual({}, self.index.keys)
+
+    def test_unhashable_values_are_skipped(self):
+        index = HashIndex("Place", "amenity_ids")
+        index.add("Place.1", Place())
+        self.assertEqual({}, index.values)
+        self.assertEqual([], list(index.lookup([])))
+
+
+class TestRangeIndex(unittest.TestCase):
+    """Unittests for the RangeIndex class."""
+
+    def setUp(self):
+        self.index = RangeIndex("Place", "price_by_night")
+        self.places = {}
+        for key, price in (("Place.a", 80), ("Place.b", 50),
+                           ("Place.c", 120), ("Place.d", 80)):
+            self.places[key] = Place()
+            self.places[key].price_by_night = price
+
+    def test_build_and_range(self):
+        self.index.build(self.places.items())
+        self.assertEqual(["Place.b", "Place.a", "Place.d", "Place.c"],
+                         self.index.range())
+        self.assertEqual(["Place.a", "Place.d"], self.index.range(80, 80))
+        self.assertEqual(["Place.b", "Place.a", "Place.d"],
+                         self.index.range(high=100))
+        self.assertEqual(["Place.c"], self.index.range(low=81))
+        self.assertEqual([], self.index.range(200, 300))
+
+    def test_ordered(self):
+        self.index.build(self.places.items())
+        keys = self.index.ordered(60)
+        self.assertEqual("Place.a", next(keys))
+        self.assertEqual(["Place.d", "Place.c"], list(keys))
+        self.assertEqual([], list(RangeIndex("Place", "max_guest").ordered()))
+
+    def test_add_same_as_build(self):
+        for key, place in self.places.items():
+            self.index.add(key, place)
+        built = RangeIndex("Place", "price_by_night")
+        built.build(self.places.items())
+        self.assertEqual(built.buckets, self.index.buckets)
+        self.assertEqual(built.range(), self.index.range())
+
+    def test_add_moves_key(self):
+        self.index.build(self.places.items())
+        self.places["Place.c"].price_by_night = 10
+        self.index.add("Place.c", self.places["Place.c"])
+        self.assertEqual(["Place.c", "Place.b"], self.index.range(high=60))
+        self.assertEqual(["Place.c"], self.index.range(10, 10))
+
+    def test_buckets(self):
+        self.index.load = 2
+        for i in range(20):
+            place = Place()
+            place.price_by_night = i % 7
+            self.index.add("Place.{:02}".format(i), place)
+        self.assertTrue(all(len(b) <= 4 for b in self.index.buckets))
+        self.assertEqual([b[0] for b in self.index.buckets],
+                         self.index.firsts)
+        self.assertEqual(["Place.03", "Place.10", "Place.17", "Place.04",
+                          "Place.11", "Place.18"], self.index.range(3, 4))
+        for i in range(0, 20, 2):
+            self.index.remove("Place.{:02}".format(i))
+        self.assertEqual(["Place.03", "Place.17", "Place.11"],
+                         self.index.range(3, 4))
+        self.assertEqual(10, len(self.index.range()))
+        self.assertEqual(["Place.07", "Place.01", "Place.15"],
+                         self.index.range(high=1))
+
+    def test_remove(self):
+        self.index.build(self.places.items())
+        self.index.remove("Place.a")
+        self.index.remove("Place.a")
+        self.assertEqual(["Place.b", "Place.d", "Place.c"],
+                         self.index.range())
+
+    def test_not_numbers_are_left_out(self):
+        self.places["Place.a"].price_by_night = "cheap"
+        self.places["Place.b"].price_by_night = float("nan")
+        self.index.build(self.places.items())
+        self.assertEqual(["Place.d", "Place.c"], self.index.range())
+        self.index.add("Place.d", self.places["Place.a"])
+        self.assertEqual(["Place.c"], self.index.range())
+
+
+class TestKeyIndex(unittest.TestCase):
+    """Unittests for the KeyIndex class."""
+
+    def test_ordered(self):
+        index = KeyIndex("Place", "id")
+        index.build([("Place.b", Place()), ("Place.a", Place())])
+        index.add("Place.c", Place())
+        index.add("Place.a", Place())
+        self.assertEqual(["Place.a", "Place.b", "Place.c"],
+                         list(index.ordered()))
+        index.remove("Place.b")
+        self.assertEqual(["Place.c"], list(index.ordered("Place.b")))
+
+
+class TestFileStorageLookup(unittest.TestCase):
+    """Unittests for the lookup method of the FileStorage class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.state = State()
+        self.cities = [City(), City(), City()]
+        for city in self.cities[:2]:
+            city.state_id = self.state.id
+            city.save()
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_lookup(self):
+        found = models.storage.lookup(City, "state_id", self.state.id)
+        self.assertEqual(self.cities[:2], found)
+
+    def test_lookup_follows_new(self):
+        models.storage.lookup(City, "state_id", self.state.id)
+        self.cities[2].state_id = self.state.id
+        self.cities[2].save()
+        found = models.storage.lookup("City", "state_id", self.state.id)
+        self.assertEqual(self.cities, found)
+
+    def test_lookup_follows_attribute_set(self):
+        models.storage.lookup(City, "state_id", self.state.id)
+        self.cities[0].state_id = "other"
+        found = models.storage.lookup(City, "state_id", self.state.id)
+        self.assertEqual(self.cities[1:2], found)
+        self.assertEqual(self.cities[:1],
+                         models.storage.lookup(City, "state_id", "other"))
+
+    def test_lookup_follows_delete(self):
+        models.storage.lookup(City, "state_id", self.state.id)
+        models.storage.delete(self.cities[1])
+        found = models.storage.lookup(City, "state_id", self.state.id)
+        self.assertEqual(self.cities[:1], found)
+
+    def test_lookup_after_reload(self):
+        models.storage.lookup(City, "state_id", self.state.id)
+        models.storage.save()
+        models.storage.reload()
+        found = models.storage.lookup(City, "state_id", self.state.id)
+        self.assertEqual(sorted(c.id for c in self.cities[:2]),
+                         sorted(c.id for c in found))
+
+    def test_lookup_without_index(self):
+        self.cities[2].name = "Tulsa"
+        self.assertEqual(self.cities[2:],
+                         models.storage.lookup(City, "name", "Tulsa"))
+
+    def test_lookup_other_foreign_keys(self):
+        review = Review()
+        review.place_id = "p1"
+        self.assertEqual([review],
+                         models.storage.lookup(Review, "place_id", "p1"))
+        self.assertEqual([], models.storage.lookup(Place, "city_id", "c1"))
+
+    def test_add_index(self):
+        index = models.storage.add_index(City, "name")
+        self.assertIs(index, models.storage.add_index("City", "name"))
+        self.cities[0].name = "Reno"
+        self.assertEqual(self.cities[:1],
+                         models.storage.lookup(City, "name", "Reno"))
+
+
+class TestFileStorageRange(unittest.TestCase):
+    """Unittests for the range method of the FileStorage class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.places = [Place(), Place(), Place()]
+        for place, guests in zip(self.places, (4, 2, 6)):
+            place.max_guest = guests
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_range(self):
+        p = self.places
+        self.assertEqual([p[1], p[0], p[2]],
+                         models.storage.range(Place, "max_guest"))
+        self.assertEqual([p[0], p[2]],
+                         models.storage.range("Place", "max_guest", 3))
+        self.assertEqual([p[1]], models.storage.range(Place, "max_guest",
+                                                      high=3))
+
+    def test_range_follows_changes(self):
+        p = self.places
+        models.storage.range(Place, "max_guest")
+        p[2].max_guest = 1
+        models.storage.delete(p[0])
+        extra = Place()
+        extra.max_guest = 3
+        self.assertEqual([p[2], p[1], extra],
+                         models.storage.range(Place, "max_guest"))
+
+    def test_range_after_reload(self):
+        models.storage.range(Place, "max_guest")
+        models.storage.save()
+        models.storage.reload()
+        self.assertEqual([self.places[1].id],
+                         [p.id for p in models.storage.range(
+                             Place, "max_guest", 1, 3)])
+
+    def test_range_without_index(self):
+        p = self.places
+        p[0].latitude = 2.5
+        p[1].latitude = -1.0
+        self.assertEqual([p[1], p[2]],
+                         models.storage.range(Place, "latitude", high=0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,471 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/lazy.py.
+
+Unittest classes:
+    TestScan
+    TestLazyObjects
+    TestCachedObjects
+    TestStream
+    TestFileStorageLazy
+    TestFileStorageCache
+    TestFileStorageStream
+"""
+import os
+import json
+import tempfile
+import unittest
+import weakref
+from unittest.mock import patch
+from models.place import Place
+from models.user import User
+from models.state import State
+from models.engine.file_storage import FileStorage
+from models.engine.lazy import CachedObjects, LazyObjects, scan, stream
+
+
+class TestScan(unittest.TestCase):
+    """Unittests for the scan function."""
+
+    def test_scan_finds_every_record(self):
+        data = {"User.1": {"id": "1", "name": "a"},
+                "User.2": {"id": "2", "amenity_ids": ["x", "y"]}}
+        buf = json.dumps(data).encode()
+        found = {k: json.loads(buf[s:e]) for k, s, e in scan(buf)}
+        self.assertEqual(data, found)
+
+    def test_scan_ignores_brackets_in_strings(self):
+        data = {"User.1": {"text": "a {tricky} \"[value]\" }"},
+                "User.2": {"text": "\\"}}
+        buf = json.dumps(data).encode()
+        found = {k: json.loads(buf[s:e]) for k, s, e in scan(buf)}
+        self.assertEqual(data, found)
+
+    def test_scan_nested_objects(self):
+        data = {"User.1": {"id": "1", "extra": {"a": {"b": "}"}}},
+                "User.2": {"id": "2"},
+                "User.3": {"extra": {}}}
+        buf = json.dumps(data).encode()
+        found = {k: json.loads(buf[s:e]) for k, s, e in scan(buf)}
+        self.assertEqual(data, found)
+
+    def test_scan_empty_object(self):
+        self.assertEqual([], list(scan(b"{}")))
+
+    def test_scan_truncated(self):
+        data = {"User.1": {"id": "1"}, "User.2": {"id": "2", "x": {}}}
+        buf = json.dumps(data).encode()
+        for end in (0, 1, 12, len(buf) - 14, len(buf) - 1):
+            with self.assertRaises(ValueError):
+                list(scan(buf[:end]))
+
+
+class TestStream(unittest.TestCase):
+    """Unittests for the stream function."""
+
+    def tearDown(self):
+        try:
+            os.remove("stream.json")
+        except IOError:
+            pass
+
+    def test_stream_yields_records(self):
+        data = {"User.1": {"id": "1"}, "User.2": {"id": "2", "x": [1]}}
+        with open("stream.json", "w") as f:
+            json.dump(data, f)
+        self.assertEqual(list(data.items()), list(stream("stream.json")))
+
+    def test_stream_empty_file(self):
+        open("stream.json", "w").close()
+        self.assertEqual([], list(stream("stream.json")))
+
+    def test_stream_truncated_file(self):
+        with open("stream.json", "w") as f:
+            f.write('{"User.1": {"id": "1"}, "User.2": {"id"')
+        with self.assertRaises(ValueError):
+            list(stream("stream.json"))
+
+
+class TestLazyObjects(unittest.TestCase):
+    """Unittests for the LazyObjects class."""
+
+    def setUp(self):
+        self.built = []
+        buf = json.dumps({"User.1": {"id": "1"}, "User.2": {"id": "2"}})
+        self.objects = LazyObjects(buf.encode(), self.build)
+        for key, start, end in scan(self.objects.source):
+            dict.__setitem__(self.objects, key, (start, end))
+
+    def build(self, record):
+        self.built.append(record["id"])
+        return record
+
+    def test_is_dict(self):
+        self.assertIsInstance(self.objects, dict)
+
+    def test_contains_does_not_build(self):
+        self.assertIn("User.1", self.objects)
+        self.assertEqual(2, len(self.objects))
+        self.assertEqual([], self.built)
+
+    def test_getitem_builds_once(self):
+        self.assertEqual({"id": "1"}, self.objects["User.1"])
+        self.assertEqual({"id": "1"}, self.objects["User.1"])
+        self.assertEqual(["1"], self.built)
+
+    def test_get_missing(self):
+        self.assertIsNone(self.objects.get("User.3"))
+
+    def test_pop(self):
+        self.assertEqual({"id": "2"}, self.objects.pop("User.2"))
+        self.assertNotIn("User.2", self.objects)
+        self.assertIsNone(self.objects.pop("User.2", None))
+
+    def test_values_builds_one_at_a_time(self):
+        values = iter(self.objects.values())
+        self.assertEqual({"id": "1"}, next(values))
+        self.assertEqual(["1"], self.built)
+        self.assertEqual([{"id": "2"}], list(values))
+        self.assertEqual(2, len(self.objects.values()))
+        self.assertEqual([("User.1", {"id": "1"}), ("User.2", {"id": "2"})],
+                         list(self.objects.items()))
+
+    def test_copies_hold_objects(self):
+        expected = {"User.1": {"id": "1"}, "User.2": {"id": "2"}}
+        self.assertEqual(expected, dict(self.objects))
+        self.assertEqual(expected, {**self.objects})
+        self.assertEqual(expected, self.objects.copy())
+        self.assertIs(dict, type(self.objects.copy()))
+        self.assertEqual(expected, self.objects)
+        self.assertFalse(self.objects != expected)
+        self.assertEqual(repr(expected), repr(self.objects))
+
+    def test_setdefault_and_popitem(self):
+        self.assertEqual({"id": "1"}, self.objects.setdefault("User.1"))
+        self.assertEqual({"id": "3"},
+                         self.objects.setdefault("User.3", {"id": "3"}))
+        self.assertEqual(("User.3", {"id": "3"}), self.objects.popitem())
+        self.assertEqual(("User.2", {"id": "2"}), self.objects.popitem())
+
+    def test_text(self):
+        self.assertEqual('{"id": "1"}', self.objects.text("User.1"))
+        self.objects["User.1"]
+        self.assertIsNone(self.objects.text("User.1"))
+
+
+class TestCachedObjects(unittest.TestCase):
+    """Unittests for the CachedObjects class."""
+
+    def setUp(self):
+        self.built = []
+        self.spilled = []
+        self.log = tempfile.mkstemp()[1]
+        self.addCleanup(os.remove, self.log)
+        records = {"User.{}".format(i): {"id": str(i)} for i in range(4)}
+        buf = json.dumps(records).encode()
+        self.objects = CachedObjects(buf, self.build, 2, self.spill,
+                                     self.log)
+        for key, start, end in scan(buf):
+            dict.__setitem__(self.objects, key, (start, end))
+        self.offsets = {k: dict.__getitem__(self.objects, k)
+                        for k in records}
+
+    def build(self, record):
+        self.built.append(record["id"])
+        return dict(record)
+
+    def spill(self, key, obj):
+        self.spilled.append(key)
+        text = json.dumps(obj).encode()
+        with open(self.log, "ab") as f:
+            start = f.tell()
+            f.write(text)
+        return start, start + len(text), True
+
+    def test_size(self):
+        with self.assertRaises(ValueError):
+            CachedObjects(None, self.build, 0)
+
+    def test_evicts_least_recently_used(self):
+        self.objects["User.0"]
+        self.objects["User.1"]
+        self.objects["User.0"]
+        self.objects["User.2"]
+        self.assertEqual(["User.0", "User.2"], list(self.objects.lru))
+        self.assertIs(tuple, type(dict.__getitem__(self.objects, "User.1")))
+        self.assertEqual({"id": "1"}, self.objects["User.1"])
+        self.assertEqual(["0", "1", "2", "1"], self.built)
+        self.assertEqual((1, 4, 2), (self.objects.hits, self.objects.misses,
+                                     self.objects.evictions))
+
+    def test_spills_changed_object(self):
+        self.objects["User.0"]
+        self.objects["User.0"] = {"id": "0", "name": "Ann"}
+        self.objects["User.1"]
+        self.assertEqual([], self.spilled)
+        self.objects["User.2"]
+        self.assertEqual(["User.0"], self.spilled)
+        self.assertEqual(["User.1", "User.2"], list(self.objects.lru))
+        self.assertEqual(1, self.objects.evictions)
+        self.assertEqual('{"id": "0", "name": "Ann"}',
+                         self.objects.text("User.0"))
+        self.assertEqual({"id": "0", "name": "Ann"}, self.objects["User.0"])
+        self.objects["User.3"]
+        self.assertEqual(["User.0"], self.spilled)
+
+    def test_remap_forgets_log(self):
+        self.objects["User.0"] = {"id": "0", "name": "Ann"}
+        self.objects["User.1"]
+        self.objects["User.2"]
+        self.objects.remap(self.objects.source, self.offsets)
+        self.assertEqual(self.offsets["User.0"],
+                         dict.__getitem__(self.objects, "User.0"))
+        self.assertEqual(self.offsets["User.2"],
+                         self.objects.ranges["User.2"])
+
+    def test_keeps_changed_object_without_spill(self):
+        self.objects.spill = None
+        self.objects["User.9"] = {"id": "9"}
+        self.objects["User.0"]
+        self.objects["User.1"]
+        self.assertEqual(["User.1", "User.9"], list(self.objects.lru))
+        self.objects.change("User.1", {"id": "1"})
+        self.objects["User.2"]
+        self.assertEqual(["User.9", "User.1"], list(self.objects.lru))
+        self.assertIs(tuple, type(dict.__getitem__(self.objects, "User.2")))
+
+    def test_pop(self):
+        self.objects["User.0"]
+        self.assertEqual({"id": "0"}, self.objects.pop("User.0"))
+        self.assertEqual({"id": "1"}, self.objects.pop("User.1"))
+        self.assertEqual([], list(self.objects.lru))
+        self.assertEqual({}, self.objects.ranges)
+
+
+class TestFileStorageLazy(unittest.TestCase):
+    """Unittests for the lazy reload of the FileStorage class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage(lazy=True)
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_reload_builds_nothing(self):
+        us = User()
+        self.storage.save()
+        self.storage.reload()
+        objs = self.storage.all()
+        self.assertIsInstance(objs, LazyObjects)
+        key = "User." + us.id
+        self.assertIs(tuple, type(dict.__getitem__(objs, key)))
+        self.assertEqual(us.id, objs[key].id)
+        self.assertIsInstance(dict.__getitem__(objs, key), User)
+
+    def test_save_keeps_records_not_accessed(self):
+        us = User()
+        st = State()
+        st.name = "Nevada"
+        self.storage.save()
+        self.storage.reload()
+        self.storage.all()["User." + us.id].first_name = "Betty"
+        self.storage.save()
+        st_key = "State." + st.id
+        self.assertIs(tuple, type(dict.__getitem__(self.storage.all(),
+                                                   st_key)))
+        self.assertEqual("Nevada", self.storage.all()[st_key].name)
+        self.storage.reload()
+        self.assertEqual("Betty",
+                         self.storage.all()["User." + us.id].first_name)
+        self.assertEqual("Nevada", self.storage.all()[st_key].name)
+
+
+class TestFileStorageCache(unittest.TestCase):
+    """Unittests for the object cache of the FileStorage class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        self.storage = FileStorage(cache_size=2)
+        self.storage.reload()
+        patcher = patch("models.base_model.storage", self.storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.users = []
+        for name in "abcd":
+            user = User()
+            user.first_name = name
+            self.users.append(user)
+        self.ids = [user.id for user in self.users]
+
+    def tearDown(self):
+        for path in ("file.json", "file.json.log"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_options(self):
+        FileStorage._FileStorage__objects = {}
+        self.assertIsNone(self.storage.cache_info())
+        with self.assertRaises(ValueError):
+            FileStorage(cache_size=2, codec="binary")
+
+    def test_changed_objects_are_written_before_eviction(self):
+        info = self.storage.cache_info()
+        self.assertEqual(2, info["resident"])
+        self.assertEqual(2, info["evictions"])
+        objs = self.storage.all()
+        self.assertEqual(["c", "d"], [dict.__getitem__(objs, k).first_name
+                                      for k in objs.lru])
+        # to the journal, file.json is not rewritten for each of them
+        self.assertFalse(os.path.isfile("file.json"))
+        with open("file.json.log", "r") as f:
+            self.assertEqual(2, len(f.readlines()))
+        self.assertEqual(["a", "b", "c", "d"],
+                         [self.storage.get(User, i).first_name
+                          for i in self.ids])
+        self.assertEqual(2, self.storage.cache_info()["resident"])
+        self.storage.save()
+        self.assertFalse(os.path.isfile("file.json.log"))
+        self.storage.reload()
+        self.assertEqual(["a", "b", "c", "d"],
+                         [self.storage.get(User, i).first_name
+                          for i in self.ids])
+
+    def test_reload_leaves_journal_records_unbuilt(self):
+        self.storage.reload()
+        self.assertEqual(0, self.storage.cache_info()["resident"])
+        # only the evicted ones were written
+        self.assertEqual(["a", "b"], [self.storage.get(User, i).first_name
+                                      for i in self.ids[:2]])
+        self.assertEqual(2, self.storage.cache_info()["misses"])
+
+    def test_modified_objects_not_kept(self):
+        self.storage.save()
+        self.storage.reload()
+        refs = []
+        for i in self.ids:
+            user = self.storage.get(User, i)
+            user.last_name = "changed"
+            refs.append(weakref.ref(user))
+        del user
+        self.assertEqual(2, sum(ref() is not None for ref in refs))
+        self.assertEqual(["changed"] * 4, [self.storage.get(User, i).last_name
+                                           for i in self.ids])
+
+    def test_change_of_evicted_object(self):
+        self.storage.save()
+        self.users[0].first_name = "z"
+        for i in self.ids[1:]:
+            self.storage.get(User, i)
+        self.assertIsNot(self.users[0], self.storage.get(User, self.ids[0]))
+        self.assertEqual("z", self.storage.get(User, self.ids[0]).first_name)
+        self.users[0].first_name = "y"
+        self.assertIs(self.users[0], self.storage.get(User, self.ids[0]))
+        self.storage.save()
+        self.storage.reload()
+        self.assertEqual("y", self.storage.get(User, self.ids[0]).first_name)
+
+    def test_indexes_follow_evicted_changes(self):
+        self.storage.add_index(User, "first_name")
+        self.assertEqual(1, len(self.storage.lookup(User, "first_name", "a")))
+        self.users[0].first_name = "z"
+        for i in self.ids[1:]:
+            self.storage.get(User, i)
+        found = self.storage.lookup(User, "first_name", "z")
+        self.assertEqual([self.ids[0]], [user.id for user in found])
+        self.assertEqual([], self.storage.lookup(User, "first_name", "a"))
+
+    def test_indexes_follow_rebuilt_objects(self):
+        place = Place()
+        place.city_id = "old"
+        place.description = "quiet loft"
+        self.storage.lookup(Place, "city_id", "old")
+        self.storage.search(Place, "loft")
+        place.city_id = "new"
+        place.description = "noisy barn"
+        self.storage.save()
+        for i in self.ids:
+            self.storage.get(User, i)
+        self.assertIsNot(place, self.storage.get(Place, place.id))
+        self.assertEqual([], self.storage.lookup(Place, "city_id", "old"))
+        self.assertEqual([place.id], [p.id for p in self.storage.lookup(
+            Place, "city_id", "new")])
+        self.assertEqual([], self.storage.search(Place, "loft"))
+        self.assertEqual([place.id], [p.id for p in self.storage.search(
+            Place, "barn")])
+
+    def test_counters(self):
+        self.storage.save()
+        self.storage.reload()
+        self.assertEqual(0, self.storage.cache_info()["resident"])
+        ordered = sorted(self.ids)
+        for i in ordered + ordered[-1:]:
+            self.storage.get(User, i)
+        self.assertEqual({"hits": 1, "misses": 4, "evictions": 2,
+                          "size": 2, "resident": 2},
+                         self.storage.cache_info())
+        self.assertEqual(ordered, [user.id for user in
+                                   self.storage.iterate(User)])
+        # the index of the keys is built without building the objects
+        self.assertEqual(8, self.storage.cache_info()["misses"])
+
+
+class TestFileStorageStream(unittest.TestCase):
+    """Unittests for the streaming reload of the FileStorage class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_reload_builds_every_object(self):
+        storage = FileStorage(stream=True)
+        us = User()
+        st = State()
+        st.name = "Ohio"
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        objs = storage.all()
+        self.assertEqual(2, len(objs))
+        self.assertIsInstance(objs["User." + us.id], User)
+        self.assertEqual("Ohio", objs["State." + st.id].name)
+        self.assertEqual(st.created_at, objs["State." + st.id].created_at)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/objects.py.
+
+Unittest classes:
+    TestObjects
+"""
+import unittest
+from models.engine.objects import Objects
+
+
+class TestObjects(unittest.TestCase):
+    """Unittests for the Objects class."""
+
+    def setUp(self):
+        self.objects = Objects({"User.1": 1, "User.2": 2})
+
+    def test_is_dict(self):
+        self.assertIsInstance(self.objects, dict)
+        self.assertEqual({"User.1": 1, "User.2": 2}, self.objects)
+        self.assertEqual(0, self.objects.version)
+
+    def test_replacing_object_keeps_version(self):
+        self.objects["User.1"] = 3
+        self.objects.setdefault("User.2", 4)
+        self.assertEqual(0, self.objects.version)
+        self.assertEqual({"User.1": 3, "User.2": 2}, self.objects)
+
+    def test_key_changes_bump_version(self):
+        versions = [self.objects.version]
+        self.objects["User.3"] = 3
+        versions.append(self.objects.version)
+        del self.objects["User.3"]
+        versions.append(self.objects.version)
+        self.objects.pop("User.2")
+        versions.append(self.objects.version)
+        self.objects.setdefault("User.4", 4)
+        versions.append(self.objects.version)
+        self.objects.popitem()
+        versions.append(self.objects.version)
+        self.objects.update({"User.5": 5})
+        versions.append(self.objects.version)
+        self.objects |= {"User.6": 6}
+        versions.append(self.objects.version)
+        self.objects.clear()
+        versions.append(self.objects.version)
+        self.assertEqual(sorted(set(versions)), versions)
+
+    def test_pop_missing_keeps_version(self):
+        self.assertIsNone(self.objects.pop("User.9", None))
+        self.assertEqual(0, self.objects.version)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/query.py.
+
+Unittest classes:
+    TestQuery
+"""
+import os
+import unittest
+from unittest.mock import patch
+from models.place import Place
+from models.user import User
+from models.engine import columns
+from models.engine.file_storage import FileStorage
+from models.engine.query import Query
+import models
+
+
+class TestQuery(unittest.TestCase):
+    """Unittests for the Query class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.places = []
+        for i, (city, price, guests) in enumerate(
+                [("c1", 120, 4), ("c1", 80, 2), ("c2", 50, 2),
+                 ("c1", 80, 6), ("c2", None, 3)]):
+            place = Place(id=str(i), city_id=city, price_by_night=price,
+                          max_guest=guests)
+            models.storage.new(place)
+            self.places.append(place)
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def query(self):
+        return models.storage.query(Place)
+
+    def ids(self, query):
+        """ Returns the sorted ids of the places found by query """
+        return sorted(int(place.id) for place in query)
+
+    def test_query(self):
+        self.assertIsInstance(self.query(), Query)
+        self.assertEqual(5, self.query().count())
+        self.assertEqual([], models.storage.query("Review").all())
+
+    def test_where(self):
+        self.assertEqual([0, 1, 3], self.ids(self.query().where(
+            city_id="c1")))
+        self.assertEqual([1, 3], self.ids(self.query().where(
+            city_id="c1", price_by_night__lt=100)))
+        self.assertEqual([1, 3], self.ids(self.query().where(
+            city_id="c1").where(price_by_night__le=80)))
+        self.assertEqual([2, 4], self.ids(self.query().where(
+            city_id__ne="c1")))
+        self.assertEqual([0, 2], self.ids(self.query().where(
+            price_by_night__in=[50, 120])))
+        self.assertEqual([0, 3, 4], self.ids(self.query().where(
+            max_guest__gt=2)))
+        self.assertEqual([4], self.ids(self.query().where(
+            price_by_night=None)))
+        self.assertEqual([], self.ids(self.query().where(name__gt=1)))
+        self.assertEqual([], self.ids(self.query().where(city_id="c3")))
+
+    def test_order_by(self):
+        p = self.places
+        self.assertEqual([p[2], p[1], p[3], p[0], p[4]],
+                         self.query().order_by("price_by_night").all())
+        self.assertEqual([p[0], p[1], p[3], p[2], p[4]],
+                         self.query().order_by("-price_by_night").all())
+        self.assertEqual([p[3], p[0], p[1], p[4], p[2]], self.query(
+            ).order_by("city_id", "-max_guest").all())
+        self.assertEqual([p[2], p[1]], self.query().order_by(
+            "price_by_night").limit(2).all())
+
+    def test_limit_and_first(self):
+        self.assertEqual(2, len(self.query().limit(2).all()))
+        self.assertEqual(self.places[2], self.query().where(
+            max_guest=2).order_by("-id").first())
+        self.assertIsNone(self.query().where(max_guest=0).first())
+        self.assertEqual(5, self.query().limit(10).count())
+
+    def test_is_lazy(self):
+        query = self.query().where(city_id="c2")
+        self.assertEqual(2, query.count())
+        self.places[0].city_id = "c2"
+        models.storage.delete(self.places[2])
+        self.assertEqual([0, 4], self.ids(query))
+        found = iter(self.query())
+        models.storage.delete(self.places[0])
+        self.assertEqual(3, len(list(found)))
+
+    def test_queries_are_independent(self):
+        query = self.query().where(city_id="c1")
+        query.where(max_guest=2).limit(1)
+        self.assertEqual(3, query.count())
+
+    def test_without_indexes(self):
+        users = [User(), User()]
+        users[0].age = 30
+        users[1].age = 20
+        self.assertEqual([users[1]], models.storage.query(User).where(
+            age__lt=25).all())
+        self.assertEqual(users[::-1],
+                         models.storage.query(User).order_by("age").all())
+
+    def test_plans(self):
+        self.assertEqual("hash index on city_id", self.query().where(
+            city_id="c1", max_guest__gt=2).explain())
+        self.assertEqual("range index on max_guest", self.query().where(
+            city_id="c1", max_guest__gt=4).explain())
+        self.assertEqual("range index on price_by_night", self.query().where(
+            price_by_night__le=60).order_by("price_by_night").explain())
+        self.assertEqual("scan", self.query().where(
+            name="x").order_by("max_guest").explain())
+        self.assertEqual("range index on max_guest, in order", self.query(
+            ).order_by("max_guest").limit(3).explain())
+        self.assertEqual("scan", models.storage.query(User).where(
+            id="x").explain())
+
+    def test_columns_without_numpy(self):
+        with patch.object(columns, "numpy", None):
+            self.assertEqual("scan", self.query().where(
+                number_bathrooms__gt=1).explain())
+
+    @unittest.skipIf(columns.numpy is None, "NumPy is not installed")
+    def test_columns(self):
+        self.assertEqual("columns", self.query().where(
+            number_bathrooms__gt=1).explain())
+        p = self.places
+        p[2].number_bathrooms = 2
+        p[3].number_bathrooms = 3
+        self.assertEqual([p[3], p[2]], self.query().where(
+            number_bathrooms__ge=2, city_id__ne="c3").order_by(
+                "-number_bathrooms").all())
+
+    def test_in_order_with_missing_values(self):
+        p = self.places
+        p[1].max_guest = "two"
+        self.assertEqual([p[2], p[4], p[0], p[3], p[1]], self.query(
+            ).order_by("max_guest").limit(10).all())
+
+    def test_order_by_mixed_types(self):
+        p = self.places
+        # what the console update command stores
+        p[1].price_by_night = "5"
+        p[3].price_by_night = float("nan")
+        order = [p[2], p[0], p[1], p[3], p[4]]
+        self.assertEqual(order, self.query().order_by(
+            "price_by_night").all())
+        self.assertEqual(order[:4], self.query().order_by(
+            "price_by_night").limit(4).all())
+        self.assertEqual([p[0], p[2], p[3], p[1], p[4]], self.query(
+            ).order_by("-price_by_night").all())
+        self.assertEqual("range index on price_by_night, in order",
+                         self.query().order_by("price_by_night").limit(
+                             4).explain())
+
+
+if __name__ == "__main__":
+    unittest.main()
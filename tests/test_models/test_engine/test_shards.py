@@ -0,0 +1,169 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/shards.py.
+
+Unittest classes:
+    TestShards
+    TestFileStorageShards
+"""
+import glob
+import os
+import json
+import unittest
+from unittest.mock import patch
+from models.city import City
+from models.state import State
+from models.user import User
+from models.engine.file_storage import FileStorage
+from models.engine.shards import Shards
+
+
+def remove_shards():
+    for path in glob.glob("file.*.json"):
+        os.remove(path)
+
+
+class TestShards(unittest.TestCase):
+    """Unittests for the Shards class."""
+
+    def tearDown(self):
+        remove_shards()
+
+    def test_path_of_one_per_class(self):
+        shards = Shards("file.json", 1)
+        self.assertEqual("file.User.json", shards.path_of("User.1234"))
+
+    def test_path_of_hashed(self):
+        shards = Shards("file.json", 4)
+        paths = {shards.path_of("User.{}".format(i)) for i in range(100)}
+        self.assertEqual({"file.User.{}.json".format(i) for i in range(4)},
+                         paths)
+        self.assertEqual(shards.path_of("User.1"), shards.path_of("User.1"))
+
+    def test_paths(self):
+        shards = Shards("file.json", 1)
+        for path in ("file.User.json", "file.User.2.json", "file.City.json"):
+            open(path, "w").close()
+        self.assertEqual(["file.User.json", "file.User.2.json"],
+                         shards.paths(["User", "State"]))
+
+    def test_load(self):
+        shards = Shards("file.json", 1)
+        us = User()
+        st = State()
+        for obj in (us, st):
+            key = "{}.{}".format(type(obj).__name__, obj.id)
+            with open(shards.path_of(key), "w") as f:
+                json.dump({"x." + obj.id: obj.to_dict()}, f)
+        paths = shards.paths(["User", "State"])
+        classes = {"User": User, "State": State}
+        with patch("models.engine.shards.ProcessPoolExecutor") as pool:
+            loaded = shards.load(paths, classes, workers=1)
+        pool.assert_not_called()
+        self.assertEqual(2, len(loaded))
+        self.assertEqual(us.created_at, loaded[0]["x." + us.id].created_at)
+        self.assertIsInstance(loaded[1]["x." + st.id], State)
+        loaded = shards.load(paths, classes, workers=2)
+        self.assertEqual(us.created_at, loaded[0]["x." + us.id].created_at)
+        self.assertIsInstance(loaded[1]["x." + st.id], State)
+
+
+class TestFileStorageShards(unittest.TestCase):
+    """Unittests for the sharded files of FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage(shards=1)
+        self.written = []
+        replace = self.storage._FileStorage__replace
+
+        def counted(text, path=None):
+            self.written.append(path)
+            replace(text, path)
+
+        patcher = patch.object(self.storage, "_FileStorage__replace",
+                               counted)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        remove_shards()
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_save_writes_one_file_per_class(self):
+        self.storage.new(User())
+        self.storage.new(State())
+        self.storage.save()
+        self.assertEqual({"file.User.json", "file.State.json"},
+                         set(self.written))
+        self.assertFalse(os.path.isfile("file.json"))
+
+    def test_save_rewrites_changed_classes_only(self):
+        us = User()
+        self.storage.new(us)
+        self.storage.new(State())
+        self.storage.save()
+        del self.written[:]
+        us.first_name = "Betty"
+        self.storage.new(us)
+        self.storage.save()
+        self.assertEqual(["file.User.json"], self.written)
+
+    def test_reload(self):
+        us = User()
+        st = State()
+        ct = City()
+        ct.name = "Akron"
+        for obj in (us, st, ct):
+            self.storage.new(obj)
+        self.storage.save()
+        self.storage.delete(st)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        objs = self.storage.all()
+        self.assertEqual({"User." + us.id, "City." + ct.id}, set(objs))
+        self.assertEqual("Akron", objs["City." + ct.id].name)
+
+    def test_hashed_shards(self):
+        storage = FileStorage(shards=3)
+        users = [User() for i in range(30)]
+        for us in users:
+            storage.new(us)
+        storage.save()
+        self.assertEqual(3, len(glob.glob("file.User.*.json")))
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual(30, storage.count(User))
+
+    def test_migrates_json_file(self):
+        us = User()
+        FileStorage().save()
+        self.storage.reload()
+        self.storage.save()
+        self.assertFalse(os.path.isfile("file.json"))
+        with open("file.User.json", "r") as f:
+            self.assertIn("User." + us.id, f.read())
+
+    def test_unused_files_are_removed(self):
+        self.storage.new(State())
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.new(User())
+        self.storage.save()
+        self.assertFalse(os.path.isfile("file.State.json"))
+
+
+if __name__ == "__main__":
+    unittest.main()
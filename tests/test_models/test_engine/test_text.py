@@ -0,0 +1,132 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/text.py.
+
+Unittest classes:
+    TestTokenize
+    TestTextIndex
+    TestFileStorageSearch
+"""
+import os
+import unittest
+from models.place import Place
+from models.review import Review
+from models.user import User
+from models.engine.file_storage import FileStorage
+from models.engine.text import TextIndex, tokenize
+import models
+
+
+def review(text):
+    """ Returns a Review of this text """
+    rv = Review()
+    rv.text = text
+    return rv
+
+
+class TestTokenize(unittest.TestCase):
+    """Unittests for the tokenize function."""
+
+    def test_tokenize(self):
+        self.assertEqual(["cozy", "flat", "near", "the", "café", "2"],
+                         tokenize("Cozy flat, near THE Café (2)!"))
+        self.assertEqual([], tokenize(" -- "))
+
+
+class TestTextIndex(unittest.TestCase):
+    """Unittests for the TextIndex class."""
+
+    def setUp(self):
+        self.index = TextIndex("Review", ("text",))
+        self.texts = {"Review.0": "Quiet flat near the beach",
+                      "Review.1": "The beach was dirty, the flat was noisy",
+                      "Review.2": "Great host",
+                      "Review.3": "Beach beach beach",
+                      "Review.4": 12}
+        for key, text in self.texts.items():
+            self.index.add(key, review(text))
+
+    def keys(self, query, limit=None):
+        return [key for score, key in self.index.search(query, limit)]
+
+    def test_search(self):
+        self.assertEqual(["Review.3", "Review.0", "Review.1"],
+                         self.keys("beach"))
+        self.assertEqual(["Review.0", "Review.1", "Review.3"],
+                         self.keys("QUIET beach flat"))
+        self.assertEqual(["Review.3"], self.keys("beach", 1))
+        self.assertEqual([], self.keys("pool"))
+        self.assertEqual([], self.keys(""))
+
+    def test_scores(self):
+        found = self.index.search("host beach")
+        self.assertEqual("Review.2", found[0][1])
+        self.assertTrue(all(s > 0 for s, k in found))
+        self.assertEqual(sorted(found, key=lambda p: -p[0]), found)
+
+    def test_add_replaces_and_remove(self):
+        self.index.add("Review.2", review("Great beach"))
+        self.index.remove("Review.3")
+        self.index.remove("Review.3")
+        self.assertEqual({"Review.0", "Review.1", "Review.2"},
+                         set(self.keys("beach")))
+        self.assertEqual([], self.keys("host"))
+        self.assertNotIn("host", self.index.postings)
+        self.assertEqual(sum(self.index.lengths.values()), self.index.total)
+        self.index.add("Review.0", review(None))
+        self.assertEqual(2, len(self.index.texts))
+
+    def test_several_attributes(self):
+        index = TextIndex("Place", ("name", "description"))
+        place = Place()
+        place.name = "Loft"
+        place.description = "Sunny"
+        index.add("Place.0", place)
+        self.assertEqual(1, len(index.search("loft sunny")))
+
+
+class TestFileStorageSearch(unittest.TestCase):
+    """Unittests for the search method of the FileStorage class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.reviews = [review("Lovely garden"), review("Noisy street"),
+                        review("Garden view, garden access")]
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_search(self):
+        self.assertEqual([self.reviews[2], self.reviews[0]],
+                         models.storage.search(Review, "garden"))
+        self.assertEqual([self.reviews[2]],
+                         models.storage.search("Review", "garden", 1))
+        place = Place()
+        place.description = "A garden flat"
+        self.assertEqual([place], models.storage.search(Place, "garden"))
+
+    def test_follows_changes(self):
+        models.storage.search(Review, "garden")
+        self.reviews[1].text = "Quiet garden"
+        models.storage.delete(self.reviews[2])
+        self.assertEqual(2, len(models.storage.search(Review, "garden")))
+        self.assertEqual([], models.storage.search(Review, "noisy"))
+
+    def test_follows_reload(self):
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.assertEqual([], models.storage.search(Review, "garden"))
+        models.storage.reload()
+        self.assertEqual(2, len(models.storage.search(Review, "garden")))
+
+    def test_without_index(self):
+        us = User()
+        us.text = "garden"
+        self.assertEqual([us], models.storage.search(User, "garden"))
+
+
+if __name__ == "__main__":
+    unittest.main()